@@ -3,47 +3,93 @@
 from importlib import import_module
 
 _API_EXPORTS = [
+    "Client",
+    "Cache",
+    "PartitionsError",
+    "Metrics",
     "getMetadata",
     "getShares",
     "getTimeseries",
     "getReports",
+    "getReportsPanel",
     "getHoldings",
     "getLiquidity",
     "getLiquiditySummary",
+    "lookThrough",
+    "computeReports",
+    "planPartitions",
+    "registerSchema",
+    "scanTimeseries",
+    "scanReports",
+    "scanHoldings",
+    "scanLiquidity",
     "downloadShares",
     "downloadReports",
+    "downloadReportsPanel",
     "downloadTimeseries",
     "downloadHoldings",
     "downloadLiquidity",
     "downloadLiquiditySummary",
+    "syncTimeseries",
+    "syncLiquidity",
+    "syncDatasets",
+    "listSnapshots",
+    "compact",
+    "updateIndex",
+    "loadIndexed",
+    "loadLocal",
     "contains_any",
     "contains_all",
     "single_among",
     "contains_exact",
     "contains_any_joined",
+    "ListIndex",
 ]
 
 __all__ = ["main", *_API_EXPORTS]
 
 _EXPORT_MODULES = {
+    "Client": ".client",
+    "Cache": ".cache",
+    "PartitionsError": ".retry",
+    "Metrics": ".events",
     "getMetadata": ".api",
     "getShares": ".api",
     "getTimeseries": ".api",
     "getReports": ".api",
+    "getReportsPanel": ".api",
     "getHoldings": ".api",
     "getLiquidity": ".api",
     "getLiquiditySummary": ".api",
+    "lookThrough": ".lookthrough",
+    "computeReports": ".analytics",
+    "planPartitions": ".partitions",
+    "registerSchema": ".schemas",
+    "scanTimeseries": ".scan",
+    "scanReports": ".scan",
+    "scanHoldings": ".scan",
+    "scanLiquidity": ".scan",
     "downloadShares": ".download",
     "downloadReports": ".download",
+    "downloadReportsPanel": ".download",
     "downloadTimeseries": ".download",
     "downloadHoldings": ".download",
     "downloadLiquidity": ".download",
     "downloadLiquiditySummary": ".download",
+    "syncTimeseries": ".sync",
+    "syncLiquidity": ".sync",
+    "syncDatasets": ".orchestrator",
+    "listSnapshots": ".snapshots",
+    "compact": ".compact",
+    "updateIndex": ".index",
+    "loadIndexed": ".index",
+    "loadLocal": ".local",
     "contains_any": ".helpers",
     "contains_all": ".helpers",
     "single_among": ".helpers",
     "contains_exact": ".helpers",
     "contains_any_joined": ".helpers",
+    "ListIndex": ".helpers",
 }
 
 
@@ -54,5 +100,48 @@ def __getattr__(name: str):
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def main() -> None:
-    print("Hello from trackinsight-data-python!")
+def main(argv=None) -> int:
+    """Run the ``trackinsight-data-python`` command line.
+
+    ``trackinsight-data-python sync SPEC`` downloads the datasets of a JSON sync spec
+    (see ``syncDatasets``) and prints its JSON summary. The exit code is ``0`` when every
+    partition was stored, ``1`` when some partitions or queries failed and ``2`` when the
+    spec or the configuration is invalid.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: Exit code.
+    """
+    import argparse
+    import json
+    import logging
+
+    parser = argparse.ArgumentParser(prog="trackinsight-data-python")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync = commands.add_parser("sync", help="download the datasets of a sync spec to disk")
+    sync.add_argument("spec", help="JSON sync spec file, or - to read it from standard input")
+    sync.add_argument("--storage", help="output folder, defaults to TRACK_API_STORAGE")
+    sync.add_argument("--workers", type=int, help="parallel downloads, defaults to TRACK_API_DL_WORKERS")
+    sync.add_argument("--full", action="store_true", help="fetch every partition again instead of only changed ones")
+    sync.add_argument("-v", "--verbose", action="store_true", help="log load summaries and retries to standard error")
+    args = parser.parse_args(argv)
+
+    from .client import Client
+    from .events import log_event
+    from .orchestrator import loadSpec, syncDatasets
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    try:
+        spec = loadSpec(args.spec)
+        if args.full:
+            spec["incremental"] = False
+        client = Client(storage=args.storage, max_workers=args.workers, events=log_event)
+    except (OSError, ValueError, RuntimeError) as exc:
+        print(json.dumps({"ok": False, "error": repr(exc)}))
+        return 2
+    with client:
+        summary = syncDatasets(spec, client=client)
+    print(json.dumps(summary, indent=2, default=str))
+    return 0 if summary["ok"] else 1
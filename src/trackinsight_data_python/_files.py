@@ -0,0 +1,24 @@
+import os
+
+# Share id columns, by order of preference, of the datasets served by the API.
+ID_COLUMNS = ["share_id", "id"]
+# Date columns, by order of preference.
+DATE_COLUMNS = ["date", "stamp"]
+# Storage format of downloads converted to Arrow IPC files, which the API does not serve.
+IPC_FORMAT = "ipc"
+# Files left by unfinished writes: ``.part`` downloads, their ``.resume`` sidecars and
+# ``.tmp`` rewrites. They are never copied or linked into another folder.
+PARTIAL_SUFFIXES = (".part", ".resume", ".tmp")
+
+
+def data_files(root, suffix=".parquet"):
+    """List the data files of a Hive layout, skipping partial and temporary files."""
+    root = os.fspath(root)
+    if not os.path.isdir(root):
+        return []
+    return [
+        os.path.join(folder, name)
+        for folder, _, names in os.walk(root)
+        for name in names
+        if name.endswith(suffix)
+    ]
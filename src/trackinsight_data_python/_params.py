@@ -1,5 +1,9 @@
 IDS_LIMIT = 1000
 
+# Fetch large id lists in IDS_LIMIT batches while they cover at most this share of the
+# universe; above it, downloading everything and filtering locally moves less data.
+IDS_BATCH_MAX_RATIO = 0.5
+
 DEFAULT_REPORT_PERIODS = [
     "one-day",
     "one-week",
@@ -25,6 +29,20 @@ def should_filter_ids_locally(ids):
     return ids is not None and len(ids) > IDS_LIMIT
 
 
+def split_ids(ids, size=None):
+    size = IDS_LIMIT if size is None else size
+    unique = list(dict.fromkeys(ids))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+def should_batch_ids(ids, universe_size):
+    return (
+        should_filter_ids_locally(ids)
+        and universe_size is not None
+        and len(set(ids)) <= universe_size * IDS_BATCH_MAX_RATIO
+    )
+
+
 def build_shares_params():
     return {}
 
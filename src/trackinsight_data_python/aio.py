@@ -0,0 +1,651 @@
+"""Asyncio variants of the loaders and downloaders.
+
+Every function mirrors its synchronous counterpart in ``api`` and ``download`` and
+builds its requests with the same ``_params`` helpers, but runs on one ``aiohttp``
+session per ``AsyncClient`` with a per-host connection limit, so many dataset pulls can
+fan out from a single event loop. Requires the optional ``aiohttp`` dependency::
+
+    pip install "trackinsight-data-python[aio]"
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from io import BytesIO
+
+import polars as pl
+
+try:
+    import aiohttp
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "trackinsight_data_python.aio requires aiohttp: pip install 'trackinsight-data-python[aio]'"
+    ) from exc
+
+from ._files import IPC_FORMAT
+from ._params import (
+    build_holdings_params,
+    build_liquidity_params,
+    build_reports_params,
+    build_shares_params,
+    build_timeseries_params,
+    should_batch_ids,
+    should_filter_ids_locally,
+    split_ids,
+)
+from .api import METADATA_CURRENCIES, UNIVERSE_TTL, _buildMetadata
+from .cache import Cache
+from .client import build_url, resolve_config
+from .manifest import Manifest, manifest_path
+from .index import updateIndex
+from .local import writeIpc
+from .memo import AsyncMemo
+from .partitions import _partitionParams, _partitionPath, _requestedIds, prunePartitions
+from .snapshots import DEFAULT_SNAPSHOTS, Snapshot, currentSnapshot, isSnapshotted
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncClient:
+    """Reusable asynchronous connection to the Trackinsight API.
+
+    Takes the same settings as ``Client``. Requests share one ``aiohttp.ClientSession``
+    whose connector allows at most ``max_workers`` concurrent connections per host;
+    the session is created on first use inside the running event loop.
+
+    Args:
+        key (str | None, optional): API key. Defaults to ``TRACK_API_KEY``.
+        host (str | None, optional): API base URL. Defaults to ``TRACK_API_HOST``.
+        storage (str | Path | None, optional): Local folder used by downloaders.
+            Defaults to ``TRACK_API_STORAGE``.
+        max_workers (int | None, optional): Concurrent requests per host.
+            Defaults to ``TRACK_API_DL_WORKERS``.
+        verify_cert (bool | None, optional): Whether to verify TLS certificates.
+            Defaults to ``TRACK_API_VERIFY_CERT``.
+        cache (Cache | bool | None, optional): Read-through cache used by the in-memory
+            loaders. ``None`` builds one from ``TRACK_API_CACHE`` when it is set;
+            ``False`` disables caching.
+        metadata_ttl (float | None, optional): Lifetime in seconds of memoized metadata.
+            Defaults to ``TRACK_API_METADATA_TTL``.
+        ipc_compression (str | None, optional): Compression of downloads stored with
+            ``format="ipc"``. Defaults to ``TRACK_API_IPC_COMPRESSION``.
+    """
+
+    def __init__(self, key=None, host=None, storage=None, max_workers=None, verify_cert=None, cache=None,
+                 metadata_ttl=None, ipc_compression=None):
+        config = resolve_config(key, host, storage, max_workers, verify_cert, metadata_ttl=metadata_ttl,
+                                ipc_compression=ipc_compression)
+        self.key = config["key"]
+        self.host = config["host"]
+        self.data_dir = config["data_dir"]
+        self.max_workers = config["max_workers"]
+        self.verify_cert = config["verify_cert"]
+        self.debug = config["debug"]
+        self.metadata_ttl = config["metadata_ttl"]
+        self.ipc_compression = config["ipc_compression"]
+        if cache is None:
+            cache = Cache.from_env()
+        self.cache = cache or None
+        self.memo = AsyncMemo()
+        self._session = None
+        self._loop = None
+        self._closer = None
+
+    def url(self, endpoint, params=None):
+        """Build an API URL from an endpoint and query parameters."""
+        return build_url(self.host, endpoint, params)
+
+    def session(self):
+        """Return the ``aiohttp`` session bound to the running event loop.
+
+        A session is closed in its own loop, by the time that loop shuts down its async
+        generators (as ``asyncio.run`` does), so a client reused across event loops does
+        not leak the connections of the previous ones.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._discardSession()
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.max_workers,
+                ssl=None if self.verify_cert else False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-API-KEY": self.key},
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=60, sock_read=60),
+            )
+            self._loop = loop
+            # Started once, the generator is finalized by ``loop.shutdown_asyncgens``.
+            self._closer = _closeOnShutdown(self._session)
+            loop.create_task(anext(self._closer))
+        return self._session
+
+    def _discardSession(self):
+        """Close the session of a previous event loop, from that loop while it runs."""
+        session, loop = self._session, self._loop
+        self._session = None
+        self._closer = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def close(self):
+        """Close the session and every connection it holds."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._closer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+async def _closeOnShutdown(session):
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
+_default_client = None
+
+
+def get_client(client=None):
+    """Return ``client`` when given, otherwise the shared default ``AsyncClient``."""
+    global _default_client
+    if client is not None:
+        return client
+    if _default_client is None:
+        _default_client = AsyncClient()
+    return _default_client
+
+
+async def getJSON(endpoint,params=None,client=None):
+    """Execute a JSON request and return payload and response headers.
+
+    Args:
+        endpoint (str): API endpoint path relative to ``TRACK_API_HOST``.
+        params (dict | None): Query parameters.
+        client (AsyncClient | None, optional): Client to use. Defaults to the shared client.
+
+    Returns:
+        list: Two-item list ``[data, headers]`` from the HTTP response.
+    """
+    client = get_client(client)
+    url = client.url(endpoint,params)
+
+    async def fetch():
+        async with client.session().get(url) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+            return [data, response.headers]
+
+    return list(await client.memo.get(("json", url), fetch))
+
+
+async def getPartition(endpoint,partition_params,folder=None,partitionPath="",format='parquet',client=None,etag=None):
+    """Fetch one partition either to memory or to disk.
+
+    Bodies written to disk are streamed in chunks to a ``.part`` file that replaces
+    ``data.<format>`` once complete. In memory, parquet decoding runs in a worker thread
+    so the event loop is never blocked, as does the conversion of ``ipc`` downloads.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        partition_params (dict): Partition-specific query parameters.
+        folder (str | None, optional): Output folder relative to ``TRACK_API_STORAGE``.
+            When ``None``, data is returned in memory.
+        partitionPath (str, optional): Nested subpath used for partitioned output.
+        format (str, optional): Response format (for example ``parquet`` or ``json``).
+        client (AsyncClient | None, optional): Client to use. Defaults to the shared client.
+        etag (str | None, optional): ``ETag`` of the copy already on disk.
+
+    Returns:
+        polars.DataFrame | dict: Same as ``partitions.getPartition``.
+
+    Raises:
+        aiohttp.ClientResponseError: When the request fails. The body of ``500``
+            responses is appended to its message.
+    """
+    client = get_client(client)
+    url = client.url('data/'+endpoint,partition_params)
+    if client.debug:
+        print(url)
+
+    headers = {} if etag is None else {"If-None-Match":etag}
+    async with client.session().get(url, headers=headers) as r:
+        if r.status == 304 and folder is not None:
+            return {"status":"not-modified"}
+        if r.status == 500:
+            # Server errors carry their cause in the body: keep it in the raised error.
+            raise aiohttp.ClientResponseError(
+                r.request_info, r.history, status=r.status, message=f"{r.reason}: {await r.text()}", headers=r.headers)
+        r.raise_for_status()
+
+        if folder is None:
+            body = await r.read()
+            if format == 'json':
+                return await asyncio.to_thread(lambda: pl.DataFrame(_decodeResult(body)))
+            return await asyncio.to_thread(pl.read_parquet, BytesIO(body))
+
+        output_folder = client.data_dir / folder / partitionPath
+        output_filepath = output_folder / ("data."+format)
+        part_filepath = output_folder / ("data."+format+".part")
+        await asyncio.to_thread(output_folder.mkdir, parents=True, exist_ok=True)
+
+        if format in (IPC_FORMAT, 'json'):
+            body = await r.read()
+            size, sha256 = await asyncio.to_thread(
+                _writeBody, body, format, part_filepath, output_filepath, client.ipc_compression)
+            return {"status":"downloaded","bytes":size,"sha256":sha256,"etag":r.headers.get("ETag")}
+
+        digest = hashlib.sha256()
+        size = 0
+        f = await asyncio.to_thread(open, part_filepath, "wb")
+        try:
+            async for chunk in r.content.iter_chunked(STREAM_CHUNK_SIZE):
+                await asyncio.to_thread(_writeChunk, f, digest, chunk)
+                size += len(chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, part_filepath, output_filepath)
+        return {"status":"downloaded","bytes":size,"sha256":digest.hexdigest(),"etag":r.headers.get("ETag")}
+
+
+def _decodeResult(body):
+    response = json.loads(body)
+    if response.get("error") is not None:
+        raise ValueError(str(response["error"]))
+    return response.get("result")
+
+
+def _writeChunk(f, digest, chunk):
+    f.write(chunk)
+    digest.update(chunk)
+
+
+def _writeBody(body, format, part_filepath, output_filepath, compression):
+    """Write a whole ``ipc`` or ``json`` partition body; return its size and sha256."""
+    if format == IPC_FORMAT:
+        sha256 = hashlib.sha256(body).hexdigest()
+        writeIpc(BytesIO(body), part_filepath, compression)
+    else:
+        body = json.dumps(_decodeResult(body), indent=2).encode()
+        sha256 = hashlib.sha256(body).hexdigest()
+        part_filepath.write_bytes(body)
+    os.replace(part_filepath, output_filepath)
+    return output_filepath.stat().st_size, sha256
+
+
+async def _gather(coroutines,limit):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    coroutines = list(coroutines)
+    tasks = [asyncio.ensure_future(bounded(c)) for c in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Tasks cancelled before they started never awaited their coroutine.
+        for coroutine in coroutines:
+            coroutine.close()
+
+
+async def getPartitions(endpoint,folder=None,params={},format="parquet",partitionOrder=None,client=None,incremental=False,snapshots=None):
+    """Fetch all partitions for a dataset concurrently.
+
+    Takes the arguments of ``partitions.getPartitions`` that apply to an
+    ``AsyncClient``. Unlike it, partitions are fetched once each, ``max_workers`` at a
+    time, without retries or concurrency control, and interrupted downloads are not
+    resumed; in memory, frames are concatenated without ``compact`` casting or a
+    ``memoryLimit``.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        folder (str | None, optional): Output folder name. When ``None``, data is kept in memory.
+        params (dict, optional): Base query parameters shared across partitions.
+        format (str, optional): Response format requested from the API.
+        partitionOrder (list[str] | None, optional): Explicit key order used to build partition paths.
+        client (AsyncClient | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only used on disk. See ``partitions.getPartitions``.
+        snapshots (int | None, optional): Only used on disk. See ``partitions.getPartitions``.
+
+    Returns:
+        polars.DataFrame | list | None: Concatenated DataFrame when ``folder`` is
+            ``None``, ``None`` when there is no partition; otherwise a list of
+            per-partition results.
+
+    Raises:
+        aiohttp.ClientResponseError: On the first failed partition, instead of the
+            ``PartitionsError`` raised once every partition was attempted. Partitions
+            still running are cancelled and a snapshot being written is discarded.
+    """
+    client = get_client(client)
+
+    [data, headers] = await getJSON('partitions/'+endpoint, params, client=client)
+    transactionId = data["result"]["transactionId"]
+    partitions = prunePartitions(data["result"]["partitions"], _requestedIds(params))
+    results = [None] * len(partitions)
+
+    base = client.data_dir / format
+    snapshot = None
+    target = folder
+    if folder is not None and (snapshots is not None or isSnapshotted(base, folder)):
+        snapshot = await asyncio.to_thread(Snapshot(base, folder, transactionId).stage)
+        target = snapshot.relative
+
+    manifest = None
+    if folder is not None and incremental:
+        manifest = await asyncio.to_thread(Manifest, manifest_path(client.data_dir, format, folder), base / target)
+
+    async def fetch(i, partition, partitionPath, etag):
+        result = await getPartition(
+            endpoint,
+            _partitionParams(params,transactionId,partition,format),
+            None if folder is None else "/".join([format,target]),
+            partitionPath,
+            format,
+            client,
+            etag)
+        if manifest is not None:
+            if result["status"] == "downloaded" and manifest.sha256(partitionPath) == result["sha256"]:
+                result["status"] = "unchanged"
+            manifest.record(partitionPath, params, partition, transactionId, result)
+        results[i] = result
+
+    def plan():
+        """List the partitions to fetch with their ``ETag``; the manifest reads the disk."""
+        listed, pending = [], []
+        for i, partition in enumerate(partitions):
+            partitionPath = _partitionPath(partition,partitionOrder)
+            listed.append(partitionPath)
+            etag = None
+            if manifest is not None:
+                filepath = manifest.root / partitionPath / ("data."+format)
+                if manifest.is_current(partitionPath, params, partition, transactionId, filepath):
+                    results[i] = {"status":"unchanged"}
+                    continue
+                etag = manifest.etag(partitionPath, params, partition, filepath)
+            pending.append((i, partition, partitionPath, etag))
+        return listed, pending
+
+    def finish():
+        for stalePath in manifest.stale(params, listed):
+            manifest.remove(stalePath)
+        # Every partition is stored: later loads of the query can read it from disk.
+        manifest.complete(params, listed)
+
+    listed, pending = await asyncio.to_thread(plan) if manifest is not None else plan()
+    jobs = [fetch(*job) for job in pending]
+
+    published = False
+    try:
+        await _gather(jobs, client.max_workers)
+        if manifest is not None:
+            await asyncio.to_thread(finish)
+        if snapshot is not None:
+            await asyncio.to_thread(snapshot.validate, listed, format)
+            await asyncio.to_thread(snapshot.publish, DEFAULT_SNAPSHOTS if snapshots is None else snapshots)
+            published = True
+    finally:
+        if snapshot is not None and not published:
+            await asyncio.to_thread(snapshot.discard)
+        # A discarded snapshot leaves the previous one, which the manifest still describes.
+        if manifest is not None and (snapshot is None or published):
+            await asyncio.to_thread(manifest.save)
+
+    if folder is None:
+        if len(results) > 0:
+            return await asyncio.to_thread(pl.concat, results, how="vertical_relaxed")
+        return None
+    return results
+
+
+async def getPartitionsBatched(endpoint,paramsList,format="parquet",client=None):
+    """Fetch the partitions of several queries on the same endpoint into one frame.
+
+    Same arguments and return value as ``partitions.getPartitionsBatched``, with an
+    ``AsyncClient``.
+    """
+    client = get_client(client)
+    listings = await _gather(
+        [getJSON('partitions/'+endpoint, params, client=client) for params in paramsList],
+        client.max_workers)
+
+    jobs = []
+    for params, [data, headers] in zip(paramsList, listings):
+        listing = data["result"]
+        for partition in prunePartitions(listing["partitions"], _requestedIds(params)):
+            jobs.append(getPartition(
+                endpoint,
+                _partitionParams(params,listing["transactionId"],partition,format),
+                format=format,
+                client=client))
+
+    results = await _gather(jobs, client.max_workers)
+    if len(results) > 0:
+        return await asyncio.to_thread(pl.concat, results, how="vertical_relaxed")
+    return None
+
+
+# Functions to load data into in-memory data frames
+
+
+async def _loadPartitions(endpoint,params,client=None,immutable=False,loader=None):
+    client = get_client(client)
+    if loader is None:
+        loader = lambda: getPartitions(endpoint=endpoint,params=params,client=client)
+    if client.cache is None:
+        return await loader()
+    data = await asyncio.to_thread(client.cache.get, endpoint, params)
+    if data is None:
+        data = await loader()
+        if data is not None:
+            await asyncio.to_thread(client.cache.put, endpoint, params, data, immutable)
+    return data
+
+
+async def _universeSize(client=None):
+    client = get_client(client)
+
+    async def load():
+        shares = await getShares(client=client)
+        return 0 if shares is None else shares.height
+
+    return await client.memo.get(("universe",), load, ttl=UNIVERSE_TTL)
+
+
+async def _loadIds(endpoint,build_params,ids,id_column,client=None,immutable=False,batchIds=None):
+    client = get_client(client)
+    if should_filter_ids_locally(ids):
+        if batchIds is None:
+            batchIds = should_batch_ids(ids, await _universeSize(client))
+        if batchIds:
+            paramsList = [build_params(chunk) for chunk in split_ids(ids)]
+            key = build_params(None) | {"ids": ",".join(str(i) for i in sorted(set(ids)))}
+            return await _loadPartitions(
+                endpoint,
+                key,
+                client=client,
+                immutable=immutable,
+                loader=lambda: getPartitionsBatched(endpoint,paramsList,client=client),
+            )
+
+    data = await _loadPartitions(endpoint,build_params(ids),client=client,immutable=immutable)
+
+    if data is not None:
+        if should_filter_ids_locally(ids):
+            data = data.filter(pl.col(id_column).is_in(ids))
+
+    return data
+
+
+async def getMetadata(asDataFrame=False,client=None):
+    """Fetch available report partition stamps grouped by currency.
+
+    The reports and holdings partition listings are requested concurrently and the
+    result is memoized like in ``api.getMetadata``. Same arguments and return value.
+    """
+    client = get_client(client)
+
+    async def load():
+        listings = await asyncio.gather(
+            *[getJSON('partitions/reports',{"ccy":ccy},client=client) for ccy in METADATA_CURRENCIES],
+            getJSON('partitions/holdings',{},client=client))
+        listings = [data.get('result').get('partitions') for [data, headers] in listings]
+        return dict(zip(METADATA_CURRENCIES, listings)), listings[-1]
+
+    reports, holdings = await client.memo.get(("metadata",), load, ttl=client.metadata_ttl)
+    return _buildMetadata(reports, holdings, asDataFrame)
+
+
+async def _resolveStamp(stamp,ccy,client):
+    if stamp is None:
+        metadata = await getMetadata(client=client)
+        stamp = max(metadata["reportsAsOf"]["eur" if ccy is None else ccy])
+    return stamp
+
+
+async def getShares(client=None):
+    """Load the full shares dataset into memory. See ``api.getShares``."""
+    params = build_shares_params()
+    return await _loadPartitions("shares",params,client=client)
+
+
+async def getTimeseries(start='2019-01-01',end=None,ccy='eur',ids=None,client=None,batchIds=None):
+    """Load timeseries rows filtered by date range, currency, and optional IDs. See ``api.getTimeseries``."""
+    return await _loadIds(
+        "timeseries",
+        lambda ids: build_timeseries_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+    )
+
+
+async def getReports(stamp=None,ccy='eur',ids=None,periods=None,client=None,batchIds=None):
+    """Load report rows for a given valuation stamp, currency, and optional IDs. See ``api.getReports``."""
+    stamp = await _resolveStamp(stamp, ccy, client)
+    return await _loadIds(
+        "reports",
+        lambda ids: build_reports_params(stamp=stamp, ccy=ccy, ids=ids, periods=periods)[0],
+        ids,
+        "share_id",
+        client=client,
+        immutable=True,
+        batchIds=batchIds,
+    )
+
+
+async def getHoldings(ids=None, proxy=True, level=0, extraLines=False, client=None, batchIds=None):
+    """Load holdings rows, optionally filtered to specific IDs. See ``api.getHoldings``."""
+    return await _loadIds(
+        "holdings",
+        lambda ids: build_holdings_params(ids=ids, proxy=proxy, level=level, extraLines=extraLines),
+        ids,
+        "share_id",
+        client=client,
+        batchIds=batchIds,
+    )
+
+
+async def getLiquidity(start,end,ccy='eur',ids=None,client=None,batchIds=None):
+    """Load liquidity rows for the provided date range. See ``api.getLiquidity``."""
+    return await _loadIds(
+        "liquidity",
+        lambda ids: build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "share_id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+    )
+
+
+async def getLiquiditySummary(start,end,ccy='eur',ids=None,client=None,batchIds=None):
+    """Load liquidity summary rows for the provided date range. See ``api.getLiquiditySummary``."""
+    return await _loadIds(
+        "liquidity_summary",
+        lambda ids: build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "share_id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+    )
+
+
+# Functions to download data to disk
+
+
+async def _download(endpoint,folder,params,format,client,incremental,partitionOrder=None,subfolder=None,index=True,snapshots=None):
+    client = get_client(client)
+    await getPartitions(
+        endpoint=endpoint,
+        folder=folder,
+        params=params,
+        format=format,
+        partitionOrder=partitionOrder,
+        client=client,
+        incremental=incremental,
+        snapshots=snapshots)
+    if index:
+        await asyncio.to_thread(updateIndex, folder, format, client)
+    base = client.data_dir / format
+    pattern = currentSnapshot(base, folder) or base / folder
+    if subfolder is not None:
+        pattern = pattern / subfolder
+    return str(pattern / ("**/*."+format))
+
+
+async def downloadShares(format='parquet',client=None,incremental=True,index=True,snapshots=None):
+    """Download shares partitions to disk and return the output file pattern. See ``download.downloadShares``."""
+    return await _download('shares','shares',build_shares_params(),format,client,incremental,index=index,snapshots=snapshots)
+
+
+async def downloadReports(stamp=None,ccy='eur',format='parquet',periods=None,client=None,incremental=True,index=True,snapshots=None):
+    """Download report partitions for the given stamp and return the output pattern. See ``download.downloadReports``."""
+    stamp = await _resolveStamp(stamp, ccy, client)
+    params, stamp = build_reports_params(stamp=stamp, ccy=ccy, periods=periods)
+    return await _download(
+        'reports',ccy+'_reports',params,format,client,incremental,
+        partitionOrder=["stamp","mod_20"],subfolder="stamp="+stamp,index=index,snapshots=snapshots)
+
+
+async def downloadTimeseries(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
+    """Download timeseries partitions for a date range and return the output pattern. See ``download.downloadTimeseries``."""
+    params = build_timeseries_params(start=start, end=end, ccy=ccy)
+    return await _download('timeseries',ccy+'_timeseries',params,format,client,incremental,index=index,snapshots=snapshots)
+
+
+async def downloadHoldings(format='parquet',proxy=True,level=0,extraLines=False,client=None,incremental=True,index=True,snapshots=None):
+    """Download holdings partitions to disk and return the output file pattern. See ``download.downloadHoldings``."""
+    params = build_holdings_params(proxy=proxy, level=level, extraLines=extraLines)
+    return await _download('holdings','holdings',params,format,client,incremental,index=index,snapshots=snapshots)
+
+
+async def downloadLiquidity(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
+    """Download liquidity partitions for a date range and return the output pattern. See ``download.downloadLiquidity``."""
+    params = build_liquidity_params(start=start, end=end, ccy=ccy)
+    return await _download('liquidity',ccy+'_liquidity',params,format,client,incremental,index=index,snapshots=snapshots)
+
+
+async def downloadLiquiditySummary(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
+    """Download liquidity summary partitions for a date range and return the output pattern. See ``download.downloadLiquiditySummary``."""
+    params = build_liquidity_params(start=start, end=end, ccy=ccy)
+    return await _download('liquidity_summary',ccy+'_liquidity_summary',params,format,client,incremental,index=index,snapshots=snapshots)
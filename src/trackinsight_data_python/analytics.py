@@ -0,0 +1,253 @@
+import math
+from datetime import date, datetime, timedelta
+
+import polars as pl
+from dateutil.relativedelta import relativedelta
+
+from ._params import DEFAULT_REPORT_PERIODS
+
+TRADING_DAYS = 252
+
+
+def _toDate(stamp):
+    if isinstance(stamp, datetime):
+        return stamp.date()
+    if isinstance(stamp, date):
+        return stamp
+    return date.fromisoformat(str(stamp)[:10])
+
+
+def _monthsToDate(months):
+    """End of the month before the ``months`` last months, the current one included."""
+    return lambda d: d.replace(day=1) - relativedelta(months=months - 1) - timedelta(days=1)
+
+
+# Date of the reference value of each report period, for a given as-of date. Returns over
+# a period compare the last value on or before the as-of date with the last value on or
+# before the reference date.
+PERIOD_STARTS = {
+    "one-day": lambda d: d - timedelta(days=1),
+    "one-week": lambda d: d - timedelta(weeks=1),
+    "week-to-date": lambda d: d - timedelta(days=d.weekday() + 1),
+    "one-month": lambda d: d - relativedelta(months=1),
+    "month-to-date": _monthsToDate(1),
+    "three-month": lambda d: d - relativedelta(months=3),
+    "three-month-to-date": _monthsToDate(3),
+    "six-month": lambda d: d - relativedelta(months=6),
+    "six-month-to-date": _monthsToDate(6),
+    "one-year": lambda d: d - relativedelta(years=1),
+    "year-to-date": lambda d: date(d.year - 1, 12, 31),
+    "one-year-to-date": _monthsToDate(12),
+    "three-year": lambda d: d - relativedelta(years=3),
+    "three-year-to-date": _monthsToDate(36),
+}
+
+
+def periodStart(period,stamp):
+    """Return the reference date of a report period for an as-of date.
+
+    Args:
+        period (str): Report period name, for example ``year-to-date``.
+        stamp (str | datetime.date): As-of date.
+
+    Returns:
+        datetime.date: Date whose value the period return is computed from.
+
+    Raises:
+        ValueError: When the period is not supported.
+    """
+    start = PERIOD_STARTS.get(period)
+    if start is None:
+        raise ValueError(f"unsupported period {period!r}, expected one of {sorted(PERIOD_STARTS)}")
+    return start(_toDate(stamp))
+
+
+def _prepare(timeseries, idColumn, dateColumn, valueColumn):
+    date_ = pl.col(dateColumn)
+    if timeseries.schema[dateColumn] == pl.String:
+        date_ = date_.str.to_date("%Y-%m-%d", exact=False)
+    elif timeseries.schema[dateColumn] != pl.Date:
+        date_ = date_.cast(pl.Date)
+    return (
+        timeseries.lazy()
+        .select(
+            pl.col(idColumn).alias("share_id"),
+            date_.alias("date"),
+            pl.col(valueColumn).cast(pl.Float64).alias("value"))
+        .drop_nulls()
+        .sort("share_id", "date")
+        .collect()
+    )
+
+
+def _mergeBlocks(left, right):
+    """Expressions merging the stats of two adjacent row blocks, given their column prefixes.
+
+    ``high`` and ``low`` are the extreme values of a block, ``drawdown`` its max drawdown,
+    and ``count``, ``sum`` and ``squares`` aggregate its daily returns. The drawdown of the
+    merged block also falls from the high of the left block to the low of the right one.
+    """
+    l = lambda name: pl.col(left + name)
+    r = lambda name: pl.col(right + name)
+    return [
+        pl.max_horizontal(l("high"), r("high")).alias("high"),
+        pl.min_horizontal(l("low"), r("low")).alias("low"),
+        pl.min_horizontal(l("drawdown"), r("drawdown"), r("low") / l("high") - 1).alias("drawdown"),
+        (l("count") + r("count")).alias("count"),
+        (l("sum") + r("sum")).alias("sum"),
+        (l("squares") + r("squares")).alias("squares"),
+    ]
+
+
+def _windowRisk(data, windows, annualization):
+    """Volatility and max drawdown of every share over the risk window of every stamp.
+
+    The window of a stamp holds the rows dated after its ``window_start`` up to the stamp:
+    a slice of the rows of each share, located with ``join_asof``. Slices are covered by
+    blocks of 1, 2, 4... rows following the binary decomposition of their length, and
+    blocks of each size are merged from blocks of half that size. Rows are therefore
+    never repeated per window: the cost grows with the number of rows and windows times
+    the log of the window length, not with the rows of every window.
+    """
+    rows = (
+        data
+        .with_columns((pl.col("value") / pl.col("value").shift(1).over("share_id") - 1).alias("daily"))
+        .with_row_index("row")
+        .with_columns(pl.col("row").cast(pl.Int64))
+    )
+    # Last row of each share on or before each bound; a slice starts after the first one.
+    dated = rows.select("share_id", "date", "row").sort("date")
+    queries = (
+        rows.group_by("share_id").agg(pl.col("row").min().alias("first"))
+        .join(windows, how="cross")
+    )
+    for bound in ["stamp", "window_start"]:
+        queries = (
+            queries.sort(bound)
+            .join_asof(dated.rename({"row": bound + "_row"}), left_on=bound, right_on="date", by="share_id",
+                       strategy="backward", check_sortedness=False)
+            .drop("date")
+        )
+    queries = queries.select(
+        "share_id",
+        "stamp",
+        pl.coalesce(pl.col("window_start_row") + 1, "first").alias("cursor"),
+        (pl.coalesce(pl.col("stamp_row") + 1, "first") - pl.coalesce(pl.col("window_start_row") + 1, "first")).alias("length"),
+        pl.lit(None, pl.Float64).alias("high"),
+        pl.lit(None, pl.Float64).alias("low"),
+        pl.lit(0.0).alias("drawdown"),
+        pl.lit(0, pl.Int64).alias("count"),
+        pl.lit(0.0).alias("sum"),
+        pl.lit(0.0).alias("squares"),
+    )
+
+    blocks = rows.select(
+        pl.col("value").alias("high"),
+        pl.col("value").alias("low"),
+        pl.lit(0.0).alias("drawdown"),
+        pl.col("daily").is_not_null().cast(pl.Int64).alias("count"),
+        pl.col("daily").fill_null(0.0).alias("sum"),
+        (pl.col("daily") ** 2).fill_null(0.0).alias("squares"),
+    )
+    longest = queries["length"].max() or 0
+    size = 1
+    while size <= longest:
+        taken = pl.col("length") // size % 2 == 1
+        block = blocks.select(pl.all().gather(queries["cursor"].clip(upper_bound=blocks.height - 1)).name.prefix("block_"))
+        queries = (
+            pl.concat([queries, block], how="horizontal")
+            .with_columns(
+                [pl.when(taken).then(merged).otherwise(pl.col(merged.meta.output_name())) for merged in _mergeBlocks("", "block_")]
+                + [pl.when(taken).then(pl.col("cursor") + size).otherwise("cursor").alias("cursor")])
+            .drop(block.columns)
+        )
+        if size * 2 <= longest:
+            blocks = (
+                blocks.with_columns(pl.all().shift(-size).name.prefix("next_"))
+                .select(_mergeBlocks("", "next_"))
+            )
+        size *= 2
+
+    variance = (pl.col("squares") - pl.col("sum") ** 2 / pl.col("count")) / (pl.col("count") - 1)
+    return queries.select(
+        "share_id",
+        "stamp",
+        pl.when(pl.col("count") > 1).then(variance.clip(lower_bound=0).sqrt() * math.sqrt(annualization)).alias("volatility"),
+        pl.when(pl.col("length") > 0).then("drawdown").alias("max_drawdown"),
+    )
+
+
+def computeReports(timeseries,stamps=None,periods=None,riskPeriod="one-year",idColumn="id",dateColumn="date",
+                   valueColumn="value",returnColumn="return_{period}",annualization=TRADING_DAYS):
+    """Compute report metrics from a timeseries frame, for many as-of dates at once.
+
+    For every share and as-of date, the return over each period compares the last value
+    on or before the as-of date with the last value on or before the period's reference
+    date (see ``periodStart``). Volatility and max drawdown are measured over
+    ``riskPeriod`` up to the as-of date. All shares and as-of dates are computed in the
+    same joins, without repeating the rows shared by overlapping risk windows, so
+    backtests need no per-stamp ``getReports`` call.
+
+    Args:
+        timeseries (polars.DataFrame): Rows returned by ``getTimeseries``.
+        stamps (list[str | datetime.date] | None, optional): As-of dates. Defaults to the
+            latest date of ``timeseries``.
+        periods (list[str] | None, optional): Report periods. Defaults to the periods
+            requested by ``getReports``.
+        riskPeriod (str, optional): Period over which volatility and max drawdown are measured.
+        idColumn (str, optional): Share ID column of ``timeseries``.
+        dateColumn (str, optional): Date column of ``timeseries``.
+        valueColumn (str, optional): Column holding the value (price or NAV) of the share.
+        returnColumn (str, optional): Name of the return columns, ``{period}`` being
+            replaced by the period name.
+        annualization (int, optional): Number of daily returns per year, used to
+            annualize the volatility.
+
+    Returns:
+        polars.DataFrame: One row per share and as-of date, with ``share_id``, ``stamp``,
+            one return column per period, ``volatility`` (annualized standard deviation
+            of daily returns) and ``max_drawdown`` (negative fraction, ``0`` without loss).
+            Metrics lacking history are null.
+    """
+    periods = DEFAULT_REPORT_PERIODS if periods is None else periods
+    data = _prepare(timeseries, idColumn, dateColumn, valueColumn)
+    if stamps is None:
+        stamps = [data["date"].max()]
+    stamps = sorted({_toDate(stamp) for stamp in stamps})
+
+    references = pl.DataFrame(
+        [(stamp, period, periodStart(period, stamp)) for stamp in stamps for period in periods],
+        schema={"stamp": pl.Date, "period": pl.String, "reference": pl.Date},
+        orient="row")
+
+    # Value of every share on every date needed: the as-of dates and the reference dates.
+    lookups = pl.concat([references["reference"], pl.Series("reference", stamps, pl.Date)]).unique().sort()
+    values = (
+        data.select(pl.col("share_id").unique())
+        .join(lookups.to_frame("lookup"), how="cross")
+        .sort("lookup")
+        # Both sides are sorted by date, the as-of key, as the join requires.
+        .join_asof(data.sort("date"), left_on="lookup", right_on="date", by="share_id", strategy="backward",
+                   check_sortedness=False)
+        .select("share_id", "lookup", "value")
+    )
+
+    returns = (
+        references
+        .join(values.rename({"lookup": "stamp", "value": "last"}), on="stamp")
+        .join(values.rename({"lookup": "reference", "value": "first"}), on=["share_id", "reference"])
+        .with_columns((pl.col("last") / pl.col("first") - 1).alias("return"))
+        .pivot("period", index=["share_id", "stamp"], values="return", on_columns=periods)
+        .rename({period: returnColumn.format(period=period) for period in periods})
+    )
+
+    windows = pl.DataFrame(
+        {"stamp": stamps, "window_start": [periodStart(riskPeriod, stamp) for stamp in stamps]},
+        schema={"stamp": pl.Date, "window_start": pl.Date})
+    risk = _windowRisk(data, windows, annualization)
+
+    return (
+        returns
+        .join(risk, on=["share_id", "stamp"], how="left")
+        .sort("stamp", "share_id")
+    )
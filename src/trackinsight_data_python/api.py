@@ -1,53 +1,171 @@
+from ._files import IPC_FORMAT
 from ._params import (
+    _add_ids_param,
+    _normalize_ccy,
     build_holdings_params,
     build_liquidity_params,
     build_reports_params,
     build_shares_params,
     build_timeseries_params,
+    should_batch_ids,
     should_filter_ids_locally,
+    split_ids,
 )
-from .partitions import getJSON,getPartitions
+from .client import get_client
+from .local import readFile
+from .manifest import Manifest, manifest_path
+from .partitions import _accumulator,_partitionParams,_plan,_runPartitions,getJSON,getPartitions,getPartitionsBatched
+from .retry import PartitionsError
+from .schemas import LoadSchema
+from .snapshots import currentSnapshot
 import polars as pl
 
 # Functions to load data into in-memory data frames
 
 
-def getMetadata(asDataFrame=False):
+UNIVERSE_TTL = 24 * 3600
+METADATA_CURRENCIES = ['usd','eur']
+
+
+def _loadPartitions(endpoint,params,client=None,immutable=False,loader=None,compact=False):
+    """Load a dataset through the client's read-through cache when one is configured.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        params (dict): Query parameters built by the ``_params`` helpers.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        immutable (bool, optional): Whether the result can never change for these params,
+            in which case the cached entry never expires.
+        loader (Callable[[], polars.DataFrame | None] | None, optional): Loads the data on a
+            cache miss. Defaults to ``getPartitions`` with ``params``.
+        compact (bool, optional): Whether the data is loaded with compact dtypes. Compact
+            and regular frames are cached separately.
+
+    Returns:
+        polars.DataFrame | None: Data returned by ``loader`` or by the cache.
+    """
+    client = get_client(client)
+    if loader is None:
+        loader = lambda: getPartitions(endpoint=endpoint,params=params,client=client,compact=compact)
+    if client.cache is None:
+        return loader()
+    key = params | {"compact": True} if compact else params
+    return client.cache.fetch(endpoint, key, loader, immutable=immutable)
+
+
+def _universeSize(client=None):
+    """Return the number of shares in the universe, refreshed every ``UNIVERSE_TTL`` seconds."""
+    client = get_client(client)
+
+    def load():
+        shares = getShares(client=client)
+        return 0 if shares is None else shares.height
+
+    return client.memo.get(("universe",), load, ttl=UNIVERSE_TTL)
+
+
+def _loadIds(endpoint,build_params,ids,id_column,client=None,immutable=False,batchIds=None,compact=False):
+    """Load a dataset restricted to ``ids``, whatever the length of the list.
+
+    Up to ``IDS_LIMIT`` ids are sent with the request. Longer lists are either split into
+    ``IDS_LIMIT`` batches fetched concurrently on the client pool, or the full dataset is
+    fetched and filtered locally, whichever moves less data given the universe size.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        build_params (Callable[[list | None], dict]): Builds the query params for a list of ids.
+        ids (list[int] | tuple[int] | None): Share IDs to load.
+        id_column (str): Column holding the share ID in the returned rows.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        immutable (bool, optional): Whether the result can never change for these params.
+        batchIds (bool | None, optional): Force (``True``) or disable (``False``) batching
+            of long id lists. ``None`` decides from the size of the shares universe.
+        compact (bool, optional): Load the rows with the compact schema of the endpoint.
+
+    Returns:
+        polars.DataFrame | polars.LazyFrame | None: Rows of the requested ids, lazy when
+            the load was spilled to disk.
+    """
+    client = get_client(client)
+    if should_filter_ids_locally(ids):
+        if batchIds is None:
+            batchIds = should_batch_ids(ids, _universeSize(client))
+        if batchIds:
+            paramsList = [build_params(chunk) for chunk in split_ids(ids)]
+            key = build_params(None) | {"ids": ",".join(str(i) for i in sorted(set(ids)))}
+            return _loadPartitions(
+                endpoint,
+                key,
+                client=client,
+                immutable=immutable,
+                loader=lambda: getPartitionsBatched(endpoint,paramsList,client=client,compact=compact),
+                compact=compact,
+            )
+
+    data = _loadPartitions(endpoint,build_params(ids),client=client,immutable=immutable,compact=compact)
+
+    if data is not None:
+        if should_filter_ids_locally(ids):
+            data = data.filter(pl.col(id_column).is_in(ids))
+
+    return data
+
+
+def getMetadata(asDataFrame=False,client=None):
     """Fetch available report partition stamps grouped by currency.
 
+    The reports and holdings partition listings are requested concurrently, and the
+    result is memoized on the client for ``client.metadata_ttl`` seconds. Concurrent
+    callers share one in-flight fetch.
+
     Args:
-        None.
+        asDataFrame (bool, optional): Return the metadata as a Polars DataFrame.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
 
     Returns:
         dict: Metadata dictionary with report partition stamps by currency.
     """
+    client = get_client(client)
+
+    def load():
+        queries = [('partitions/reports',{"ccy":ccy}) for ccy in METADATA_CURRENCIES]
+        queries.append(('partitions/holdings',{}))
+        listings = list(client.pool.map(
+            lambda query: getJSON(query[0],query[1],client=client)[0].get('result').get('partitions'),
+            queries))
+        return dict(zip(METADATA_CURRENCIES, listings)), listings[-1]
+
+    reports, holdings = client.memo.get(("metadata",), load, ttl=client.metadata_ttl)
+    return _buildMetadata(reports, holdings, asDataFrame)
+
+
+def _buildMetadata(reports,holdings,asDataFrame=False):
+    """Assemble metadata from the reports listings by currency and the holdings listing."""
     metadata = {"reportsAsOf":{},'holdingsAsOf':{}}
-    for ccy in ['usd','eur']:
-        [data, headers] = getJSON('partitions/reports',{"ccy":ccy})
-        partitions=(data.get('result').get('partitions'))
+    for ccy, partitions in reports.items():
         metadata["reportsAsOf"][ccy]=sorted({d["stamp"] for d in partitions})
-    [data, headers] = getJSON('partitions/holdings',{})
-    partitions=(data.get('result').get('partitions'))
-    metadata["holdingsAsOf"]["year"]=list({d["year"] for d in partitions})[0]
-    metadata["holdingsAsOf"]["month"]=list({d["month"] for d in partitions})[0]
+    metadata["holdingsAsOf"]["year"]=list({d["year"] for d in holdings})[0]
+    metadata["holdingsAsOf"]["month"]=list({d["month"] for d in holdings})[0]
     if asDataFrame:
         return pl.DataFrame(metadata)
     return metadata
 
 
-def getShares():
+def getShares(client=None,compact=False):
     """Load the full shares dataset into memory.
 
     Args:
-        None.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        compact (bool, optional): Decode strings to ``Categorical``, ids to ``Int32`` and
+            dates to ``Date``, partition by partition, to reduce memory use.
 
     Returns:
         polars.DataFrame: In-memory shares data returned by ``getPartitions``.
     """
     params = build_shares_params()
-    return getPartitions(endpoint="shares",params=params)
+    return _loadPartitions("shares",params,client=client,compact=compact)
 
-def getTimeseries(start='2019-01-01',end=None,ccy='eur',ids=None):
+def getTimeseries(start='2019-01-01',end=None,ccy='eur',ids=None,client=None,batchIds=None,compact=False):
     """Load timeseries rows filtered by date range, currency, and optional IDs.
 
     Args:
@@ -55,21 +173,29 @@ def getTimeseries(start='2019-01-01',end=None,ccy='eur',ids=None):
         end (str | None, optional): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
         ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        batchIds (bool | None, optional): How to load more than 1000 ``ids``. ``True`` fetches
+            them in parallel batches of 1000, ``False`` fetches everything and filters locally,
+            ``None`` picks based on the size of the shares universe.
+        compact (bool, optional): Decode strings to ``Categorical``, ids to ``Int32`` and
+            dates to ``Date``, partition by partition, to reduce memory use.
 
     Returns:
         polars.DataFrame: In-memory timeseries data returned by ``getPartitions``.
     """
     
-    params = build_timeseries_params(start=start, end=end, ccy=ccy, ids=ids)
-    data = getPartitions(endpoint="timeseries",params=params)
-
-    if data is not None:
-        if should_filter_ids_locally(ids):
-            data = data.filter(pl.col("id").is_in(ids))
-
-    return data
+    return _loadIds(
+        "timeseries",
+        lambda ids: build_timeseries_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+        compact=compact,
+    )
 
-def getReports(stamp=None,ccy='eur',ids=None,periods=None):  
+def getReports(stamp=None,ccy='eur',ids=None,periods=None,client=None,batchIds=None,compact=False):  
     """Load report rows for a given valuation stamp, currency, and optional IDs.
 
     Args:
@@ -79,6 +205,9 @@ def getReports(stamp=None,ccy='eur',ids=None,periods=None):
         periods (list[str] | tuple[str, ...] | None, optional): Report periods to request,
             for example ``["one-day", "one-week", "year-to-date"]``.
             When ``None``, the default report periods are requested.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        batchIds (bool | None, optional): How to load more than 1000 ``ids``. See ``getTimeseries``.
+        compact (bool, optional): Load the rows with compact dtypes. See ``getTimeseries``.
     Returns:
         polars.DataFrame: In-memory report data returned by ``getPartitions``.
     """
@@ -86,22 +215,135 @@ def getReports(stamp=None,ccy='eur',ids=None,periods=None):
     params, stamp = build_reports_params(
         stamp=stamp,
         ccy=ccy,
-        ids=ids,
         periods=periods,
-        metadata_loader=getMetadata,
+        metadata_loader=lambda: getMetadata(client=client),
     )
 
-    data = getPartitions(endpoint="reports",params=params)
+    return _loadIds(
+        "reports",
+        lambda ids: build_reports_params(stamp=stamp, ccy=ccy, ids=ids, periods=periods)[0],
+        ids,
+        "share_id",
+        client=client,
+        immutable=True,
+        batchIds=batchIds,
+        compact=compact,
+    )
 
-    if data is not None:
-        if should_filter_ids_locally(ids):
-            data = data.filter(pl.col("share_id").is_in(ids))
+    
 
+def _reportStamps(stamps=None,start=None,end=None,ccy='eur',client=None):
+    """Return the report stamps of a panel: ``stamps`` when given, else the listed stamps
+    of ``ccy`` between ``start`` and ``end`` (inclusive)."""
+    if stamps is not None:
+        return sorted(set(stamps))
+    listed = getMetadata(client=client)["reportsAsOf"][_normalize_ccy(ccy)]
+    return [stamp for stamp in listed if (start is None or stamp >= start) and (end is None or stamp <= end)]
+
+
+def _storedReports(folder,params,client):
+    """Read a report stamp completely downloaded in parquet or ipc, or return ``None``."""
+    for format in ("parquet", IPC_FORMAT):
+        base = client.data_dir / format
+        manifest = Manifest(manifest_path(client.data_dir, format, folder), currentSnapshot(base, folder) or base / folder)
+        filepaths = manifest.completed(params, format)
+        if filepaths:
+            return pl.concat([readFile(path, format) for path in filepaths], how="vertical_relaxed", rechunk=False)
+    return None
+
+
+def _withStamp(frame,stamp):
+    return frame if "stamp" in frame.columns else frame.with_columns(pl.lit(stamp).alias("stamp"))
+
+
+def getReportsPanel(stamps=None,start=None,end=None,ccy='eur',ids=None,periods=None,client=None,compact=False):
+    """Load the reports of several valuation stamps into one panel frame.
+
+    Stamps already available locally are not requested: those completely downloaded with
+    ``downloadReports`` or ``downloadReportsPanel`` (parquet or ipc) are read from disk,
+    and those in the local cache are read from it. The partition listings of the other
+    stamps are requested concurrently, then all their partitions are fetched together on
+    the client pool, instead of one stamp after the other.
+
+    Args:
+        stamps (list[str] | tuple[str, ...] | None, optional): Report valuation dates in
+            ``YYYY-MM-DD`` format. When ``None``, every stamp listed for ``ccy`` by
+            ``getMetadata`` between ``start`` and ``end`` is loaded.
+        start (str | None, optional): First stamp (inclusive) when ``stamps`` is ``None``.
+        end (str | None, optional): Last stamp (inclusive) when ``stamps`` is ``None``.
+        ccy (str, optional): Currency code.
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        periods (list[str] | tuple[str, ...] | None, optional): Report periods to request.
+            See ``getReports``.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        compact (bool, optional): Load the rows with compact dtypes. See ``getTimeseries``.
+
+    Returns:
+        polars.DataFrame | polars.LazyFrame | None: Report rows of every stamp, with a
+            ``stamp`` column, in no particular order; lazy when the load was spilled to
+            disk, ``None`` when no stamp has any row.
+
+    Raises:
+        PartitionsError: When some partitions still failed after their retries.
+    """
+    client = get_client(client)
+    folder = ccy+'_reports'
+    frames = []
+    missing = []
+    schema = LoadSchema("reports") if compact else None
+    for stamp in _reportStamps(stamps, start, end, ccy, client):
+        params, _ = build_reports_params(stamp=stamp, ccy=ccy, periods=periods)
+        data = _storedReports(folder, params, client)
+        if data is None and client.cache is not None:
+            data = client.cache.get("reports", params)
+        if data is None:
+            missing.append((stamp, params, _add_ids_param(dict(params), ids)))
+            continue
+        if ids is not None:
+            data = data.filter(pl.col("share_id").is_in(ids))
+        frames.append(_withStamp(schema.cast(data) if compact else data, stamp))
+
+    plans = list(client.pool.map(lambda query: _plan("reports", query[2], client), missing))
+    args = []
+    for (stamp, _, params), (transactionId, _, partitions) in zip(missing, plans):
+        for partition in partitions:
+            args.append({
+                "endpoint":"reports",
+                "partition":partition,
+                "partition_params":_partitionParams(params,transactionId,partition,"parquet"),
+                "folder":None,
+                "partitionPath":"",
+                "format":"parquet",
+                "etag":None,
+                "compact":schema,
+                "stamp":stamp})
+
+    # Whole stamps are also stored in the cache, unless the load may spill to disk.
+    cached = client.cache is not None and ids is None and not compact and not client.memory_limit
+    fetched = {}
+    result = _accumulator(client, None, len(frames) + len(args), False)
+    for frame in frames:
+        result.append(frame)
+
+    def on_result(arg, frame):
+        if cached:
+            fetched.setdefault(arg["stamp"], []).append(frame)
+        result.append(_withStamp(frame, arg["stamp"]))
+
+    failures = _runPartitions("reports", args, client, on_result)
+    if failures:
+        raise PartitionsError("reports", failures, result.result())
+    for stamp, params, _ in missing:
+        if stamp in fetched:
+            client.cache.put("reports", params, pl.concat(fetched[stamp], how="vertical_relaxed"), immutable=True)
+
+    data = result.result()
+    if data is not None and should_filter_ids_locally(ids):
+        data = data.filter(pl.col("share_id").is_in(ids))
     return data
 
-    
 
-def getHoldings(ids=None, proxy=True, level=0, extraLines=False):
+def getHoldings(ids=None, proxy=True, level=0, extraLines=False, client=None, batchIds=None, compact=False):
     """Load holdings rows, optionally filtered to specific IDs.
 
     Args:
@@ -109,64 +351,78 @@ def getHoldings(ids=None, proxy=True, level=0, extraLines=False):
         proxy (bool, optional): Whether to include proxy holdings.
         level (int, optional): The depth at which ETFs containing other ETFs are expanded in portfolios. 0 = no expansion, 1 = expand ETFs once, 2 = expand ETFs of ETFs recursively
         extraLines (bool, optional): Whether to include special portfolio lines (????????CASH, ??DERIVATIVE, ?????NOTCASH, ?????UNKNOWN)
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        batchIds (bool | None, optional): How to load more than 1000 ``ids``. See ``getTimeseries``.
+        compact (bool, optional): Load the rows with compact dtypes. See ``getTimeseries``.
     Returns:
         polars.DataFrame: In-memory holdings data returned by ``getPartitions``.
     """
-    params = build_holdings_params(
-        ids=ids,
-        proxy=proxy,
-        level=level,
-        extraLines=extraLines,
+    return _loadIds(
+        "holdings",
+        lambda ids: build_holdings_params(
+            ids=ids,
+            proxy=proxy,
+            level=level,
+            extraLines=extraLines,
+        ),
+        ids,
+        "share_id",
+        client=client,
+        batchIds=batchIds,
+        compact=compact,
     )
 
-    data = getPartitions(endpoint="holdings",params=params)
-
-    if data is not None:
-        if should_filter_ids_locally(ids):
-            data = data.filter(pl.col("share_id").is_in(ids))
 
-    return data
-
-
-def getLiquidity(start,end,ccy='eur',ids=None):
+def getLiquidity(start,end,ccy='eur',ids=None,client=None,batchIds=None,compact=False):
     """Load liquidity rows for the provided date range.
 
     Args:
         start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
         end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        batchIds (bool | None, optional): How to load more than 1000 ``ids``. See ``getTimeseries``.
+        compact (bool, optional): Load the rows with compact dtypes. See ``getTimeseries``.
 
     Returns:
         polars.DataFrame: In-memory liquidity data returned by ``getPartitions``.
     """
-    params = build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids)
-
-    data = getPartitions(endpoint="liquidity",params=params)
-
-    if data is not None:
-        if should_filter_ids_locally(ids):
-            data = data.filter(pl.col("share_id").is_in(ids))
-    return data
+    return _loadIds(
+        "liquidity",
+        lambda ids: build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "share_id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+        compact=compact,
+    )
     
 
-def getLiquiditySummary(start,end,ccy='eur',ids=None):
+def getLiquiditySummary(start,end,ccy='eur',ids=None,client=None,batchIds=None,compact=False):
     """Load liquidity summary rows for the provided date range.
 
     Args:
         start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
         end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
-
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        batchIds (bool | None, optional): How to load more than 1000 ``ids``. See ``getTimeseries``.
+        compact (bool, optional): Load the rows with compact dtypes. See ``getTimeseries``.
 
     Returns:
         polars.DataFrame: In-memory liquidity summary data returned by ``getPartitions``.
     """
     endpoint = 'liquidity_summary'
-    params = build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids)
-
-    data = getPartitions(endpoint=endpoint,params=params)
-
-    if data is not None:
-        if should_filter_ids_locally(ids):
-            data = data.filter(pl.col("share_id").is_in(ids))
-    return data
+    return _loadIds(
+        endpoint,
+        lambda ids: build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids),
+        ids,
+        "share_id",
+        client=client,
+        immutable=end is not None,
+        batchIds=batchIds,
+        compact=compact,
+    )
@@ -0,0 +1,414 @@
+"""Offline throughput benchmarks of partition loads against ``testing.MockServer``.
+
+Every scenario loads one endpoint from a local mock server with a given number of
+workers, response format and mode (in memory or on disk), and records wall-clock time,
+MB/s, rows/s, CPU time and peak RSS. Scenarios run one at a time, each in a fresh
+process, so peak RSS is not inherited from earlier scenarios. Results are written as
+JSON and can be compared with an earlier run::
+
+    python -m trackinsight_data_python.benchmark --output bench.json
+    python -m trackinsight_data_python.benchmark --output new.json --compare bench.json
+
+With ``--local``, the endpoint is downloaded once per storage format and scenarios
+measure loading it back from disk with ``local.loadLocal`` in several processes at
+once, as worker processes sharing a node do: load time, peak RSS and private memory
+(memory not shared with other processes) of each process::
+
+    python -m trackinsight_data_python.benchmark --local --formats parquet,ipc,ipc-lz4 --processes 1,4
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import polars as pl
+
+from .client import Client
+from .events import Metrics, peak_rss
+from .local import loadLocal, pyarrow
+from .partitions import getPartitions
+from .testing import MockServer
+
+DEFAULT_SERVER = {"partitions": 20, "shares": 2000, "days": 250, "columns": 4, "latency": 0.01}
+PARAMS = {"ccy": "usd"}
+# Storage formats of local scenarios: ``ipc-lz4`` is ``ipc`` with LZ4 compression.
+LOCAL_FORMATS = ("parquet", "ipc", "ipc-lz4")
+
+
+def scenarios(workers=(1, 4, 10), formats=("parquet", "json", "csv"), modes=("memory", "disk"), endpoint="timeseries"):
+    """Build the cross product of benchmark scenarios.
+
+    CSV is only served on disk, as in-memory loaders decode parquet and JSON.
+
+    Returns:
+        list[dict]: Scenarios with ``endpoint``, ``format``, ``mode`` and ``workers``.
+    """
+    return [
+        {"endpoint": endpoint, "format": format, "mode": mode, "workers": w}
+        for format, mode, w in itertools.product(formats, modes, workers)
+        if not (format == "csv" and mode == "memory")
+    ]
+
+
+def local_scenarios(formats=LOCAL_FORMATS, processes=(1, 4), endpoint="timeseries"):
+    """Build the scenarios loading a downloaded endpoint from disk.
+
+    Returns:
+        list[dict]: Scenarios with ``endpoint``, ``format``, ``mode`` (``local``) and
+            ``processes``, the number of processes loading the dataset at once.
+    """
+    return [
+        {"endpoint": endpoint, "format": format, "mode": "local", "processes": n}
+        for format, n in itertools.product(formats, processes)
+    ]
+
+
+def scenario_id(scenario):
+    """Stable name of a scenario, used to compare runs."""
+    if scenario["mode"] == "local":
+        return f'{scenario["endpoint"]}/{scenario["format"]}/local/p{scenario["processes"]}'
+    return f'{scenario["endpoint"]}/{scenario["format"]}/{scenario["mode"]}/w{scenario["workers"]}'
+
+
+def private_memory():
+    """Return the resident memory of the process not shared with any other, in bytes.
+
+    Pages of memory-mapped files that other processes also map are shared and left
+    out. Read from ``/proc/self/smaps_rollup``.
+
+    Returns:
+        int | None: Private memory, or ``None`` on platforms without ``smaps_rollup``.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    fields = dict(line.split(":", 1) for line in lines if ":" in line and not line[0].isdigit())
+    return sum(int(fields[name].split()[0]) * 1024 for name in ("Private_Clean", "Private_Dirty") if name in fields)
+
+
+def _storageFormat(format):
+    """Split a local scenario format into the storage format and its IPC compression."""
+    if format == "ipc-lz4":
+        return "ipc", "lz4"
+    if format == "ipc":
+        return "ipc", "uncompressed"
+    return format, None
+
+
+def load_local(storage, scenario):
+    """Load a downloaded endpoint from ``storage`` and measure it.
+
+    The frame is loaded with ``loadLocal``, then every numeric column is summed so that
+    every page of the data is touched.
+
+    Returns:
+        dict: ``load_s``, ``touch_s``, ``rows``, ``baseline_rss``, ``peak_rss`` and
+            ``private`` memory of the process.
+    """
+    format, _ = _storageFormat(scenario["format"])
+    baseline = peak_rss()
+    with Client(key="benchmark", host="http://127.0.0.1", storage=storage, cache=False) as client:
+        started = time.perf_counter()
+        frame = loadLocal(scenario["endpoint"], format=format, client=client)
+        loaded = time.perf_counter()
+        frame.select(pl.selectors.numeric().sum())
+        touched = time.perf_counter()
+    return {
+        "load_s": loaded - started,
+        "touch_s": touched - loaded,
+        "rows": frame.height,
+        "baseline_rss": baseline,
+        "peak_rss": peak_rss(),
+        "private": private_memory(),
+    }
+
+
+def _download(host, endpoint, format, storage):
+    format, compression = _storageFormat(format)
+    with Client(key="benchmark", host=host, storage=storage, cache=False, ipc_compression=compression) as client:
+        getPartitions(endpoint, folder=endpoint, params=PARAMS, format=format, client=client)
+    root = client.data_dir / format / endpoint
+    return sum(path.stat().st_size for path in root.rglob("*."+format))
+
+
+def _loadConcurrently(storage, scenario):
+    n = scenario["processes"]
+    with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # Keep every worker busy once so all of them are started, and have imported polars,
+        # before the loads, which then overlap.
+        list(executor.map(time.sleep, [0.5] * n))
+        return list(executor.map(load_local, [storage] * n, [scenario] * n))
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def run_local(scenarioList=None, server=None, repeat=3, output=None):
+    """Run local load scenarios: download each format once, then load it in several processes.
+
+    Each scenario runs ``repeat`` times and keeps the run whose slowest process was the
+    fastest.
+
+    Args:
+        scenarioList (list[dict] | None, optional): Scenarios to run. Defaults to
+            ``local_scenarios()``.
+        server (dict | None, optional): ``MockServer`` arguments. Defaults to ``DEFAULT_SERVER``.
+        repeat (int, optional): Runs per scenario.
+        output (str | Path | None, optional): JSON file written with the results.
+
+    Returns:
+        dict: ``meta`` describing the run and ``results``, one entry per scenario with
+            ``wall_s`` (slowest load), ``load_s`` and ``touch_s`` of each process,
+            ``bytes`` on disk, ``mb_per_s``, ``rows``, and the mean ``peak_rss`` and
+            ``private`` memory of the processes.
+    """
+    scenarioList = local_scenarios() if scenarioList is None else scenarioList
+    server = DEFAULT_SERVER if server is None else server
+    results = []
+    with MockServer(**server) as mock, tempfile.TemporaryDirectory() as root:
+        stored = {}
+        for scenario in scenarioList:
+            storage = f'{root}/{scenario["format"]}'
+            if scenario["format"] not in stored:
+                stored[scenario["format"]] = _download(mock.url, scenario["endpoint"], scenario["format"], storage)
+            runs = [_loadConcurrently(storage, scenario) for _ in range(max(1, repeat))]
+            best = min(runs, key=lambda run: max(r["load_s"] for r in run))
+            wall = max(r["load_s"] for r in best)
+            results.append({
+                "id": scenario_id(scenario),
+                **scenario,
+                "wall_s": wall,
+                "load_s": [r["load_s"] for r in best],
+                "touch_s": [r["touch_s"] for r in best],
+                "bytes": stored[scenario["format"]],
+                "mb_per_s": stored[scenario["format"]] / 1024**2 / wall,
+                "rows": best[0]["rows"],
+                "baseline_rss": _mean(r["baseline_rss"] for r in best),
+                "peak_rss": _mean(r["peak_rss"] for r in best),
+                "private": _mean(r["private"] for r in best),
+                "wall_s_runs": [max(r["load_s"] for r in run) for run in runs],
+            })
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "pyarrow": None if pyarrow is None else pyarrow.__version__,
+            "platform": platform.platform(),
+            "server": server,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def run_scenario(host, scenario, storage):
+    """Load one scenario from ``host`` and measure it.
+
+    Args:
+        host (str): Base URL of the mock server.
+        scenario (dict): Scenario built by ``scenarios``.
+        storage (str): Folder used by disk scenarios.
+
+    Returns:
+        dict: ``wall_s``, ``cpu_s``, ``bytes``, ``rows``, ``mb_per_s``, ``rows_per_s``,
+            ``retries``, ``baseline_rss`` and ``peak_rss`` of the load. Rows are only
+            counted in memory.
+    """
+    baseline = peak_rss()
+    metrics = Metrics()
+    with Client(key="benchmark", host=host, storage=storage, max_workers=scenario["workers"],
+                cache=False, events=metrics, backoff=0.01) as client:
+        cpu = time.process_time()
+        started = time.perf_counter()
+        getPartitions(
+            scenario["endpoint"],
+            folder=None if scenario["mode"] == "memory" else scenario["endpoint"],
+            params=PARAMS,
+            format=scenario["format"],
+            client=client)
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu
+    summary = metrics.summaries[-1]
+    rows = summary["rows"] if scenario["mode"] == "memory" else None
+    return {
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "bytes": summary["bytes"],
+        "rows": rows,
+        "mb_per_s": summary["bytes"] / 1024**2 / wall,
+        "rows_per_s": None if rows is None else rows / wall,
+        "retries": sum(event["retries"] for event in metrics.partitions),
+        "baseline_rss": baseline,
+        "peak_rss": peak_rss(),
+    }
+
+
+def _isolated(host, scenario):
+    with tempfile.TemporaryDirectory() as storage:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return executor.submit(run_scenario, host, scenario, storage).result()
+
+
+def _inProcess(host, scenario):
+    with tempfile.TemporaryDirectory() as storage:
+        return run_scenario(host, scenario, storage)
+
+
+def run(scenarioList=None, server=None, repeat=3, isolate=True, output=None):
+    """Run benchmark scenarios against a local mock server.
+
+    Each scenario runs ``repeat`` times and keeps the run with the lowest wall-clock
+    time, which is the least disturbed by the rest of the machine.
+
+    Args:
+        scenarioList (list[dict] | None, optional): Scenarios to run. Defaults to ``scenarios()``.
+        server (dict | None, optional): ``MockServer`` arguments. Defaults to ``DEFAULT_SERVER``.
+        repeat (int, optional): Runs per scenario.
+        isolate (bool, optional): Run each scenario in a fresh process, so that peak RSS
+            is measured per scenario.
+        output (str | Path | None, optional): JSON file written with the results.
+
+    Returns:
+        dict: ``meta`` describing the run and ``results``, one entry per scenario.
+    """
+    scenarioList = scenarios() if scenarioList is None else scenarioList
+    server = DEFAULT_SERVER if server is None else server
+    measure = _isolated if isolate else _inProcess
+    results = []
+    with MockServer(**server) as mock:
+        for scenario in scenarioList:
+            runs = [measure(mock.url, scenario) for _ in range(max(1, repeat))]
+            best = min(runs, key=lambda r: r["wall_s"])
+            results.append({"id": scenario_id(scenario), **scenario, **best,
+                            "wall_s_runs": [r["wall_s"] for r in runs]})
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "platform": platform.platform(),
+            "server": server,
+            "repeat": repeat,
+            "isolate": isolate,
+        },
+        "results": results,
+    }
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def compare(baseline, current):
+    """Compare two benchmark reports scenario by scenario.
+
+    Args:
+        baseline (dict): Earlier report returned by ``run`` or loaded from its JSON file.
+        current (dict): Newer report.
+
+    Returns:
+        list[dict]: For each scenario present in both, ``id``, ``wall_ratio``,
+            ``mb_per_s_ratio`` and ``peak_rss_ratio`` of ``current`` over ``baseline``.
+    """
+    before = {result["id"]: result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get(result["id"])
+        if old is None:
+            continue
+        rows.append({
+            "id": result["id"],
+            "wall_ratio": result["wall_s"] / old["wall_s"],
+            "mb_per_s_ratio": result["mb_per_s"] / old["mb_per_s"],
+            "peak_rss_ratio": None if not old["peak_rss"] or not result["peak_rss"] else result["peak_rss"] / old["peak_rss"],
+        })
+    return rows
+
+
+def _ints(value):
+    return [int(v) for v in value.split(",")]
+
+
+def _names(value):
+    return [v for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m trackinsight_data_python.benchmark", description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoint", default="timeseries")
+    parser.add_argument("--workers", type=_ints, default=[1, 4, 10])
+    parser.add_argument("--formats", type=_names, help="default: parquet,json,csv; with --local, parquet,ipc,ipc-lz4")
+    parser.add_argument("--modes", type=_names, default=["memory", "disk"])
+    parser.add_argument("--partitions", type=int, default=DEFAULT_SERVER["partitions"])
+    parser.add_argument("--shares", type=int, default=DEFAULT_SERVER["shares"])
+    parser.add_argument("--days", type=int, default=DEFAULT_SERVER["days"])
+    parser.add_argument("--columns", type=int, default=DEFAULT_SERVER["columns"])
+    parser.add_argument("--latency", type=float, default=DEFAULT_SERVER["latency"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--in-process", action="store_true", help="do not isolate scenarios in fresh processes")
+    parser.add_argument("--local", action="store_true", help="measure loads of downloaded files from disk")
+    parser.add_argument("--processes", type=_ints, default=[1, 4], help="with --local, processes loading at once")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="earlier JSON results to compare with")
+    args = parser.parse_args(argv)
+
+    server = {
+        "partitions": args.partitions,
+        "shares": args.shares,
+        "days": args.days,
+        "columns": args.columns,
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "seed": 0,
+    }
+    if args.local:
+        report = run_local(
+            local_scenarios(args.formats or LOCAL_FORMATS, args.processes, args.endpoint),
+            server=server,
+            repeat=args.repeat,
+            output=args.output)
+        for result in report["results"]:
+            rss = "n/a" if result["peak_rss"] is None else f'{result["peak_rss"] / 1024**2:.0f} MB'
+            private = "n/a" if result["private"] is None else f'{result["private"] / 1024**2:.0f} MB'
+            print(f'{result["id"]:32} {result["wall_s"] * 1000:8.1f}ms {result["bytes"] / 1024**2:8.1f} MB on disk  '
+                  f'peak RSS {rss}  private {private} per process')
+    else:
+        report = run(
+            scenarios(args.workers, args.formats or ["parquet", "json", "csv"], args.modes, args.endpoint),
+            server=server,
+            repeat=args.repeat,
+            isolate=not args.in_process,
+            output=args.output)
+        for result in report["results"]:
+            rss = "n/a" if result["peak_rss"] is None else f'{result["peak_rss"] / 1024**2:.0f} MB'
+            rows = "" if result["rows_per_s"] is None else f'{result["rows_per_s"]:.0f} rows/s'
+            print(f'{result["id"]:32} {result["wall_s"]:8.3f}s {result["mb_per_s"]:8.1f} MB/s '
+                  f'{rows:>16} {result["cpu_s"]:7.2f}s CPU  peak RSS {rss}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for row in compare(baseline, report):
+            print(f'{row["id"]:32} wall x{row["wall_ratio"]:.2f}  MB/s x{row["mb_per_s_ratio"]:.2f}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import polars as pl
+
+DEFAULT_CACHE_SIZE = 2 * 1024**3
+DEFAULT_CACHE_TTL = 3600
+
+
+def cache_key(endpoint, params):
+    """Build a stable cache key from an endpoint and its normalized query params.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        params (dict): Query params built by the ``_params.build_*_params`` helpers.
+            Keys with ``None`` values are ignored, as they are never sent to the API.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = {
+        "endpoint": endpoint,
+        "params": {k: v for k, v in params.items() if v is not None},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Cache:
+    """Persistent read-through cache for in-memory loaders.
+
+    Frames are stored as parquet files in ``directory``. Their state lives in the files
+    themselves, so processes sharing the folder see each other's entries: the
+    modification time records when an entry was stored, the access time when it was
+    last read, and immutable entries (for example reports for an explicit stamp) get an
+    ``.immutable`` suffix and never expire; the others are refreshed after ``ttl``
+    seconds. When the files of the folder exceed ``max_bytes``, the least recently used
+    ones are evicted.
+
+    Args:
+        directory (str | Path): Cache folder.
+        max_bytes (int, optional): Byte budget of the cache.
+        ttl (float, optional): Lifetime in seconds of entries for open-ended queries.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Build a cache from ``TRACK_API_CACHE``, or return ``None`` when it is not set.
+
+        ``TRACK_API_CACHE_SIZE`` sets the byte budget and ``TRACK_API_CACHE_TTL`` the
+        lifetime in seconds of entries for open-ended queries.
+        """
+        directory = os.getenv("TRACK_API_CACHE")
+        if not directory:
+            return None
+        return cls(
+            directory,
+            max_bytes=int(os.getenv("TRACK_API_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            ttl=float(os.getenv("TRACK_API_CACHE_TTL", DEFAULT_CACHE_TTL)),
+        )
+
+    def _path(self, key, immutable):
+        return self.directory / (key + (".immutable" if immutable else "") + ".parquet")
+
+    def _entries(self):
+        """Return ``(accessed, bytes, path)`` for every stored entry, oldest access first."""
+        entries = []
+        for path in self.directory.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+        return sorted(entries)
+
+    def get(self, endpoint, params):
+        """Return the cached frame for a request, or ``None`` on a miss or expired entry."""
+        key = cache_key(endpoint, params)
+        now = time.time()
+        for immutable in (True, False):
+            path = self._path(key, immutable)
+            try:
+                # The open file stays readable if another process evicts the entry meanwhile.
+                with open(path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    if not immutable and now - stat.st_mtime > self.ttl:
+                        break
+                    data = pl.read_parquet(f)
+                    _touch(f, path, now, stat.st_mtime)
+                return data
+            except FileNotFoundError:
+                continue
+        return None
+
+    def put(self, endpoint, params, data, immutable=False):
+        """Store a frame and evict least recently used entries beyond the byte budget.
+
+        Args:
+            endpoint (str): Dataset endpoint name.
+            params (dict): Normalized query params of the request.
+            data (polars.DataFrame): Frame to store.
+            immutable (bool, optional): Whether the entry never expires.
+
+        Returns:
+            None.
+        """
+        key = cache_key(endpoint, params)
+        path = self._path(key, immutable)
+        # Concurrent writers of one key each write their own file; the last rename wins.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=key + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                data.write_parquet(f)
+            size = os.path.getsize(tmp)
+            if size > self.max_bytes:
+                return
+            now = time.time()
+            os.utime(tmp, (now, now))
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, old_path in entries:
+                if total <= self.max_bytes:
+                    break
+                if old_path == path:
+                    continue
+                total -= size
+                _remove(old_path)
+
+    def fetch(self, endpoint, params, loader, immutable=False):
+        """Return the cached frame for a request, calling ``loader`` on a miss.
+
+        Args:
+            endpoint (str): Dataset endpoint name.
+            params (dict): Normalized query params of the request.
+            loader (Callable[[], polars.DataFrame | None]): Loads the frame from the API.
+            immutable (bool, optional): Whether the entry never expires.
+
+        Returns:
+            polars.DataFrame | polars.LazyFrame | None: Cached or freshly loaded frame.
+        """
+        data = self.get(endpoint, params)
+        if data is None:
+            data = loader()
+            # Loads spilled to disk come back lazy and are not cached.
+            if isinstance(data, pl.DataFrame):
+                self.put(endpoint, params, data, immutable=immutable)
+        return data
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            for _, _, path in self._entries():
+                _remove(path)
+
+
+def _touch(f, path, accessed, modified):
+    """Record a read in the access time of an entry, keeping its storage time."""
+    try:
+        os.utime(f.fileno() if os.utime in os.supports_fd else path, (accessed, modified))
+    except OSError:
+        # A read-only or evicted entry is still a hit; it just ages as if unread.
+        pass
+
+
+def _remove(path):
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        # Still open by a reader on platforms that refuse to delete open files.
+        pass
@@ -0,0 +1,276 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import Cache
+from .events import default_events
+from .memo import Memo
+from .retry import DEFAULT_BACKOFF, DEFAULT_RETRIES
+from .spill import parse_size
+
+DEFAULT_HOST = "https://cloud.datasets.sh/e/trackinsight-standard/v2"
+DEFAULT_METADATA_TTL = 300
+
+
+def build_url(host, endpoint, params=None):
+    """Build an API URL from a base URL, an endpoint and query parameters.
+
+    Args:
+        host (str): API base URL.
+        endpoint (str): API endpoint path relative to ``host``.
+        params (dict | None): Query parameters. Keys with ``None`` values are skipped.
+
+    Returns:
+        str: Fully qualified request URL.
+    """
+    qparams = ""
+    if params is not None:
+        qparams = "&" + urlencode({k: v for k, v in params.items() if v is not None})
+    return host + "/" + endpoint + "?" + qparams
+
+
+def resolve_config(key=None, host=None, storage=None, max_workers=None, verify_cert=None, retries=None, backoff=None,
+                   metadata_ttl=None, memory_limit=None, ipc_compression=None):
+    """Resolve client settings, reading the environment for every argument left to ``None``.
+
+    Args:
+        key (str | None, optional): API key. Defaults to ``TRACK_API_KEY``.
+        host (str | None, optional): API base URL. Defaults to ``TRACK_API_HOST``.
+        storage (str | Path | None, optional): Local folder used by downloaders.
+            Defaults to ``TRACK_API_STORAGE``. The folder is created if needed.
+        max_workers (int | None, optional): Number of parallel partition downloads.
+            Defaults to ``TRACK_API_DL_WORKERS``.
+        verify_cert (bool | None, optional): Whether to verify TLS certificates.
+            Defaults to ``TRACK_API_VERIFY_CERT``.
+        retries (int | None, optional): Number of retries of a failed partition.
+            Defaults to ``TRACK_API_RETRIES``.
+        backoff (float | None, optional): Backoff in seconds of the first retry.
+            Defaults to ``TRACK_API_BACKOFF``.
+        metadata_ttl (float | None, optional): Lifetime in seconds of memoized metadata.
+            Defaults to ``TRACK_API_METADATA_TTL``.
+        memory_limit (int | str | None, optional): Byte budget of in-memory loads, past
+            which partitions are spilled to disk. Defaults to ``TRACK_API_MEMORY_LIMIT``;
+            unset means no limit.
+        ipc_compression (str | None, optional): Compression of downloads stored as Arrow
+            IPC files, ``uncompressed`` or ``lz4``. Defaults to
+            ``TRACK_API_IPC_COMPRESSION``, else ``uncompressed``.
+
+    Returns:
+        dict: ``key``, ``host``, ``data_dir``, ``max_workers``, ``verify_cert``, ``retries``,
+            ``backoff``, ``metadata_ttl``, ``memory_limit``, ``ipc_compression`` and ``debug``.
+    """
+    if key is None:
+        key = os.getenv("TRACK_API_KEY")
+    if key is None:
+        print("Environment variable TRACK_API_KEY is not defined")
+        raise RuntimeError("Environment variable TRACK_API_KEY is not defined")
+
+    if host is None:
+        host = os.getenv("TRACK_API_HOST", DEFAULT_HOST)
+    if storage is None:
+        storage = os.getenv("TRACK_API_STORAGE", "trackinsight_data")
+    if max_workers is None:
+        max_workers = int(os.getenv("TRACK_API_DL_WORKERS", 10))
+    if verify_cert is None:
+        verify_cert = os.getenv("TRACK_API_VERIFY_CERT", "true").lower() == "true"
+    if retries is None:
+        retries = int(os.getenv("TRACK_API_RETRIES", DEFAULT_RETRIES))
+    if backoff is None:
+        backoff = float(os.getenv("TRACK_API_BACKOFF", DEFAULT_BACKOFF))
+    if metadata_ttl is None:
+        metadata_ttl = float(os.getenv("TRACK_API_METADATA_TTL", DEFAULT_METADATA_TTL))
+    if memory_limit is None:
+        memory_limit = os.getenv("TRACK_API_MEMORY_LIMIT")
+    if ipc_compression is None:
+        ipc_compression = os.getenv("TRACK_API_IPC_COMPRESSION", "uncompressed")
+    if ipc_compression not in ("uncompressed", "lz4"):
+        raise ValueError(f"ipc_compression must be 'uncompressed' or 'lz4', got {ipc_compression!r}")
+
+    data_dir = Path(storage)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return {
+        "key": key,
+        "host": host.rstrip("/"),
+        "data_dir": data_dir,
+        "max_workers": max(1, int(max_workers)),
+        "verify_cert": verify_cert,
+        "retries": max(0, int(retries)),
+        "backoff": max(0.0, float(backoff)),
+        "metadata_ttl": max(0.0, float(metadata_ttl)),
+        "memory_limit": parse_size(memory_limit),
+        "ipc_compression": ipc_compression,
+        "debug": os.getenv("TRACK_API_LOG") == "DEBUG",
+    }
+
+
+class Client:
+    """Reusable connection to the Trackinsight API.
+
+    Configuration is resolved once, when the client is created. Every request goes
+    through one pooled ``requests.Session`` whose connection pool is sized to
+    ``max_workers``, so partition downloads reuse keep-alive connections instead of
+    opening a new TCP+TLS connection per request. Partition downloads run on one worker
+    pool of the same size, shared by every call made with the client. Failed partitions
+    are retried with jittered exponential backoff while the number of partitions in
+    flight adapts to errors and latency. Metadata is memoized for ``metadata_ttl`` seconds
+    and concurrent identical partition listings share one request.
+
+    Args:
+        key (str | None, optional): API key. Defaults to ``TRACK_API_KEY``.
+        host (str | None, optional): API base URL. Defaults to ``TRACK_API_HOST``.
+        storage (str | Path | None, optional): Local folder used by downloaders.
+            Defaults to ``TRACK_API_STORAGE``.
+        max_workers (int | None, optional): Number of parallel partition downloads and
+            size of the connection pool. Defaults to ``TRACK_API_DL_WORKERS``.
+        verify_cert (bool | None, optional): Whether to verify TLS certificates.
+            Defaults to ``TRACK_API_VERIFY_CERT``.
+        cache (Cache | bool | None, optional): Read-through cache used by the in-memory
+            loaders. ``None`` builds one from ``TRACK_API_CACHE`` when it is set;
+            ``False`` disables caching.
+        retries (int | None, optional): Number of retries of a failed partition.
+            Defaults to ``TRACK_API_RETRIES``.
+        backoff (float | None, optional): Backoff in seconds of the first retry.
+            Defaults to ``TRACK_API_BACKOFF``.
+        metadata_ttl (float | None, optional): Lifetime in seconds of memoized metadata.
+            Defaults to ``TRACK_API_METADATA_TTL``.
+        memory_limit (int | str | None, optional): Byte budget of in-memory loads, for
+            example ``4G``; larger loads are spilled to disk and returned as a
+            ``LazyFrame``. Defaults to ``TRACK_API_MEMORY_LIMIT``; unset means no limit.
+        ipc_compression (str | None, optional): Compression of downloads stored with
+            ``format="ipc"``: ``uncompressed`` (memory-mappable without copies) or
+            ``lz4``. Defaults to ``TRACK_API_IPC_COMPRESSION``, else ``uncompressed``.
+        events (Callable[[dict], None] | None, optional): Receives the progress, partition
+            metrics, retry and summary events of every load. Defaults to
+            ``events.log_event``, or ``events.print_progress`` when
+            ``TRACK_API_PROGRESS=print``.
+    """
+
+    def __init__(self, key=None, host=None, storage=None, max_workers=None, verify_cert=None, cache=None,
+                 retries=None, backoff=None, metadata_ttl=None, events=None, memory_limit=None,
+                 ipc_compression=None):
+        config = resolve_config(key, host, storage, max_workers, verify_cert, retries, backoff, metadata_ttl,
+                                memory_limit, ipc_compression)
+        self.key = config["key"]
+        self.host = config["host"]
+        self.data_dir = config["data_dir"]
+        self.max_workers = config["max_workers"]
+        self.verify_cert = config["verify_cert"]
+        self.retries = config["retries"]
+        self.backoff = config["backoff"]
+        self.metadata_ttl = config["metadata_ttl"]
+        self.memory_limit = config["memory_limit"]
+        self.ipc_compression = config["ipc_compression"]
+        self.debug = config["debug"]
+        if cache is None:
+            cache = Cache.from_env()
+        self.cache = cache or None
+        self.events = default_events() if events is None else events
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"X-API-KEY": self.key, "Connection": "keep-alive"})
+        self.session.verify = self.verify_cert
+        self.memo = Memo()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        """Worker pool shared by every partition download made with this client.
+
+        Tasks running on the pool must not wait on other tasks submitted to it.
+        """
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="trackinsight")
+        return self._pool
+
+    def url(self, endpoint, params=None):
+        """Build an API URL from an endpoint and query parameters.
+
+        Args:
+            endpoint (str): API endpoint path relative to ``host``.
+            params (dict | None): Query parameters. Keys with ``None`` values are skipped.
+
+        Returns:
+            str: Fully qualified request URL.
+        """
+        return build_url(self.host, endpoint, params)
+
+    def get(self, url, **kwargs):
+        """Send a GET request through the pooled session.
+
+        Args:
+            url (str): Fully qualified request URL.
+            **kwargs: Extra arguments forwarded to ``requests.Session.get``.
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        """Shut down the worker pool and close every pooled connection held by the client."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client(client=None):
+    """Return ``client`` when given, otherwise the shared default client.
+
+    The default client is created lazily from the environment on first use, so
+    environment variables loaded with ``dotenv`` before the first request are honoured.
+
+    Args:
+        client (Client | None, optional): Caller-provided client.
+
+    Returns:
+        Client: The client to use for the request.
+    """
+    global _default_client
+    if client is not None:
+        return client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = Client()
+    return _default_client
+
+
+def set_client(client):
+    """Replace the shared default client.
+
+    Args:
+        client (Client | None): New default client. ``None`` closes the current one and
+            makes the next request build a fresh client from the environment.
+
+    Returns:
+        None.
+    """
+    global _default_client
+    with _default_client_lock:
+        previous = _default_client
+        _default_client = client
+    if previous is not None and previous is not client:
+        previous.close()
@@ -0,0 +1,159 @@
+import math
+import os
+import shutil
+
+import polars as pl
+
+from ._files import DATE_COLUMNS, ID_COLUMNS, PARTIAL_SUFFIXES, data_files
+from .client import get_client
+from .index import index_path, updateIndex
+from .manifest import Manifest, manifest_path
+from .snapshots import DEFAULT_SNAPSHOTS, Snapshot, currentSnapshot
+
+DEFAULT_TARGET_SIZE = 256 * 1024**2
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+DEFAULT_COMPRESSION = "zstd"
+# Name of the snapshot a plain folder is published as once compacted.
+COMPACT_SNAPSHOT = "compact"
+
+
+def sortColumns(schema):
+    """Return the default sort columns of a dataset: its id column, then its date column.
+
+    Args:
+        schema (polars.Schema | dict): Schema of the dataset.
+
+    Returns:
+        list[str]: ``share_id`` or ``id``, followed by ``date`` or ``stamp``, when present.
+    """
+    names = list(schema)
+    columns = [c for c in ID_COLUMNS if c in names][:1]
+    columns += [c for c in DATE_COLUMNS if c in names][:1]
+    return columns
+
+
+def _leaves(root):
+    """List the folders of a Hive layout that directly hold parquet files."""
+    return sorted({os.path.dirname(path) for path in data_files(root)})
+
+
+def _writeLeaf(files, target, sortBy, targetSize, rowGroupSize, compression, compressionLevel):
+    """Rewrite the parquet files of one partition folder into sorted, target-sized files."""
+    frame = pl.concat([pl.read_parquet(f, hive_partitioning=False) for f in files], how="vertical_relaxed")
+    keys = sortColumns(frame.schema) if sortBy is None else [c for c in sortBy if c in frame.columns]
+    if keys:
+        frame = frame.sort(keys)
+    chunks = max(1, math.ceil(frame.estimated_size() / targetSize))
+    rows = max(1, math.ceil(frame.height / chunks))
+    os.makedirs(target, exist_ok=True)
+    names = ["data.parquet"] if chunks == 1 else [f"part-{i:05d}.parquet" for i in range(chunks)]
+    for i, name in enumerate(names):
+        frame.slice(i * rows, rows).write_parquet(
+            os.path.join(target, name),
+            compression=compression,
+            compression_level=compressionLevel,
+            statistics=True,
+            row_group_size=rowGroupSize)
+    return names
+
+
+def _compactLeaves(root, staging, leaves, summary, sortBy, targetSize, rowGroupSize, compression, compressionLevel):
+    """Write the compacted partitions of ``root`` to ``staging`` and count them in ``summary``.
+
+    Returns:
+        dict: Names of the files written, by partition folder relative to ``root``.
+    """
+    written = {}
+    for leaf in leaves:
+        files = sorted(os.path.join(leaf, name) for name in os.listdir(leaf) if name.endswith(".parquet"))
+        relative = os.path.relpath(leaf, root)
+        names = _writeLeaf(files, os.path.join(staging, relative), sortBy, targetSize, rowGroupSize,
+                           compression, compressionLevel)
+        written[relative] = names
+        summary["partitions"] += 1
+        summary["files_before"] += len(files)
+        summary["bytes_before"] += sum(os.path.getsize(f) for f in files)
+        summary["files_after"] += len(names)
+        summary["bytes_after"] += sum(os.path.getsize(os.path.join(staging, relative, n)) for n in names)
+
+    # Carry over anything that is not a partition file, such as indexes, but not the
+    # leftovers of unfinished downloads.
+    for current, _, names in os.walk(root):
+        for name in names:
+            if not name.endswith(".parquet") and not name.endswith(PARTIAL_SUFFIXES):
+                source = os.path.join(current, name)
+                destination = os.path.join(staging, os.path.relpath(source, root))
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.copy2(source, destination)
+    return written
+
+
+def compact(folder,sortBy=None,targetSize=DEFAULT_TARGET_SIZE,rowGroupSize=DEFAULT_ROW_GROUP_SIZE,
+            compression=DEFAULT_COMPRESSION,compressionLevel=None,client=None,snapshots=None):
+    """Rewrite a downloaded parquet dataset into sorted, statistics-rich files.
+
+    Every partition folder of the Hive layout (``stamp=...``, ``mod_20=...``) is kept,
+    and its files are merged, sorted by ``sortBy`` and split into files of about
+    ``targetSize`` bytes in memory, written with ``rowGroupSize`` rows per row group and
+    min/max statistics on every column. Scans filtering on the sort columns can then
+    skip most row groups.
+
+    The compacted layout is written to a new snapshot of the folder (see
+    ``snapshots.Snapshot``), published by atomically swapping the ``<folder>`` symlink, so
+    readers never see a half-compacted folder. The last ``snapshots`` previous snapshots
+    are kept for running readers and older ones are deleted; a plain folder is replaced by its first snapshot, ``compact``. A partition
+    compacted into a single file keeps the ``data.parquet`` name and its download
+    manifest entry is updated, so incremental downloads still skip it.
+
+    Args:
+        folder (str): Dataset folder under ``<TRACK_API_STORAGE>/parquet``, as used by the
+            downloaders (for example ``eur_timeseries`` or ``holdings``).
+        sortBy (list[str] | None, optional): Sort columns. Defaults to the id column
+            (``share_id`` or ``id``) then the date column (``date`` or ``stamp``).
+        targetSize (int, optional): Target in-memory size in bytes of each output file.
+        rowGroupSize (int, optional): Number of rows per row group.
+        compression (str, optional): Parquet compression codec, for example ``zstd``,
+            ``lz4``, ``snappy`` or ``uncompressed``.
+        compressionLevel (int | None, optional): Level of the compression codec.
+        client (Client | None, optional): Client whose storage holds the dataset.
+        snapshots (int | None, optional): Number of previous snapshots to keep. Defaults
+            to ``snapshots.DEFAULT_SNAPSHOTS``.
+
+    Returns:
+        dict: ``partitions`` compacted, ``files_before``/``files_after`` and
+            ``bytes_before``/``bytes_after`` on disk.
+    """
+    client = get_client(client)
+    base = client.data_dir / "parquet"
+    root = str(base / folder)
+
+    summary = {"partitions": 0, "files_before": 0, "files_after": 0, "bytes_before": 0, "bytes_after": 0}
+    leaves = _leaves(root)
+    if not leaves:
+        return summary
+
+    current = currentSnapshot(base, folder)
+    snapshot = Snapshot(base, folder, COMPACT_SNAPSHOT if current is None else current.name).stage(seed=False)
+    staging = str(snapshot.staging)
+    published = False
+    try:
+        written = _compactLeaves(root, staging, leaves, summary, sortBy, targetSize, rowGroupSize,
+                                 compression, compressionLevel)
+        snapshot.publish(DEFAULT_SNAPSHOTS if snapshots is None else snapshots)
+        published = True
+    finally:
+        if not published:
+            snapshot.discard()
+
+    path = manifest_path(client.data_dir, "parquet", folder)
+    if path.exists():
+        manifest = Manifest(path, root)
+        for partitionPath in list(manifest.partitions):
+            if written.get(os.path.normpath(partitionPath)) == ["data.parquet"]:
+                manifest.refresh(partitionPath, os.path.join(root, partitionPath, "data.parquet"))
+        manifest.save()
+
+    if index_path(client.data_dir, "parquet", folder).exists():
+        updateIndex(folder, client=client)
+
+    return summary
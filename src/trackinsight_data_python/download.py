@@ -5,15 +5,37 @@ from ._params import (
     build_shares_params,
     build_timeseries_params,
 )
-from .api import getMetadata
-from .partitions import getPartitions,read_vars
+from .api import _reportStamps, getMetadata
+from .client import get_client
+from .index import updateIndex
+from .manifest import Manifest, manifest_path
+from .orchestrator import _download
+from .partitions import _plan, getPartitions
+from .retry import PartitionsError
+from .snapshots import currentSnapshot
 
 
-def downloadShares(format='parquet'):
+def _root(folder,format,client=None):
+    """Return the folder a download was stored in: its current snapshot, if any."""
+    base = get_client(client).data_dir / format
+    return currentSnapshot(base, folder) or base / folder
+
+
+def downloadShares(format='parquet',client=None,incremental=True,index=True,snapshots=None):
     """Download shares partitions to disk and return the output file pattern.
 
     Args:
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -21,23 +43,33 @@ def downloadShares(format='parquet'):
     endpoint='shares'
     folder = endpoint
     params = build_shares_params()
-    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format);
-
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
+    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format,client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
 
-    pattern = data_dir / format / folder / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("**/*."+format)
 
     return str(pattern)
 
-def downloadReports(stamp=None,ccy='eur',format='parquet',periods=None):
+def downloadReports(stamp=None,ccy='eur',format='parquet',periods=None,client=None,incremental=True,index=True,snapshots=None):
     """Download report partitions for the given stamp and return the output pattern.
 
     Args:
         stamp (str | None, optional): Report valuation date in ``YYYY-MM-DD`` format.
             When ``None``, the latest available stamp for ``ccy`` is used.
         ccy (str, optional): Currency code.
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
         periods (list[str] | tuple[str, ...] | None, optional): Report periods to request.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -48,24 +80,93 @@ def downloadReports(stamp=None,ccy='eur',format='parquet',periods=None):
         stamp=stamp,
         ccy=ccy,
         periods=periods,
-        metadata_loader=getMetadata,
+        metadata_loader=lambda: getMetadata(client=client),
     )
-    getPartitions(endpoint='reports',folder=folder,params=params,format=format,partitionOrder=["stamp","mod_20"]);
+    getPartitions(endpoint='reports',folder=folder,params=params,format=format,partitionOrder=["stamp","mod_20"],client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
     
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-
-    pattern = data_dir / format / folder / ("stamp="+stamp) / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("stamp="+stamp) / ("**/*."+format)
     
     return str(pattern)
 
-def downloadTimeseries(start,end,ccy='eur',format='parquet'):
+def downloadReportsPanel(stamps=None,start=None,end=None,ccy='eur',format='parquet',periods=None,client=None,incremental=True,index=True,snapshots=None):
+    """Download the reports of several stamps into one ``stamp=`` Hive tree.
+
+    Stamps already completely downloaded are skipped without any request. The partition
+    listings of the other stamps are requested concurrently, then all their partitions
+    are downloaded together on the client pool, instead of one stamp after the other.
+
+    Args:
+        stamps (list[str] | tuple[str, ...] | None, optional): Report valuation dates in
+            ``YYYY-MM-DD`` format. When ``None``, every stamp listed for ``ccy`` by
+            ``getMetadata`` between ``start`` and ``end`` is downloaded.
+        start (str | None, optional): First stamp (inclusive) when ``stamps`` is ``None``.
+        end (str | None, optional): Last stamp (inclusive) when ``stamps`` is ``None``.
+        ccy (str, optional): Currency code.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
+        periods (list[str] | tuple[str, ...] | None, optional): Report periods to request.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Skip stamps already downloaded and, within the
+            others, partitions that did not change. When ``False``, every partition is
+            fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download every stamp into one new snapshot of
+            the folder, published once all of them are stored. See ``getPartitions``.
+
+    Returns:
+        list[str]: Glob pattern of the downloaded files of each stamp, in stamp order.
+
+    Raises:
+        PartitionsError: When some partitions still failed after their retries.
+    """
+    client = get_client(client)
+    folder = ccy+'_reports'
+    stamps = _reportStamps(stamps, start, end, ccy, client)
+    base = client.data_dir / format
+    manifest = Manifest(manifest_path(client.data_dir, format, folder), currentSnapshot(base, folder) or base / folder)
+    queries = []
+    for stamp in stamps:
+        params, _ = build_reports_params(stamp=stamp, ccy=ccy, periods=periods)
+        if incremental and manifest.completed(params, format):
+            continue
+        queries.append({"dataset":"reports","folder":folder,"params":params,"partitionOrder":["stamp","mod_20"]})
+
+    if queries:
+        plans = list(client.pool.map(lambda query: _plan("reports", query["params"], client), queries))
+        loads = _download(queries, plans, format, incremental, snapshots, client)
+        failures = [failure for load in loads for failure in load.failures]
+        if failures:
+            raise PartitionsError("reports", failures, [result for load in loads for result in load.results])
+        errors = [query["error"] for query in queries if "error" in query]
+        if errors:
+            raise ValueError(errors[0])
+        if index:
+            updateIndex(folder,format,client=client)
+
+    root = _root(folder,format,client)
+    return [str(root / ("stamp="+stamp) / ("**/*."+format)) for stamp in stamps]
+
+def downloadTimeseries(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
     """Download timeseries partitions for a date range and return the output pattern.
 
     Args:
         start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
         end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -74,22 +175,32 @@ def downloadTimeseries(start,end,ccy='eur',format='parquet'):
     folder = ccy+'_timeseries'
     params = build_timeseries_params(start=start, end=end, ccy=ccy)
     
-    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format);
+    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format,client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
     
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-
-    pattern = data_dir / format / folder / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("**/*."+format)
     
     return str(pattern)
 
-def downloadHoldings(format='parquet',proxy=True,level=0,extraLines=False):
+def downloadHoldings(format='parquet',proxy=True,level=0,extraLines=False,client=None,incremental=True,index=True,snapshots=None):
     """Download holdings partitions to disk and return the output file pattern.
 
     Args:
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
         proxy (bool, optional): Whether to include proxy holdings.
         level (int, optional): The depth at which ETFs containing other ETFs are expanded in portfolios. 0 = no expansion, 1 = expand ETFs once, 2 = expand ETFs of ETFs recursively
         extraLines (bool, optional): Whether to include special portfolio lines (????????CASH, ??DERIVATIVE, ?????NOTCASH, ?????UNKNOWN)
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -98,21 +209,31 @@ def downloadHoldings(format='parquet',proxy=True,level=0,extraLines=False):
     folder = endpoint
     
     params = build_holdings_params(proxy=proxy, level=level, extraLines=extraLines)
-    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format);
+    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format,client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
     
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-
-    pattern = data_dir / format / folder / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("**/*."+format)
     return str(pattern)
     
-def downloadLiquidity(start,end,ccy='eur',format='parquet'):
+def downloadLiquidity(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
     """Download liquidity partitions for a date range and return the output pattern.
 
     Args:
         start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
         end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -120,22 +241,32 @@ def downloadLiquidity(start,end,ccy='eur',format='parquet'):
     endpoint = 'liquidity'
     folder = ccy+"_"+endpoint
     params = build_liquidity_params(start=start, end=end, ccy=ccy)
-    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format);
+    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format,client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
     
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-
-    pattern = data_dir / format / folder / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("**/*."+format)
     
     return str(pattern)
 
-def downloadLiquiditySummary(start,end,ccy='eur',format='parquet'):
+def downloadLiquiditySummary(start,end,ccy='eur',format='parquet',client=None,incremental=True,index=True,snapshots=None):
     """Download liquidity summary partitions for a date range and return the output pattern.
 
     Args:
         start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
         end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
         ccy (str, optional): Currency code.
-        format (str, optional): File format requested from the API.
+        format (str, optional): File format requested from the API, or ``ipc`` to store
+            the partitions as Arrow IPC files (see ``local``).
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        incremental (bool, optional): Only fetch partitions that are new or changed since the
+            last download and delete the ones that disappeared. When ``False``, every partition
+            is fetched again.
+        index (bool, optional): Keep the id index of the folder up to date after the
+            download, for ``loadIndexed``. Only parquet and ipc downloads are indexed.
+        snapshots (int | None, optional): Download into a new snapshot of the folder,
+            published atomically once complete, and keep that many previous snapshots.
+            The returned pattern then points into the new snapshot. See ``getPartitions``.
 
     Returns:
         str: Glob pattern pointing to downloaded files on disk.
@@ -143,10 +274,10 @@ def downloadLiquiditySummary(start,end,ccy='eur',format='parquet'):
     endpoint = 'liquidity_summary'
     folder = ccy+"_"+endpoint
     params = build_liquidity_params(start=start, end=end, ccy=ccy)
-    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format);
+    getPartitions(endpoint=endpoint,folder=folder,params=params,format=format,client=client,incremental=incremental,snapshots=snapshots);
+    if index:
+        updateIndex(folder,format,client=client)
     
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-
-    pattern = data_dir / format / folder / ("**/*."+format)
+    pattern = _root(folder,format,client) / ("**/*."+format)
     
     return str(pattern)
@@ -0,0 +1,113 @@
+import logging
+import os
+import sys
+import threading
+
+import polars as pl
+
+logger = logging.getLogger("trackinsight_data_python")
+
+_LEVELS = {
+    "progress": logging.DEBUG,
+    "partition": logging.DEBUG,
+    "retry": logging.WARNING,
+    "summary": logging.INFO,
+}
+
+
+def describe(event):
+    """Render an event as a one-line human readable message."""
+    kind = event["event"]
+    endpoint = event["endpoint"]
+    if kind == "progress":
+        return f'loading {endpoint}... {round(100 * event["done"] / event["total"],0)}% of {event["total"]} partitions'
+    if kind == "partition":
+        return (f'{endpoint} {event["partition"]}: {event["status"]}, {event["bytes"]} bytes, '
+                f'{event["rows"]} rows, wait {event["queue_wait"]:.3f}s, ttfb {event["ttfb"]:.3f}s, '
+                f'download {event["download"]:.3f}s, decode {event["decode"]:.3f}s, {event["retries"]} retries')
+    if kind == "retry":
+        return f'retrying {endpoint} {event["partition"]} in {event["delay"]:.1f}s: {event["error"]}'
+    peak = event["peak_rss"]
+    return (f'loaded {endpoint}: {event["partitions"]} partitions, {event["failed"]} failed, '
+            f'{event["rows"]} rows, {event["bytes"] / 1024**2:.1f} MB in {event["elapsed"]:.2f}s '
+            f'({event["mb_per_s"]:.1f} MB/s, {event["rows_per_s"]:.0f} rows/s), '
+            f'peak RSS {"n/a" if peak is None else f"{peak / 1024**2:.1f} MB"}')
+
+
+def log_event(event):
+    """Route an event to the ``trackinsight_data_python`` logger.
+
+    Progress and per-partition events are logged at ``DEBUG``, summaries at ``INFO`` and
+    retries at ``WARNING``. The event dict is attached to the record as ``event``. Nothing
+    is formatted unless the logger is enabled for the level, so this is the default.
+    """
+    level = _LEVELS[event["event"]]
+    if logger.isEnabledFor(level):
+        logger.log(level, describe(event), extra={"event": event})
+
+
+def print_progress(event):
+    """Print progress in place on the current terminal line, then the summary of each load."""
+    if event["event"] == "progress":
+        print(f'\r{describe(event)}', end="\n" if event["done"] == event["total"] else "", flush=True)
+    elif event["event"] == "summary":
+        print(describe(event), flush=True)
+
+
+def default_events():
+    """Return ``print_progress`` when ``TRACK_API_PROGRESS=print``, otherwise ``log_event``."""
+    if os.getenv("TRACK_API_PROGRESS", "").lower() == "print":
+        return print_progress
+    return log_event
+
+
+class Metrics:
+    """Event handler collecting per-partition metrics and load summaries in memory.
+
+    Args:
+        forward (Callable[[dict], None] | None, optional): Handler also receiving every
+            event, for example ``log_event``.
+
+    Attributes:
+        partitions (list[dict]): ``partition`` events, one per fetched partition.
+        summaries (list[dict]): ``summary`` events, one per ``getPartitions`` call.
+    """
+
+    def __init__(self, forward=None):
+        self.forward = forward
+        self.partitions = []
+        self.summaries = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event["event"] in ("partition", "summary"):
+            with self._lock:
+                (self.partitions if event["event"] == "partition" else self.summaries).append(event)
+        if self.forward is not None:
+            self.forward(event)
+
+    def frame(self):
+        """Return the per-partition metrics as a Polars DataFrame."""
+        with self._lock:
+            return pl.DataFrame(self.partitions, infer_schema_length=None)
+
+
+def emit(client, event):
+    """Send an event to the client's handler, if any."""
+    handler = getattr(client, "events", None)
+    if handler is not None:
+        handler(event)
+
+
+def peak_rss():
+    """Return the peak resident set size of the process in bytes.
+
+    Returns:
+        int | None: Peak RSS, or ``None`` on platforms without the ``resource`` module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -1,22 +1,147 @@
 import polars as pl
 
-def contains_any(column,values):
+from ._files import ID_COLUMNS
+
+def contains_any(column,values,index=None):
+    if index is not None:
+        return _indexed(index,column,index.contains_any(values))
     return pl.col(column).list.eval(
         pl.element().is_in(values)
     ).list.any()
 
-def contains_all(column,values):
+def contains_all(column,values,index=None):
+    if index is not None:
+        return _indexed(index,column,index.contains_all(values))
     return pl.col(column).list.eval(
             pl.element().is_in(values)
         ).list.sum() == len(values)
 
-def single_among(column,values):
+def single_among(column,values,index=None):
+    if index is not None:
+        return _indexed(index,column,index.single_among(values))
     return (
         (pl.col(column).list.len() == 1) &
         (pl.col(column).list.first().is_in(values)))
 
-def contains_exact(column,values):
+def contains_exact(column,values,index=None):
+    if index is not None:
+        return _indexed(index,column,index.contains_exact(values))
     return pl.col(column).list.sort() == sorted(values)
 
-def contains_any_joined(column, values,sep=';'):
-    return pl.col(column).list.sort().list.join(sep).is_in(values)
\ No newline at end of file
+def contains_any_joined(column, values,sep=';',index=None):
+    if index is not None:
+        return _indexed(index,column,index.contains_any_joined(values,sep))
+    return pl.col(column).list.sort().list.join(sep).is_in(values)
+
+
+class ListIndex:
+    """Index of a list column, built once to evaluate many filters on the same frame.
+
+    Values of the column are dictionary-encoded, and for each value the index keeps the
+    rows holding it. The filter helpers accept the index through their ``index`` argument
+    and then answer with a lookup of the requested values instead of scanning every list
+    of the column. Rows are selected by their ``key``, not by position, so the filters
+    stay correct on filtered, sorted or reloaded copies of the frame.
+
+    Args:
+        frame (polars.DataFrame): Frame the filters are applied to.
+        column (str): List column to index, for example ``class_theme``.
+        key (str | None, optional): Column identifying the rows. Defaults to ``share_id``
+            or ``id``, whichever the frame has.
+
+    Attributes:
+        column (str): Indexed column.
+        key (str): Column identifying the rows.
+        height (int): Number of rows of the indexed frame.
+
+    Raises:
+        ValueError: When the frame has no key column, or its keys are null or not unique.
+    """
+
+    def __init__(self, frame, column, key=None):
+        if key is None:
+            key = next((c for c in ID_COLUMNS if c in frame.columns), None)
+            if key is None:
+                raise ValueError(f"no {' or '.join(ID_COLUMNS)} column to identify the rows, pass key")
+        ids = frame.get_column(key)
+        if ids.null_count() > 0 or ids.n_unique() != frame.height:
+            raise ValueError(f"index key {key!r} must be unique and not null")
+        self.column = column
+        self.key = key
+        self.height = frame.height
+        self._ids = ids
+        self._lists = frame.get_column(column)
+        self._lengths = self._lists.list.len()
+        long = (
+            frame.select(pl.col(column).alias("value"))
+            .with_row_index("row")
+            .explode("value")
+            .drop_nulls("value")
+        )
+        self._values = long.get_column("value").unique().sort()
+        self._codes = {value: code for code, value in enumerate(self._values.to_list())}
+        long = long.join(
+            pl.DataFrame({"value": self._values, "code": pl.int_range(self._values.len(), dtype=pl.UInt32, eager=True)}),
+            on="value")
+        self._postings = (
+            long.group_by("code").agg(pl.col("row"))
+            .sort("code")
+            .get_column("row")
+        )
+        self._nulls = ids.filter(self._lengths.is_null())
+        self._signatures = None
+        self._joined = {}
+
+    def _check(self, column):
+        if column != self.column:
+            raise ValueError(f"index is built on {self.column!r}, not {column!r}")
+
+    def _hits(self, values):
+        """Count, for every row, its elements that are among ``values``."""
+        codes = sorted({self._codes[v] for v in values if v in self._codes})
+        counts = pl.zeros(self.height, pl.UInt32, eager=True)
+        if not codes:
+            return counts
+        rows = self._postings.gather(codes).explode().drop_nulls()
+        found = rows.value_counts(name="count")
+        return counts.scatter(found.get_column(rows.name), found.get_column("count").cast(pl.UInt32))
+
+    def _result(self, mask):
+        """Select the keys of the rows in ``mask``, null for null lists like the list expressions."""
+        selected = pl.col(self.key).is_in(self._ids.filter(mask).implode())
+        if self._nulls.len() > 0:
+            selected = pl.when(~pl.col(self.key).is_in(self._nulls.implode())).then(selected)
+        return selected.alias(self.column)
+
+    def contains_any(self, values):
+        """Rows whose list holds at least one of ``values``."""
+        return self._result(self._hits(values) > 0)
+
+    def contains_all(self, values):
+        """Rows whose elements among ``values`` count ``len(values)``."""
+        return self._result(self._hits(values) == len(values))
+
+    def single_among(self, values):
+        """Rows whose list has one element, among ``values``."""
+        return self._result((self._lengths == 1) & (self._hits(values) == 1))
+
+    def contains_exact(self, values):
+        """Rows whose list holds exactly ``values``, in any order."""
+        if self._signatures is None:
+            self._signatures = self._lists.list.sort()
+        if any(v not in self._codes for v in values):
+            return self._result(pl.repeat(False, self.height, eager=True))
+        target = pl.Series([sorted(values)], dtype=self._lists.dtype)
+        return self._result((self._lengths == len(values)) & (self._signatures == target.first()))
+
+    def contains_any_joined(self, values, sep=';'):
+        """Rows whose sorted list, joined with ``sep``, is one of ``values``."""
+        joined = self._joined.get(sep)
+        if joined is None:
+            joined = self._joined[sep] = self._lists.list.sort().list.join(sep)
+        return self._result(joined.is_in(pl.Series(values, dtype=pl.String).implode()))
+
+
+def _indexed(index, column, selected):
+    index._check(column)
+    return selected
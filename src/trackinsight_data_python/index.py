@@ -0,0 +1,176 @@
+import os
+from pathlib import Path
+
+import polars as pl
+
+from ._files import ID_COLUMNS, IPC_FORMAT, data_files
+from .client import get_client
+from .local import readFile
+
+INDEX_SCHEMA = {
+    "id": pl.Int64,
+    "file": pl.String,
+    "offset": pl.Int64,
+    "length": pl.Int64,
+    "file_size": pl.Int64,
+    "file_mtime": pl.Int64,
+}
+INDEXED_FORMATS = ("parquet", IPC_FORMAT)
+
+
+def index_path(data_dir, format, folder):
+    """Return the id index location of a downloaded dataset folder.
+
+    Like the manifest, the index sits next to the Hive layout
+    (``<format>/<folder>.index.parquet``) so it never matches the downloaders' glob.
+    """
+    return Path(data_dir) / format / (folder + ".index.parquet")
+
+
+def idColumn(schema):
+    """Return the share id column of a dataset schema (``share_id`` or ``id``), if any."""
+    return next((c for c in ID_COLUMNS if c in schema), None)
+
+
+def _scan(path, format):
+    if format == IPC_FORMAT:
+        return pl.scan_ipc(path, hive_partitioning=False)
+    return pl.scan_parquet(path, hive_partitioning=False)
+
+
+def _indexFile(root, relative, stat, format):
+    path = os.path.join(root, relative)
+    scan = _scan(path, format)
+    column = idColumn(scan.collect_schema())
+    if column is None:
+        return None
+    return (
+        scan
+        .select(pl.col(column).cast(pl.Int64).alias("id"))
+        .with_row_index("row")
+        .group_by("id")
+        .agg(
+            offset=pl.col("row").min().cast(pl.Int64),
+            length=(pl.col("row").max() - pl.col("row").min() + 1).cast(pl.Int64))
+        .with_columns(
+            file=pl.lit(relative),
+            file_size=pl.lit(stat.st_size, pl.Int64),
+            file_mtime=pl.lit(stat.st_mtime_ns, pl.Int64))
+        .select(list(INDEX_SCHEMA))
+        .collect()
+    )
+
+
+def updateIndex(folder,format='parquet',client=None):
+    """Build or refresh the id index of a downloaded parquet or IPC dataset.
+
+    For every file of the dataset and every share id it holds, the index records the
+    first row and the length of the row range holding that id. Files whose size and
+    modification time did not change keep their entries; only new or rewritten files
+    are read again, and entries of deleted files are dropped. Ranges are tight on files
+    sorted by id, such as the ones written by ``compact``.
+
+    Args:
+        folder (str): Dataset folder under ``<TRACK_API_STORAGE>/<format>``, as used by the
+            downloaders (for example ``eur_reports`` or ``holdings``).
+        format (str, optional): File format of the dataset. Only ``parquet`` and ``ipc``
+            datasets are indexed.
+        client (Client | None, optional): Client whose storage holds the dataset.
+
+    Returns:
+        Path | None: Location of the index, or ``None`` when the format is not indexed.
+    """
+    if format not in INDEXED_FORMATS:
+        return None
+    client = get_client(client)
+    root = client.data_dir / format / folder
+    path = index_path(client.data_dir, format, folder)
+
+    previous = pl.read_parquet(path) if path.exists() else pl.DataFrame(schema=INDEX_SCHEMA)
+    known = {
+        row["file"]: (row["file_size"], row["file_mtime"])
+        for row in previous.select("file", "file_size", "file_mtime").unique().iter_rows(named=True)
+    }
+
+    kept = []
+    frames = []
+    for filepath in sorted(data_files(root, "."+format)):
+        relative = Path(os.path.relpath(filepath, root)).as_posix()
+        stat = os.stat(filepath)
+        if known.get(relative) == (stat.st_size, stat.st_mtime_ns):
+            kept.append(relative)
+            continue
+        frame = _indexFile(root, relative, stat, format)
+        if frame is not None:
+            frames.append(frame)
+
+    index = pl.concat([previous.filter(pl.col("file").is_in(kept)), *frames]).sort("id", "file", "offset")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    index.write_parquet(tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def loadIndexed(folder,ids,columns=None,format='parquet',client=None,memoryMap=None):
+    """Load the rows of some share ids from a downloaded dataset, reading only their ranges.
+
+    Uses the index written by ``updateIndex``: only files holding the requested ids are
+    opened, and only the row range of each id is read, so Polars skips the row groups
+    outside it. IPC files are memory-mapped when possible (see ``local.readFile``), so
+    only the pages of those ranges are touched.
+
+    Args:
+        folder (str): Dataset folder under ``<TRACK_API_STORAGE>/<format>``.
+        ids (list[int] | tuple[int]): Share IDs to load.
+        columns (list[str] | None, optional): Columns to read. Defaults to every column.
+        format (str, optional): File format of the dataset.
+        client (Client | None, optional): Client whose storage holds the dataset.
+        memoryMap (bool | None, optional): Only used for ``ipc``, see ``local.readFile``.
+
+    Returns:
+        polars.DataFrame | None: Rows of the requested ids, or ``None`` when none is stored.
+
+    Raises:
+        FileNotFoundError: When the dataset has no index.
+    """
+    client = get_client(client)
+    root = client.data_dir / format / folder
+    path = index_path(client.data_dir, format, folder)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} does not exist, download {folder} or call updateIndex first")
+
+    ranges = (
+        pl.scan_parquet(path)
+        .filter(pl.col("id").is_in(list(ids)))
+        .select("file", "offset", "length")
+        .sort("file", "offset")
+        .collect()
+    )
+    if ranges.height == 0:
+        return None
+
+    scans = []
+    for file, group in ranges.group_by("file", maintain_order=True):
+        filepath = root / file[0]
+        if format == IPC_FORMAT:
+            source = readFile(filepath, format, memoryMap=memoryMap).lazy()
+        else:
+            source = pl.scan_parquet(filepath, hive_partitioning=False)
+        column = idColumn(source.collect_schema())
+        for start, end in _mergeRanges(group.iter_rows()):
+            scan = source.slice(start, end - start)
+            scan = scan.filter(pl.col(column).is_in(list(ids)))
+            scans.append(scan if columns is None else scan.select(columns))
+    return pl.concat(scans, how="vertical_relaxed").collect()
+
+
+def _mergeRanges(rows):
+    """Merge overlapping ``(file, offset, length)`` ranges sorted by offset into ``(start, end)``."""
+    merged = []
+    for _, offset, length in rows:
+        if merged and offset <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], offset + length)
+        else:
+            merged.append([offset, offset + length])
+    return merged
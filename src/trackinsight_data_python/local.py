@@ -0,0 +1,118 @@
+"""Arrow IPC storage of downloads and loaders reading downloaded datasets from disk.
+
+Downloads made with ``format="ipc"`` are fetched as parquet and stored as Arrow IPC
+files (``data.ipc``), uncompressed by default. Uncompressed IPC files hold the bytes of
+the in-memory columns, so when the optional ``pyarrow`` dependency is installed they are
+memory-mapped instead of read: every process loading the same dataset shares one
+page-cache copy of it, and loading costs no decoding::
+
+    pip install "trackinsight-data-python[ipc]"
+"""
+
+import polars as pl
+
+from ._files import ID_COLUMNS, IPC_FORMAT, data_files
+from .client import get_client
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+
+def writeIpc(source,path,compression="uncompressed"):
+    """Convert a parquet body to an Arrow IPC file.
+
+    Args:
+        source (BytesIO | str | Path): Parquet bytes received from the API, or the file
+            they were downloaded to.
+        path (str | Path): IPC file written.
+        compression (str, optional): ``uncompressed`` or ``lz4``.
+
+    Returns:
+        int: Number of rows.
+    """
+    frame = pl.read_parquet(source)
+    frame.write_ipc(path, compression=compression)
+    return frame.height
+
+
+def _memoryMapped(memoryMap):
+    if memoryMap and pyarrow is None:
+        raise ImportError(
+            "memory-mapped IPC reads require pyarrow: pip install 'trackinsight-data-python[ipc]'")
+    return pyarrow is not None if memoryMap is None else memoryMap
+
+
+def readFile(path,format,columns=None,memoryMap=None):
+    """Read one downloaded data file.
+
+    Args:
+        path (str | Path): Data file.
+        format (str): Storage format of the file: ``parquet``, ``ipc``, ``json`` or ``csv``.
+        columns (list[str] | None, optional): Columns to read. Defaults to every column.
+        memoryMap (bool | None, optional): Only used for ``ipc``. Memory-map the file with
+            ``pyarrow`` instead of reading it: columns of uncompressed files then point
+            into the shared page cache. ``None`` memory-maps when ``pyarrow`` is installed.
+
+    Returns:
+        polars.DataFrame: Rows of the file.
+
+    Raises:
+        ImportError: When ``memoryMap=True`` and ``pyarrow`` is not installed.
+    """
+    if format == IPC_FORMAT:
+        if _memoryMapped(memoryMap):
+            # The table's buffers keep the mapping alive after ``source`` goes away.
+            source = pyarrow.memory_map(str(path))
+            table = pyarrow.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select(columns)
+            return pl.from_arrow(table, rechunk=False)
+        return pl.read_ipc(path, columns=columns)
+    if format == 'parquet':
+        return pl.read_parquet(path, columns=columns, hive_partitioning=False)
+    if format == 'json':
+        frame = pl.read_json(path)
+    elif format == 'csv':
+        frame = pl.read_csv(path)
+    else:
+        raise ValueError(f"unsupported storage format {format!r}")
+    return frame if columns is None else frame.select(columns)
+
+
+def loadLocal(folder,format='parquet',columns=None,ids=None,memoryMap=None,client=None):
+    """Load a downloaded dataset from disk into one frame.
+
+    Files of the current snapshot (see ``snapshots``) or of the plain dataset folder are
+    read one by one and concatenated without copying their chunks. With ``format="ipc"``
+    and ``pyarrow`` installed, uncompressed files are memory-mapped: loading takes
+    milliseconds and processes loading the same dataset share its memory.
+
+    Args:
+        folder (str): Dataset folder under ``<TRACK_API_STORAGE>/<format>``, as used by the
+            downloaders (for example ``eur_reports`` or ``shares``).
+        format (str, optional): Storage format the dataset was downloaded in.
+        columns (list[str] | None, optional): Columns to read. Defaults to every column.
+        ids (list[int] | tuple[int] | None, optional): Share IDs to keep. See
+            ``loadIndexed`` to read only the files and ranges holding them.
+        memoryMap (bool | None, optional): Only used for ``ipc``, see ``readFile``.
+        client (Client | None, optional): Client whose storage holds the dataset.
+
+    Returns:
+        polars.DataFrame | None: Rows of the dataset, or ``None`` when nothing is stored.
+    """
+    root = get_client(client).data_dir / format / folder
+    files = sorted(data_files(root, "."+format))
+    if not files:
+        return None
+    frames = [readFile(path, format, columns, memoryMap) for path in files]
+    frame = pl.concat(frames, how="vertical_relaxed", rechunk=False)
+    if ids is not None:
+        column = next((c for c in ID_COLUMNS if c in frame.schema), None)
+        if column is None:
+            raise ValueError(f"{folder} has no share id column, expected one of {ID_COLUMNS}")
+        frame = frame.filter(pl.col(column).is_in(list(ids)))
+    return frame
+
@@ -0,0 +1,108 @@
+import polars as pl
+
+from .events import logger
+
+DEFAULT_MAX_ITERATIONS = 10
+SHARE_COLUMN = "share_id"
+HOLDING_SHARE_COLUMN = "holding_share_id"
+WEIGHT_COLUMN = "weight"
+
+_PATH = "_lookthrough_path"
+_CHILD = "_lookthrough_child"
+_PARENT_WEIGHT = "_lookthrough_parent_weight"
+
+
+def lookThrough(holdings,level=2,shareColumn=SHARE_COLUMN,holdingShareColumn=HOLDING_SHARE_COLUMN,
+                weightColumn=WEIGHT_COLUMN,weightScale=1.0,groupBy=None,maxIterations=DEFAULT_MAX_ITERATIONS,
+                onCycle="raise"):
+    """Expand the ETF holdings of a level-0 holdings frame locally.
+
+    A holding whose ``holdingShareColumn`` is a share of the frame is an ETF held by
+    another ETF: it is replaced by that ETF's own holdings, with weights multiplied
+    through. Each expansion step is one join on the whole frame, so the holdings are
+    downloaded once with ``getHoldings(level=0)`` and expanded to any depth here.
+
+    Args:
+        holdings (polars.DataFrame): Level-0 holdings, one row per share and holding.
+        level (int | None, optional): Expansion depth, as in ``getHoldings``: ``0`` returns
+            the holdings unchanged, ``1`` expands held ETFs once and ``2`` (or ``None``)
+            expands ETFs of ETFs recursively.
+        shareColumn (str, optional): Column holding the ETF share ID.
+        holdingShareColumn (str, optional): Column holding the share ID of a holding that
+            is itself an ETF, null for other holdings.
+        weightColumn (str, optional): Column holding the weight of the holding in the ETF.
+        weightScale (float, optional): Total weight of a full portfolio, ``1`` for
+            fractions or ``100`` for percentages.
+        groupBy (list[str] | None, optional): Columns identifying a holding. When given,
+            rows of the same share and holding reached through different paths are
+            summed into one row; other columns keep their first value.
+        maxIterations (int, optional): Maximum number of expansion steps of a recursive
+            expansion. Holdings still pointing to ETFs after the last step are kept as
+            they are and a warning is logged.
+        onCycle (str, optional): ``"raise"`` to raise when an ETF holds itself, directly or
+            through other ETFs, or ``"keep"`` to stop expanding the holding closing the
+            cycle and keep it as is.
+
+    Returns:
+        polars.DataFrame: Expanded holdings, with the columns of ``holdings``.
+
+    Raises:
+        ValueError: When ``onCycle="raise"`` and the holdings contain a cycle.
+    """
+    if onCycle not in ("raise", "keep"):
+        raise ValueError(f"onCycle must be 'raise' or 'keep', got {onCycle!r}")
+    if level == 0:
+        return holdings
+
+    columns = holdings.columns
+    steps = 1 if level == 1 else maxIterations
+    funds = holdings.select(pl.col(shareColumn).unique()).to_series()
+    children = holdings.rename({shareColumn: _CHILD})
+    expandable = pl.col(holdingShareColumn).is_in(funds.implode()).fill_null(False)
+
+    done = []
+    current = holdings.with_columns(pl.concat_list(pl.col(shareColumn)).alias(_PATH))
+    for _ in range(steps):
+        expand = current.filter(expandable)
+        if expand.height == 0:
+            break
+        done.append(current.filter(~expandable))
+
+        cyclic = pl.col(_PATH).list.contains(pl.col(holdingShareColumn))
+        cycles = expand.filter(cyclic)
+        if cycles.height > 0:
+            if onCycle == "raise":
+                shares = sorted(set(cycles[holdingShareColumn].to_list()))
+                raise ValueError(f"holdings contain a cycle through shares {shares}")
+            done.append(cycles)
+            expand = expand.filter(~cyclic)
+
+        current = (
+            expand
+            .select(
+                shareColumn,
+                _PATH,
+                pl.col(holdingShareColumn).cast(holdings.schema[shareColumn]).alias(_CHILD),
+                pl.col(weightColumn).alias(_PARENT_WEIGHT))
+            .join(children, on=_CHILD, how="inner")
+            .with_columns(
+                (pl.col(_PARENT_WEIGHT) * pl.col(weightColumn) / weightScale).alias(weightColumn),
+                pl.col(_PATH).list.concat(pl.col(_CHILD)).alias(_PATH))
+            .select(*columns, _PATH)
+        )
+    else:
+        if level != 1 and current.filter(expandable).height > 0:
+            logger.warning("look-through stopped after %d iterations with ETF holdings left", maxIterations)
+
+    result = pl.concat([*done, current], how="vertical_relaxed").drop(_PATH)
+    if groupBy is None:
+        return result
+    keys = [shareColumn, *groupBy]
+    return (
+        result
+        .group_by(keys, maintain_order=True)
+        .agg(
+            pl.col(weightColumn).sum(),
+            *[pl.col(c).first() for c in columns if c not in keys and c != weightColumn])
+        .select(columns)
+    )
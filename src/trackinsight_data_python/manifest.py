@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+def _normalize(value):
+    """Round-trip ``value`` through JSON so it compares equal to what was stored."""
+    return json.loads(json.dumps(value))
+
+
+def _queryKey(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def manifest_path(data_dir, format, folder):
+    """Return the manifest location for a downloaded dataset folder.
+
+    The manifest sits next to the Hive layout (``<format>/<folder>.manifest.json``)
+    so it never matches the ``**/*.<format>`` glob returned by the downloaders.
+
+    Args:
+        data_dir (Path): Root storage folder (``TRACK_API_STORAGE``).
+        format (str): File format of the dataset.
+        folder (str): Dataset folder name.
+
+    Returns:
+        Path: Path of the manifest file.
+    """
+    return Path(data_dir) / format / (folder + ".manifest.json")
+
+
+class Manifest:
+    """Record of the partitions stored on disk for one downloaded dataset.
+
+    Each entry is keyed by the partition path (for example ``stamp=2024-01-31/mod_20=3``)
+    and stores the base query params, the partition keys, the ``transactionId`` it was
+    fetched under, its byte size, its SHA-256 and the server ``ETag`` when one was sent.
+    Queries whose partitions were all stored are recorded as well, so that a query known
+    not to change, such as a past report stamp, can be read back without any request.
+
+    Args:
+        path (str | Path): Manifest file location.
+        root (str | Path): Folder holding the Hive layout described by the manifest.
+    """
+
+    def __init__(self, path, root):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.partitions = {}
+        self.queries = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            self.partitions = data.get("partitions", {})
+            self.queries = data.get("queries", {})
+
+    def _matching_entry(self, partitionPath, params, partition, filepath):
+        entry = self.partitions.get(partitionPath)
+        if entry is None:
+            return None
+        if entry["params"] != _normalize(params) or entry["partition"] != _normalize(partition):
+            return None
+        if not filepath.exists() or filepath.stat().st_size != entry["bytes"]:
+            return None
+        return entry
+
+    def is_current(self, partitionPath, params, partition, transactionId, filepath):
+        """Tell whether the stored partition is known to match ``transactionId``.
+
+        Args:
+            partitionPath (str): Partition path relative to ``root``.
+            params (dict): Base query params of the current request.
+            partition (dict): Partition keys returned by ``partitions/<endpoint>``.
+            transactionId (str): Transaction of the current partition listing.
+            filepath (Path): Expected data file of the partition.
+
+        Returns:
+            bool: ``True`` when the partition can be skipped without any request.
+        """
+        entry = self._matching_entry(partitionPath, params, partition, filepath)
+        return entry is not None and entry.get("transactionId") == transactionId
+
+    def etag(self, partitionPath, params, partition, filepath):
+        """Return the stored ``ETag`` usable for a conditional request, if any."""
+        entry = self._matching_entry(partitionPath, params, partition, filepath)
+        if entry is None:
+            return None
+        return entry.get("etag")
+
+    def sha256(self, partitionPath):
+        """Return the stored content hash of a partition, if any."""
+        entry = self.partitions.get(partitionPath)
+        return None if entry is None else entry.get("sha256")
+
+    def record(self, partitionPath, params, partition, transactionId, info):
+        """Store the outcome of a partition fetch.
+
+        Args:
+            partitionPath (str): Partition path relative to ``root``.
+            params (dict): Base query params of the request.
+            partition (dict): Partition keys returned by ``partitions/<endpoint>``.
+            transactionId (str): Transaction the partition was fetched under.
+            info (dict): Result of ``getPartition``. A ``not-modified`` result keeps the
+                stored size and hash and only refreshes the transaction.
+        """
+        entry = dict(self.partitions.get(partitionPath, {}))
+        entry["params"] = _normalize(params)
+        entry["partition"] = _normalize(partition)
+        entry["transactionId"] = transactionId
+        if info.get("status") != "not-modified":
+            entry["bytes"] = info["bytes"]
+            entry["sha256"] = info["sha256"]
+            entry["etag"] = info.get("etag")
+        self.partitions[partitionPath] = entry
+
+    def refresh(self, partitionPath, filepath):
+        """Record the new size and hash of a stored partition rewritten locally.
+
+        The entry keeps its query, transaction and ``ETag``, so later downloads still skip
+        the partition or fetch it conditionally. It is dropped when the data file is gone.
+
+        Args:
+            partitionPath (str): Partition path relative to ``root``.
+            filepath (str | Path): Data file of the partition.
+        """
+        entry = self.partitions.get(partitionPath)
+        if entry is None:
+            return
+        filepath = Path(filepath)
+        if not filepath.exists():
+            self.partitions.pop(partitionPath)
+            return
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        entry["bytes"] = filepath.stat().st_size
+        entry["sha256"] = digest.hexdigest()
+
+    def stale(self, params, partitionPaths):
+        """List stored partitions of the same query that are no longer served.
+
+        Only entries recorded with the same base params are considered, so partitions
+        of other queries sharing the folder (for example other report stamps) are kept.
+
+        Args:
+            params (dict): Base query params of the current request.
+            partitionPaths (Iterable[str]): Partition paths of the current listing.
+
+        Returns:
+            list[str]: Partition paths to delete.
+        """
+        params = _normalize(params)
+        current = set(partitionPaths)
+        return [
+            path
+            for path, entry in self.partitions.items()
+            if path not in current and entry["params"] == params
+        ]
+
+    def complete(self, params, partitionPaths):
+        """Record that every partition of a query is stored.
+
+        Args:
+            params (dict): Base query params of the request.
+            partitionPaths (Iterable[str]): Partition paths of its listing.
+        """
+        self.queries[_queryKey(params)] = sorted(partitionPaths)
+
+    def completed(self, params, format):
+        """Return the data files of a query recorded as complete, if they are all stored.
+
+        Args:
+            params (dict): Base query params of the request.
+            format (str): File format of the dataset.
+
+        Returns:
+            list[Path] | None: Data files of every partition of the query, or ``None`` when
+                the query was never completed or one of its files changed since.
+        """
+        partitionPaths = self.queries.get(_queryKey(params))
+        if partitionPaths is None:
+            return None
+        params = _normalize(params)
+        filepaths = []
+        for partitionPath in partitionPaths:
+            entry = self.partitions.get(partitionPath)
+            filepath = self.root / partitionPath / ("data."+format)
+            if entry is None or entry["params"] != params:
+                return None
+            if not filepath.exists() or filepath.stat().st_size != entry.get("bytes"):
+                return None
+            filepaths.append(filepath)
+        return filepaths
+
+    def remove(self, partitionPath):
+        """Delete a partition folder, its empty parents and its manifest entry."""
+        folder = self.root / partitionPath
+        if folder.exists():
+            shutil.rmtree(folder)
+        parent = folder.parent
+        while parent != self.root and parent.exists() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+        self.partitions.pop(partitionPath, None)
+        self.queries = {key: paths for key, paths in self.queries.items() if partitionPath not in paths}
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"partitions": self.partitions, "queries": self.queries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+
+class Memo:
+    """Thread-safe memo with per-entry lifetime and single-flight loading.
+
+    Concurrent callers asking for the same key while it is loading wait for the
+    in-flight load and share its result, or its exception, instead of loading it again.
+    Results are then kept for ``ttl`` seconds; with ``ttl=0`` only the in-flight load
+    is shared.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, ttl=0):
+        """Return the value for ``key``, calling ``loader`` when it is missing or expired.
+
+        Args:
+            key (Hashable): Identifies the value.
+            loader (Callable[[], object]): Loads the value.
+            ttl (float, optional): Lifetime of the value in seconds.
+
+        Returns:
+            object: The memoized, shared or freshly loaded value.
+        """
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            flight.fail(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if ttl > 0:
+                self._values[key] = (time.monotonic() + ttl, value)
+        flight.done(value)
+        return value
+
+    def invalidate(self, key=None):
+        """Forget the value of ``key``, or every value when ``key`` is ``None``."""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+class _Flight:
+    def __init__(self):
+        self._event = threading.Event()
+        self._value = None
+        self._error = None
+
+    def done(self, value):
+        self._value = value
+        self._event.set()
+
+    def fail(self, error):
+        self._error = error
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class AsyncMemo:
+    """Asyncio counterpart of ``Memo``, sharing in-flight loads between tasks of one loop."""
+
+    def __init__(self):
+        self._values = {}
+        self._inflight = {}
+
+    async def get(self, key, loader, ttl=0):
+        """Return the value for ``key``, awaiting ``loader()`` when it is missing or expired.
+
+        Args:
+            key (Hashable): Identifies the value.
+            loader (Callable[[], Awaitable]): Loads the value.
+            ttl (float, optional): Lifetime of the value in seconds.
+
+        Returns:
+            object: The memoized, shared or freshly loaded value.
+        """
+        cached = self._values.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        loop = asyncio.get_running_loop()
+        flight = self._inflight.get((loop, key))
+        if flight is None:
+            flight = self._inflight[(loop, key)] = loop.create_task(self._load(loop, key, loader, ttl))
+        return await asyncio.shield(flight)
+
+    async def _load(self, loop, key, loader, ttl):
+        try:
+            value = await loader()
+        finally:
+            del self._inflight[(loop, key)]
+        if ttl > 0:
+            self._values[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def invalidate(self, key=None):
+        """Forget the value of ``key``, or every value when ``key`` is ``None``."""
+        if key is None:
+            self._values.clear()
+        else:
+            self._values.pop(key, None)
@@ -0,0 +1,317 @@
+import json
+import sys
+import time
+from collections import Counter
+
+from ._params import (
+    build_holdings_params,
+    build_liquidity_params,
+    build_reports_params,
+    build_shares_params,
+    build_timeseries_params,
+)
+from .api import getMetadata
+from .client import get_client
+from .index import updateIndex
+from .manifest import Manifest, manifest_path
+from .partitions import _DiskLoad, _plan, _runPartitions
+from .snapshots import DEFAULT_SNAPSHOTS, Snapshot, isSnapshotted
+
+# Default priority of each dataset: lower runs first. Small metadata-like datasets come
+# first so they are on disk early even when a large refresh runs behind them.
+DEFAULT_PRIORITIES = {
+    "shares": 0,
+    "liquidity_summary": 1,
+    "reports": 2,
+    "holdings": 3,
+    "liquidity": 4,
+    "timeseries": 5,
+}
+
+# Keys accepted by each dataset entry of a sync spec, on top of ``dataset`` and ``priority``.
+DATASET_KEYS = {
+    "shares": set(),
+    "reports": {"ccy", "stamps", "periods"},
+    "timeseries": {"ccy", "start", "end"},
+    "holdings": {"proxy", "level", "extraLines"},
+    "liquidity": {"ccy", "start", "end"},
+    "liquidity_summary": {"ccy", "start", "end"},
+}
+
+SPEC_KEYS = {"datasets", "format", "incremental", "index", "snapshots"}
+
+
+def _listOf(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _queries(entry, client):
+    """Expand one dataset entry of a sync spec into ``(folder, params, partitionOrder)`` queries."""
+    dataset = entry["dataset"]
+    ccys = _listOf(entry.get("ccy", "eur"))
+    if dataset == "shares":
+        return [("shares", build_shares_params(), None)]
+    if dataset == "holdings":
+        params = build_holdings_params(
+            proxy=entry.get("proxy", True), level=entry.get("level", 0), extraLines=entry.get("extraLines", False))
+        return [("holdings", params, None)]
+    if dataset == "reports":
+        queries = []
+        for ccy in ccys:
+            for stamp in _listOf(entry.get("stamps")):
+                params, _ = build_reports_params(
+                    stamp=stamp,
+                    ccy=ccy,
+                    periods=entry.get("periods"),
+                    metadata_loader=lambda: getMetadata(client=client),
+                )
+                queries.append((ccy+"_reports", params, ["stamp","mod_20"]))
+        return queries
+    build = build_timeseries_params if dataset == "timeseries" else build_liquidity_params
+    return [
+        (ccy+"_"+dataset, build(start=entry.get("start", "2019-01-01"), end=entry.get("end"), ccy=ccy), None)
+        for ccy in ccys
+    ]
+
+
+def validateSpec(spec):
+    """Check a sync spec and return it with its defaults filled in.
+
+    Args:
+        spec (dict): Sync spec, see ``syncDatasets``.
+
+    Returns:
+        dict: The spec with ``format``, ``incremental``, ``index``, ``snapshots`` and the
+            ``priority`` of every dataset set.
+
+    Raises:
+        ValueError: When the spec has unknown keys or datasets, or no datasets.
+    """
+    if not isinstance(spec, dict) or not spec.get("datasets"):
+        raise ValueError("sync spec must be an object with a non-empty 'datasets' list")
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"unknown sync spec keys {sorted(unknown)}, expected some of {sorted(SPEC_KEYS)}")
+    datasets = []
+    for entry in spec["datasets"]:
+        if isinstance(entry, str):
+            entry = {"dataset": entry}
+        dataset = entry.get("dataset")
+        if dataset not in DATASET_KEYS:
+            raise ValueError(f"unknown dataset {dataset!r}, expected one of {sorted(DATASET_KEYS)}")
+        unknown = set(entry) - DATASET_KEYS[dataset] - {"dataset", "priority"}
+        if unknown:
+            raise ValueError(f"unknown keys {sorted(unknown)} for dataset {dataset!r}")
+        datasets.append({"priority": DEFAULT_PRIORITIES[dataset]} | entry)
+    return {
+        "format": spec.get("format", "parquet"),
+        "incremental": spec.get("incremental", True),
+        "index": spec.get("index", True),
+        "snapshots": spec.get("snapshots"),
+        "datasets": datasets,
+    }
+
+
+def loadSpec(path):
+    """Read a sync spec from a JSON file, ``-`` reading standard input.
+
+    Args:
+        path (str | Path): Spec file location.
+
+    Returns:
+        dict: The validated spec, see ``validateSpec``.
+    """
+    if str(path) == "-":
+        return validateSpec(json.load(sys.stdin))
+    with open(path) as f:
+        return validateSpec(json.load(f))
+
+
+def _download(queries,plans,format,incremental,snapshots,client):
+    """Download the partitions of planned queries to disk, all on one run of the client pool.
+
+    Queries sharing a folder share its manifest and, when snapshotting, one new snapshot,
+    published only when all of them succeeded and its files are valid.
+
+    Args:
+        queries (list[dict]): Queries with ``dataset``, ``folder``, ``params`` and
+            ``partitionOrder``. ``transactionId``, the published ``snapshot`` and
+            ``error`` are set on them.
+        plans (list[tuple | None]): Result of ``_plan`` for each query, ``None`` for
+            queries that could not be planned.
+        format (str): Storage format.
+        incremental (bool): Skip partitions the manifest knows to be current.
+        snapshots (int | None): See ``getPartitions``.
+        client (Client): Client to use.
+
+    Returns:
+        list[_DiskLoad | None]: Load of each query, ``None`` for unplanned ones.
+    """
+    # Queries sharing a folder (report stamps, currencies) share its manifest and snapshot.
+    base = client.data_dir / format
+    manifests = {}
+    staged = {}
+    loads = []
+    args = []
+    for query, planned in zip(queries, plans):
+        if planned is None:
+            loads.append(None)
+            continue
+        transactionId, _, partitions = planned
+        folder = query["folder"]
+        target = folder
+        if snapshots is not None or isSnapshotted(base, folder):
+            if folder not in staged:
+                staged[folder] = Snapshot(base, folder, transactionId).stage()
+            target = staged[folder].relative
+        manifest = None
+        if incremental:
+            if folder not in manifests:
+                manifests[folder] = Manifest(manifest_path(client.data_dir, format, folder), base / target)
+            manifest = manifests[folder]
+        load = _DiskLoad(query["dataset"], target, query["params"], format, query["partitionOrder"],
+                         transactionId, partitions, manifest, staged[folder].partial if folder in staged else None)
+        query["transactionId"] = transactionId
+        loads.append(load)
+        for arg in load.args:
+            args.append(arg | {"load":load})
+
+    published = set()
+    try:
+        _runPartitions("sync", args, client,
+                       lambda arg, result: arg["load"].on_result(arg, result),
+                       lambda arg, failure: arg["load"].on_failure(arg, failure))
+        for load in loads:
+            if load is not None:
+                load.removeStale()
+                load.complete()
+        for folder, snapshot in staged.items():
+            members = [(query, load) for query, load in zip(queries, loads) if query.get("folder") == folder]
+            if any("error" in query or load.failures for query, load in members):
+                continue
+            try:
+                for _, load in members:
+                    snapshot.validate(load.listed, format)
+            except ValueError as exc:
+                for query, _ in members:
+                    query["error"] = repr(exc)
+                continue
+            path = snapshot.publish(DEFAULT_SNAPSHOTS if snapshots is None else snapshots)
+            published.add(folder)
+            for query, _ in members:
+                query["snapshot"] = str(path)
+    finally:
+        for folder, snapshot in staged.items():
+            if folder not in published:
+                snapshot.discard()
+        for folder, manifest in manifests.items():
+            if folder not in staged or folder in published:
+                manifest.save()
+
+    return loads
+
+
+def syncDatasets(spec,client=None):
+    """Download every partition of several datasets to disk on one bounded pool.
+
+    The spec lists datasets with their currencies, date ranges and report stamps. The
+    partition listings of every query are requested concurrently, then the partitions of
+    all queries are fetched together on the client pool, ``client.max_workers`` at a
+    time, in priority order: partitions of lower ``priority`` datasets are submitted
+    first (see ``DEFAULT_PRIORITIES``). Downloads are incremental by default and the
+    id index of every parquet folder is refreshed afterwards, as with the downloaders.
+
+    A failing listing or partition does not stop the other queries; it is reported in
+    the summary.
+
+    Example spec::
+
+        {
+            "format": "parquet",
+            "datasets": [
+                {"dataset": "shares"},
+                {"dataset": "reports", "ccy": ["eur", "usd"], "stamps": ["2024-01-31"]},
+                {"dataset": "timeseries", "ccy": "eur", "start": "2024-01-01"},
+                {"dataset": "holdings", "level": 0, "priority": 1}
+            ]
+        }
+
+    Args:
+        spec (dict): Sync spec. ``datasets`` lists dataset entries (or bare dataset
+            names): ``dataset`` is one of ``shares``, ``reports``, ``timeseries``,
+            ``holdings``, ``liquidity`` and ``liquidity_summary``, and the other keys are
+            the arguments of the matching downloader (``ccy`` may list several
+            currencies, ``stamps`` lists report stamps and defaults to the latest one).
+            ``format``, ``incremental``, ``index`` and ``snapshots`` (see
+            ``getPartitions``) apply to every dataset. With snapshots, all queries of a
+            folder go to one new snapshot, published only when all of them succeeded.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+
+    Returns:
+        dict: JSON-serializable summary with ``ok``, ``elapsed``, ``partitions``,
+            ``failed`` and one ``queries`` entry per query, holding its dataset, folder,
+            params, priority, transactionId, partition count, count per status
+            (``downloaded``, ``unchanged``, ``not-modified``, ``failed``), failed
+            partitions, the published ``snapshot`` folder if any and ``error`` when the
+            query could not run.
+
+    Raises:
+        ValueError: When the spec is invalid.
+    """
+    spec = validateSpec(spec)
+    client = get_client(client)
+    format = spec["format"]
+    began = time.perf_counter()
+
+    queries = []
+    for entry in sorted(spec["datasets"], key=lambda entry: entry["priority"]):
+        try:
+            expanded = _queries(entry, client)
+        except Exception as exc:
+            queries.append({"dataset":entry["dataset"],"priority":entry["priority"],"error":repr(exc)})
+            continue
+        for folder, params, partitionOrder in expanded:
+            queries.append({"dataset":entry["dataset"],"folder":folder,"params":params,
+                            "partitionOrder":partitionOrder,"priority":entry["priority"]})
+
+    def plan(query):
+        if "error" in query:
+            return None
+        try:
+            return _plan(query["dataset"], query["params"], client)
+        except Exception as exc:
+            query["error"] = repr(exc)
+            return None
+
+    plans = list(client.pool.map(plan, queries))
+
+    loads = _download(queries, plans, format, spec["incremental"], spec["snapshots"], client)
+
+    if spec["index"]:
+        for folder in dict.fromkeys(query["folder"] for query in queries if "folder" in query):
+            try:
+                updateIndex(folder,format,client=client)
+            except Exception as exc:
+                for query in queries:
+                    if query.get("folder") == folder:
+                        query.setdefault("error", repr(exc))
+
+    summary = []
+    for query, load in zip(queries, loads):
+        query.pop("partitionOrder", None)
+        if load is not None:
+            statuses = Counter(result["status"] for result in load.results if result is not None)
+            query["partitions"] = len(load.results)
+            query["statuses"] = dict(statuses)
+            query["failures"] = [
+                {"partitionPath":failure["partitionPath"],"attempts":failure["attempts"],"error":failure["error"]}
+                for failure in load.failures]
+        summary.append(query)
+
+    return {
+        "ok": all("error" not in query and not query["failures"] for query in summary),
+        "elapsed": time.perf_counter() - began,
+        "partitions": sum(query.get("partitions", 0) for query in summary),
+        "failed": sum(len(query.get("failures", [])) for query in summary),
+        "queries": summary,
+    }
@@ -1,201 +1,863 @@
 import polars as pl
 import os
-import shutil
-import requests
+import re
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import requests
+import heapq
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
 from pathlib import Path
 from io import BytesIO
-from urllib.parse import urlencode
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 
-def read_vars():
-    key = os.getenv("TRACK_API_KEY")
-    if key is None:
-        print("Environment variable TRACK_API_KEY is not defined")
-        raise RuntimeError("Environment variable TRACK_API_KEY is not defined")
+from ._files import IPC_FORMAT
+from .client import get_client
+from .events import emit, peak_rss
+from .local import writeIpc
+from .manifest import Manifest, manifest_path
+from .retry import AIMDController, PartitionsError, backoff_delay, is_retryable
+from .schemas import LoadSchema
+from .snapshots import DEFAULT_SNAPSHOTS, Snapshot, isSnapshotted
+from .spill import SPILL_FOLDER, SpillAccumulator, parse_size
+
+# Partition keys derived from the share id: ``mod_20=k`` holds the ids with ``id % 20 == k``.
+MOD_KEY = re.compile(r"mod_(\d+)")
+# Next to a ``.part`` file, what is needed to resume its download with a ``Range`` request.
+RESUME_SUFFIX = ".resume"
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+BODY_READ_SIZE = 1024 * 1024
+
+def readBody(r):
+    """Read a streamed response body into a single buffer without intermediate copies.
+
+    When the server sends ``Content-Length`` for an unencoded body, the buffer is
+    allocated once at its final size and filled in place. Otherwise chunks are appended
+    to a growing buffer. Either way the returned ``BytesIO`` shares its memory with the
+    bytes Polars decodes, instead of joining chunks and copying them again.
+
+    Args:
+        r (requests.Response): Response opened with ``stream=True``.
+
+    Returns:
+        BytesIO: Buffer positioned at the start of the body.
+    """
+    length = r.headers.get("Content-Length")
+    encoding = r.headers.get("Content-Encoding", "identity").lower()
+    buffer = BytesIO()
+    if length is not None and encoding == "identity":
+        size = int(length)
+        if size > 0:
+            buffer.seek(size - 1)
+            buffer.write(b"\0")
+            view = buffer.getbuffer()
+            try:
+                position = 0
+                while position < size:
+                    n = r.raw.readinto(view[position:position + BODY_READ_SIZE])
+                    if not n:
+                        raise requests.exceptions.ConnectionError(
+                            f"incomplete body: received {position} of {size} bytes")
+                    position += n
+            finally:
+                view.release()
+    else:
+        for chunk in r.iter_content(chunk_size=BODY_READ_SIZE):
+            buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+def _discardPart(part_filepath):
+    """Delete a partial download and its resume state."""
+    Path(part_filepath).unlink(missing_ok=True)
+    Path(str(part_filepath)+RESUME_SUFFIX).unlink(missing_ok=True)
+
+
+def _resumeState(part_filepath):
+    """Return what is needed to resume a partial download, or ``None``.
+
+    The state is not tied to the request URL, which changes with the ``transactionId``
+    of each listing: the ``ETag`` sent back in ``If-Range`` is enough for the server to
+    tell whether the bytes received belong to the partition it serves now.
+
+    Returns:
+        dict | None: ``validator`` (the ``ETag`` of the response being received) and
+            ``offset``, the number of bytes received.
+    """
+    try:
+        with open(str(part_filepath)+RESUME_SUFFIX) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not state.get("validator") or not os.path.exists(part_filepath):
+        return None
+    state["offset"] = os.path.getsize(part_filepath)
+    return state if state["offset"] > 0 else None
 
-    host = os.getenv("TRACK_API_HOST","https://cloud.datasets.sh/e/trackinsight-standard/v2")
-    data_dir = Path(os.getenv("TRACK_API_STORAGE","trackinsight_data"))
-    data_dir.mkdir(parents=True,exist_ok=True)
-    max_workers = int(os.getenv("TRACK_API_DL_WORKERS",10))
-    verify_cert = os.getenv("TRACK_API_VERIFY_CERT", "true").lower() == "true"
-    return [host, key, data_dir, max_workers, verify_cert]
 
+def _streamPart(r,part_filepath,resume=None):
+    """Stream a response body to a ``.part`` file, appending to it when ``r`` resumes it.
 
-def inline_print(msg,last=False):
-    """Print a message in place on the current terminal line.
+    A ``206`` answer to the ``Range`` request of ``resume`` is appended to the bytes
+    already received; any other answer rewrites the file from the start. When the server
+    accepts ranges and sends a strong ``ETag``, it is saved next to the file so that a
+    fetch interrupted midway can be resumed by the next attempt.
 
     Args:
-        msg (str): Message to render in the terminal.
+        r (requests.Response): Response opened with ``stream=True``.
+        part_filepath (Path): File receiving the body.
+        resume (dict | None, optional): State returned by ``_resumeState`` when the
+            request asked for the rest of the body.
 
     Returns:
-        None: This function only writes to stdout.
+        tuple[int, str, int]: Size and SHA-256 of the complete file, and number of bytes
+            received by this request.
+
+    Raises:
+        requests.exceptions.ConnectionError: When the body is incomplete or the range
+            sent does not follow the bytes already received, so the fetch is retried.
     """
-    print(f"\r{msg}", end="\n" if last else "", flush=True)
+    encoding = r.headers.get("Content-Encoding", "identity").lower()
+    digest = hashlib.sha256()
+    offset = 0
+    total = None
+    if r.status_code == 206 and resume is not None:
+        match = CONTENT_RANGE.fullmatch(r.headers.get("Content-Range", ""))
+        if match is None or int(match.group(1)) != resume["offset"] or encoding != "identity":
+            _discardPart(part_filepath)
+            raise requests.exceptions.ConnectionError(
+                f"unexpected Content-Range {r.headers.get('Content-Range')!r}, restarting the download")
+        offset = resume["offset"]
+        total = None if match.group(3) == "*" else int(match.group(3))
+        with open(part_filepath, "rb") as f:
+            for block in iter(lambda: f.read(BODY_READ_SIZE), b""):
+                digest.update(block)
+    else:
+        if encoding == "identity" and r.headers.get("Content-Length") is not None:
+            total = int(r.headers["Content-Length"])
+        validator = r.headers.get("ETag")
+        state = Path(str(part_filepath)+RESUME_SUFFIX)
+        # If-Range only accepts strong ETags.
+        if encoding == "identity" and validator and not validator.startswith("W/") and r.headers.get("Accept-Ranges") == "bytes":
+            with open(state, "w") as f:
+                json.dump({"validator":validator}, f)
+        else:
+            state.unlink(missing_ok=True)
+
+    size = offset
+    with open(part_filepath, "ab" if offset else "wb") as f:
+        for chunk in r.iter_content(chunk_size=8192):
+            if chunk:  # filters out keep-alive chunks
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+    if total is not None and size != total:
+        if size > total:
+            _discardPart(part_filepath)
+        raise requests.exceptions.ConnectionError(f"incomplete body: received {size} of {total} bytes")
+    return size, digest.hexdigest(), size - offset
 
-def getURL(endpoint,params):
+def getURL(endpoint,params,client=None):
     """Build an API URL from an endpoint and query parameters.
 
     Args:
         endpoint (str): API endpoint path relative to ``TRACK_API_HOST``.
         params (dict | None): Query parameters. Keys with ``None`` values are skipped.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
 
     Returns:
         str: Fully qualified request URL.
     """
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
-    qparams =""
-    if params is not None:
-        qparams = "&"+urlencode({k: v for k, v in params.items() if v is not None})
+    return get_client(client).url(endpoint,params)
 
-    url = host+"/"+endpoint+"?"+qparams
-    return url
-
-def getJSON(endpoint,params=None):
+def getJSON(endpoint,params=None,client=None):
     """Execute a JSON request and return payload and response headers.
 
+    Concurrent calls for the same URL on the same client share one in-flight request
+    and its result, which callers must not modify.
+
     Args:
         endpoint (str): API endpoint path relative to ``TRACK_API_HOST``.
         params (dict | None): Query parameters passed to ``getURL``.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
 
     Returns:
         list: Two-item list ``[data, headers]`` from the HTTP response.
     """
+    client = get_client(client)
 
-    [host, key, data_dir, max_workers,verify_cert] = read_vars()
+    url = client.url(endpoint,params)
 
-    url = getURL(endpoint,params,)
-    
-    response = requests.get(url,verify=verify_cert,headers={"X-API-KEY":key})
-    response.raise_for_status()   # raises error if the request failed
-    data = response.json()
-    return [data, response.headers]
+    def fetch():
+        response = client.get(url)
+        response.raise_for_status()   # raises error if the request failed
+        return [response.json(), response.headers]
+
+    return list(client.memo.get(("json", url), fetch))
 
 
-def getPartition(endpoint,partition_params,folder=None,partitionPath="",format='parquet'):
+def getPartition(endpoint,partition_params,folder=None,partitionPath="",format='parquet',client=None,etag=None,metrics=None,resumeFolder=None):
     """Fetch one partition either to memory or to disk.
 
+    On disk, the body is streamed to a ``.part`` file that replaces ``data.<format>``
+    only once it is complete, so an interrupted fetch never leaves a truncated file.
+    When the server accepts ranges, the bytes already received are kept: the next
+    attempt asks for the rest with a ``Range`` request guarded by ``If-Range``, and
+    starts over when the server answers with the whole body. The size of the completed
+    file is checked against the length announced by the server before it is renamed.
+    Other ``.<format>`` files of the partition folder, such as rows appended by a sync,
+    are then deleted, as the downloaded file holds the whole partition.
+
     Args:
         endpoint (str): Dataset endpoint name.
         partition_params (dict): Partition-specific query parameters.
         folder (str | None, optional): Output folder relative to ``TRACK_API_STORAGE``.
             When ``None``, data is returned in memory.
         partitionPath (str, optional): Nested subpath used for partitioned output.
-        format (str, optional): Response format (for example ``parquet`` or ``json``).
+        format (str, optional): Response format (for example ``parquet`` or ``json``). On
+            disk, ``ipc`` fetches parquet and stores it as an Arrow IPC file compressed
+            with ``client.ipc_compression``.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        etag (str | None, optional): ``ETag`` of the copy already on disk. When set, the
+            request is conditional and a ``304`` leaves the file untouched.
+        metrics (dict | None, optional): Filled with the ``ttfb``, ``download`` and
+            ``decode`` times in seconds, the ``bytes`` received and the decoded ``rows``.
+        resumeFolder (str | None, optional): Folder relative to ``TRACK_API_STORAGE``
+            keeping the ``.part`` file of the partition, under ``partitionPath``, until it
+            is complete. Defaults to ``folder``; downloads into a snapshot use a folder
+            shared by all snapshots, so a later snapshot resumes what an earlier one left.
 
     Returns:
-        polars.DataFrame | None: In-memory data when ``folder`` is ``None``; otherwise ``None``.
+        polars.DataFrame | dict: In-memory data when ``folder`` is ``None``; otherwise a dict
+            with ``status`` (``downloaded`` or ``not-modified``), ``bytes``, ``sha256`` and ``etag``.
     """
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
+    client = get_client(client)
     
     if folder is not None: # When writing to disk
-        output_folder = data_dir / folder / partitionPath
-        if output_folder.exists():
-            shutil.rmtree(output_folder)
+        output_folder = client.data_dir / folder / partitionPath
         output_folder.mkdir(parents=True,exist_ok=True)
         output_filepath = output_folder / ("data."+format)
+        part_folder = output_folder if resumeFolder is None else client.data_dir / resumeFolder / partitionPath
+        part_folder.mkdir(parents=True,exist_ok=True)
+        # ipc partitions are downloaded as parquet, then converted.
+        part_filepath = part_folder / ("data."+("parquet" if format == IPC_FORMAT else format)+".part")
         
-    url = getURL('data/'+endpoint,partition_params)
+    url = client.url('data/'+endpoint,partition_params)
     
-    if os.getenv("TRACK_API_LOG")=='DEBUG':
+    if client.debug:
         print(url)
-    
-    with requests.get(url,verify=verify_cert,headers={"X-API-KEY":key},stream=(folder is not None), timeout=60) as r:
-        if r.status_code == 500:
+
+    headers = {} if etag is None else {"If-None-Match":etag}
+    resume = None
+    if folder is not None and format != 'json':
+        resume = _resumeState(part_filepath)
+        if resume is not None:
+            headers.update({"Range":f"bytes={resume['offset']}-","If-Range":resume["validator"]})
+    if metrics is None:
+        metrics = {}
+    started = time.perf_counter()
+
+    with client.get(url,stream=True, timeout=60, headers=headers) as r:
+        metrics["ttfb"] = time.perf_counter() - started
+        if r.status_code == 304 and folder is not None:
+            if resume is not None:
+                _discardPart(part_filepath)
+            metrics.update(download=0.0, decode=0.0, bytes=0, rows=None)
+            return {"status":"not-modified"}
+        if r.status_code == 416 and resume is not None:
+            _discardPart(part_filepath)
+            raise requests.exceptions.ConnectionError(
+                f"range of {partitionPath or url} not satisfiable, restarting its download")
+        if r.status_code == 500 and client.debug:
             print(r.text)
         r.raise_for_status()
         
         if format=='json':
-            response = r.json()
+            content = r.content
+            received = time.perf_counter()
+            metrics.update(download=received - started - metrics["ttfb"], bytes=len(content))
+            response = json.loads(content)
             if response.get("error") is not None:
                 raise ValueError(str(response["error"]))
-            else:
-                if folder is not None:
-                    with open(output_filepath, "w") as f:
-                        json.dump(response.get("result"), f, indent=2)
+            if folder is None:
+                frame = pl.DataFrame(response.get("result"))
+                metrics.update(decode=time.perf_counter() - received, rows=frame.height)
+                return frame
+            body = json.dumps(response.get("result"), indent=2).encode()
+            with open(part_filepath, "wb") as f:
+                f.write(body)
+            size, sha256 = len(body), hashlib.sha256(body).hexdigest()
+            metrics.update(decode=0.0, rows=None)
+        elif folder is None:
+            body = readBody(r)
+            received = time.perf_counter()
+            frame = pl.read_parquet(body)
+            metrics.update(
+                download=received - started - metrics["ttfb"],
+                decode=time.perf_counter() - received,
+                bytes=body.getbuffer().nbytes,
+                rows=frame.height)
+            return frame
+        else:
+            size, sha256, nbytes = _streamPart(r, part_filepath, resume)
+            received = time.perf_counter()
+            metrics.update(download=received - started - metrics["ttfb"], decode=0.0, bytes=nbytes, rows=None)
+            if format == IPC_FORMAT:
+                ipc_filepath = output_folder / ("data."+format+".part")
+                metrics["rows"] = writeIpc(part_filepath, ipc_filepath, client.ipc_compression)
+                metrics["decode"] = time.perf_counter() - received
+                _discardPart(part_filepath)
+                part_filepath = ipc_filepath
+                size = ipc_filepath.stat().st_size
+
+        os.replace(part_filepath, output_filepath)
+        _discardPart(part_filepath)
+        _removeOthers(output_folder, output_filepath, format)
+        return {"status":"downloaded","bytes":size,"sha256":sha256,"etag":r.headers.get("ETag")}
+
+
+def _removeOthers(output_folder,output_filepath,format):
+    for other in output_folder.glob("*."+format):
+        if other != output_filepath:
+            other.unlink()
+
+
+def iterPartitions(endpoint,params={},format="parquet",client=None,transform=None):
+    """Fetch all partitions for a dataset in parallel and yield them as they complete.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        params (dict, optional): Base query parameters shared across partitions.
+        format (str, optional): Response format requested from the API.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        transform (Callable[[polars.DataFrame], polars.DataFrame] | None, optional): Function
+            applied to each partition in the worker thread, before it is yielded.
+
+    Yields:
+        polars.DataFrame: One frame per partition, in completion order. Transient errors
+            are retried in the worker like in ``getPartitions``. Closing the generator
+            early cancels the partitions that have not started yet.
+    """
+    client = get_client(client)
+
+    transactionId, _, partitions = _plan(endpoint, params, client)
+
+    def load(partition):
+        attempt = 1
+        while True:
+            try:
+                frame = getPartition(endpoint,_partitionParams(params,transactionId,partition,format),format=format,client=client)
+                break
+            except Exception as exc:
+                if not is_retryable(exc) or attempt > client.retries:
+                    raise
+                time.sleep(backoff_delay(attempt, client.backoff, exc=exc))
+                attempt += 1
+        return frame if transform is None else transform(frame)
+
+    futures = [client.pool.submit(load, partition) for partition in partitions]
+    try:
+        for fut in as_completed(futures):
+            yield fut.result()
+    finally:
+        for fut in futures:
+            fut.cancel()
+
+
+def _partitionParams(params,transactionId,partition,format):
+    partition_params = params | {"transactionId":transactionId} | partition
+    # IPC files are converted from parquet responses.
+    partition_params["format"]="parquet" if format == IPC_FORMAT else format
+    return partition_params
+
+
+def _partitionPath(partition,partitionOrder=None):
+    partitionPaths=[]
+    if partitionOrder is not None:
+        for p in partitionOrder:
+            value=partition[p]
+            partitionPaths.append(p+"="+str(value))    
+    else:
+        for key, value in partition.items():
+            partitionPaths.append(key+"="+str(value))
+    return "/".join(partitionPaths)
+
+
+def _requestedIds(params):
+    """Return the share ids sent in the ``ids`` param, or ``None`` when there is none."""
+    ids = params.get("ids")
+    if ids is None or ids == "":
+        return None
+    if isinstance(ids, str):
+        ids = ids.split(",")
+    return {int(i) for i in ids}
+
+
+def prunePartitions(partitions,ids):
+    """Keep the partitions that can hold at least one of ``ids``.
+
+    A partition with a ``mod_<n>`` key only holds the ids whose remainder by ``n`` is the
+    key's value; partitions without such a key are always kept.
+
+    Args:
+        partitions (list[dict]): Partitions listed by ``partitions/<endpoint>``.
+        ids (Iterable[int] | None): Requested share IDs. ``None`` keeps every partition.
+
+    Returns:
+        list[dict]: The partitions to fetch, in listing order.
+    """
+    if ids is None:
+        return list(partitions)
+    ids = {int(i) for i in ids}
+    residues = {}
+    kept = []
+    for partition in partitions:
+        for key, value in partition.items():
+            match = MOD_KEY.fullmatch(key)
+            if match is None:
+                continue
+            n = int(match.group(1))
+            if n not in residues:
+                residues[n] = {i % n for i in ids}
+            if int(value) not in residues[n]:
+                break
+        else:
+            kept.append(partition)
+    return kept
+
+
+def _plan(endpoint,params,client):
+    """List the partitions of a query and prune them to the ones holding its ``ids``."""
+    [data, headers] = getJSON('partitions/'+endpoint, params, client=client)
+    listed = data["result"]["partitions"]
+    return data["result"]["transactionId"], listed, prunePartitions(listed, _requestedIds(params))
+
+
+def planPartitions(endpoint,params=None,ids=None,client=None):
+    """Return the partitions a query would fetch, without fetching them.
+
+    Only the partition listing is requested. When the query carries share ids, the
+    partitions that cannot hold any of them are left out, exactly as ``getPartitions``
+    and the loaders do before fanning out.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        params (dict | None, optional): Base query parameters, as passed to ``getPartitions``.
+        ids (list[int] | tuple[int] | None, optional): Share IDs, added to ``params`` as
+            the ``ids`` param.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+
+    Returns:
+        dict: ``endpoint``, ``transactionId``, ``partitions`` to fetch with their
+            ``paths``, and the number of ``listed`` and ``pruned`` partitions.
+    """
+    client = get_client(client)
+    params = dict(params or {})
+    if ids is not None:
+        params["ids"] = ",".join(str(i) for i in ids)
+    transactionId, listed, partitions = _plan(endpoint, params, client)
+    return {
+        "endpoint":endpoint,
+        "transactionId":transactionId,
+        "partitions":partitions,
+        "paths":[_partitionPath(partition) for partition in partitions],
+        "listed":len(listed),
+        "pruned":len(listed) - len(partitions),
+    }
+
+
+def _fetchPartition(arg,client,submitted):
+    metrics = {"queue_wait":time.perf_counter() - submitted}
+    result = getPartition(
+        arg["endpoint"],
+        arg["partition_params"],
+        arg["folder"],
+        arg["partitionPath"],
+        arg["format"],
+        client,
+        arg["etag"],
+        metrics,
+        arg.get("resumeFolder"))
+    if arg.get("compact") is not None and isinstance(result, pl.DataFrame):
+        started = time.perf_counter()
+        result = arg["compact"].cast(result)
+        metrics["decode"] = metrics.get("decode", 0.0) + time.perf_counter() - started
+    return result, metrics
+
+
+def _runPartitions(endpoint,args,client,on_result,on_failure=None):
+    """Run partition fetches on the client pool and report each result as it completes.
+
+    Fetches are submitted in the order of ``args``. Partitions failing with a transient
+    error are fetched again after a jittered exponential backoff that honours
+    ``Retry-After``, up to ``client.retries`` times.
+    The number of fetches in flight follows an ``AIMDController``: it is halved on
+    transient errors or rising time to first byte and grows back while fetches stay
+    healthy.
+
+    ``progress``, ``partition``, ``retry`` and ``summary`` events are sent to
+    ``client.events`` from the calling thread; see ``events``.
+
+    Args:
+        endpoint (str): Dataset endpoint name, used in progress messages. Partition and
+            retry events name the endpoint of their own partition.
+        args (list[dict]): ``getPartition`` arguments, one dict per partition.
+        client (Client): Client whose pool runs the fetches.
+        on_result (Callable[[dict, object], None]): Called in the calling thread with the
+            arguments and result of each successful partition.
+        on_failure (Callable[[dict, dict], None] | None, optional): Called in the calling
+            thread with the arguments and failure entry of each partition that failed
+            after its retries.
+
+    Returns:
+        list[dict]: Partitions that still failed after every retry, with
+            ``partition_params``, ``partitionPath``, ``attempts`` and ``error``.
+    """
+    progress = 0
+    total = len(args)
+    totalBytes = 0
+    totalRows = 0
+    began = time.perf_counter()
+    controller = AIMDController(client.max_workers)
+    ready = deque((arg, 1) for arg in args)
+    delayed = []
+    running = {}
+    failures = []
+    try:
+        while ready or delayed or running:
+            now = time.monotonic()
+            while delayed and delayed[0][0] <= now:
+                _, _, arg, attempt = heapq.heappop(delayed)
+                ready.append((arg, attempt))
+            while ready and len(running) < controller.limit:
+                arg, attempt = ready.popleft()
+                submitted = time.perf_counter()
+                running[client.pool.submit(_fetchPartition, arg, client, submitted)] = (arg, attempt, submitted)
+            timeout = max(0.0, delayed[0][0] - now) if delayed else None
+            if not running:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in done:
+                arg, attempt, submitted = running.pop(fut)
+                try:
+                    result, metrics = fut.result()
+                except Exception as exc:
+                    retryable = is_retryable(exc)
+                    if retryable:
+                        controller.failure()
+                    if retryable and attempt <= client.retries:
+                        delay = backoff_delay(attempt, client.backoff, exc=exc)
+                        emit(client, {"event":"retry","endpoint":arg["endpoint"],"partition":_label(arg),
+                                      "attempt":attempt,"delay":delay,"error":repr(exc)})
+                        heapq.heappush(delayed, (time.monotonic() + delay, id(arg), arg, attempt + 1))
+                        continue
+                    failure = {
+                        "partition_params":arg["partition_params"],
+                        "partitionPath":arg["partitionPath"],
+                        "attempts":attempt,
+                        "error":repr(exc)}
+                    failures.append(failure)
+                    if on_failure is not None:
+                        on_failure(arg, failure)
                 else:
-                    return pl.DataFrame(response.get("result"))  
+                    # Time to first byte from dispatch: neither the wait in the pool queue
+                    # nor the body size weigh on it, and 304s say nothing about the load.
+                    notModified = isinstance(result, dict) and result.get("status") == "not-modified"
+                    controller.success(None if notModified else metrics.get("ttfb"))
+                    on_result(arg, result)
+                    totalBytes += metrics["bytes"]
+                    totalRows += metrics["rows"] or 0
+                    emit(client, {"event":"partition","endpoint":arg["endpoint"],"partition":_label(arg),
+                                  "status":result["status"] if isinstance(result, dict) else "loaded",
+                                  "retries":attempt - 1} | metrics)
+                progress = progress+1
+                emit(client, {"event":"progress","endpoint":endpoint,"done":progress,"total":total})
+    finally:
+        for fut in running:
+            fut.cancel()
+    elapsed = time.perf_counter() - began
+    emit(client, {
+        "event":"summary",
+        "endpoint":endpoint,
+        "partitions":total,
+        "failed":len(failures),
+        "bytes":totalBytes,
+        "rows":totalRows,
+        "elapsed":elapsed,
+        "mb_per_s":totalBytes / 1024**2 / elapsed if elapsed > 0 else 0.0,
+        "rows_per_s":totalRows / elapsed if elapsed > 0 else 0.0,
+        "peak_rss":peak_rss()})
+    return failures
+
+
+def _label(arg):
+    return arg["partitionPath"] or _partitionPath(arg["partition"])
+
+
+class _FrameAccumulator:
+    """Append partition frames to one result as they complete, without copying their chunks.
+
+    Args:
+        rechunk (bool): Whether ``result`` rechunks the frame into contiguous memory.
+    """
+
+    def __init__(self, rechunk):
+        self.rechunk = rechunk
+        self.frame = None
+
+    def append(self, frame):
+        if self.frame is None:
+            self.frame = frame
         else:
-            if folder is not None: # When writing to disk
-                with open(output_filepath, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:  # filters out keep-alive chunks
-                            f.write(chunk)
-            else: # When keeping in memory
-                return pl.read_parquet(BytesIO(r.content))
+            self.frame = pl.concat([self.frame, frame], how="vertical_relaxed", rechunk=False)
+
+    def result(self):
+        if self.frame is not None and self.rechunk:
+            self.frame = self.frame.rechunk()
+        return self.frame
+
+
+def _accumulator(client,memoryLimit,expected,rechunk):
+    """Return the in-memory accumulator of a load, spilling to disk past the memory limit."""
+    limit = client.memory_limit if memoryLimit is None else parse_size(memoryLimit)
+    if limit:
+        return SpillAccumulator(limit, client.data_dir / SPILL_FOLDER, expected, rechunk)
+    return _FrameAccumulator(rechunk)
+
+
+class _DiskLoad:
+    """Partitions of one query downloaded to ``<storage>/<format>/<folder>``.
+
+    Builds the ``getPartition`` arguments of the partitions to fetch, skipping those the
+    manifest knows to be current, then records the outcome of each fetch. The fetches
+    themselves run in ``_runPartitions``, possibly together with those of other loads.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        folder (str): Output folder name.
+        params (dict): Base query parameters.
+        format (str): Response format requested from the API.
+        partitionOrder (list[str] | None): Key order used to build partition paths.
+        transactionId (str): Transaction of the partition listing.
+        partitions (list[dict]): Partitions to download.
+        manifest (Manifest | None): Manifest of the folder for incremental downloads.
+        resumeFolder (str | None): Folder keeping partial downloads, when it is not
+            ``folder``. See ``getPartition``.
+
+    Attributes:
+        args (list[dict]): Arguments of the partitions to fetch.
+        results (list): Result of every partition, in listing order: the result of
+            ``getPartition``, ``{"status": "unchanged"}`` for skipped partitions or
+            ``{"status": "failed"}`` with ``attempts`` and ``error``.
+        failures (list[dict]): Failure entries of the partitions that failed, as returned
+            by ``_runPartitions``.
+    """
 
+    def __init__(self, endpoint, folder, params, format, partitionOrder, transactionId, partitions, manifest=None, resumeFolder=None):
+        self.params = params
+        self.transactionId = transactionId
+        self.manifest = manifest
+        self.results = [None] * len(partitions)
+        self.failures = []
+        self.listed = []
+        self.args = []
+        for i, partition in enumerate(partitions):
+            partitionPath=_partitionPath(partition,partitionOrder)
+            self.listed.append(partitionPath)
+            etag = None
+            if manifest is not None:
+                filepath = manifest.root / partitionPath / ("data."+format)
+                if manifest.is_current(partitionPath, params, partition, transactionId, filepath):
+                    self.results[i] = {"status":"unchanged"}
+                    continue
+                etag = manifest.etag(partitionPath, params, partition, filepath)
+            self.args.append({
+                "index":i,
+                "endpoint":endpoint,
+                "partition":partition,
+                "partition_params":_partitionParams(params,transactionId,partition,format),
+                "folder":"/".join([format,folder]),
+                "partitionPath":partitionPath,
+                "format":format,
+                "etag":etag,
+                "resumeFolder":None if resumeFolder is None else "/".join([format,resumeFolder])})
 
-def getPartitions(endpoint,folder=None,params={},format="parquet",partitionOrder=None):
+    def on_result(self, arg, result):
+        if self.manifest is not None:
+            if result["status"] == "downloaded" and self.manifest.sha256(arg["partitionPath"]) == result["sha256"]:
+                result["status"] = "unchanged"
+            self.manifest.record(arg["partitionPath"], self.params, arg["partition"], self.transactionId, result)
+        self.results[arg["index"]] = result
+
+    def on_failure(self, arg, failure):
+        self.failures.append(failure)
+        self.results[arg["index"]] = {"status":"failed","attempts":failure["attempts"],"error":failure["error"]}
+
+    def removeStale(self):
+        """Delete the stored partitions of the same query that are no longer listed."""
+        if self.manifest is not None:
+            for stalePath in self.manifest.stale(self.params, self.listed):
+                self.manifest.remove(stalePath)
+
+    def complete(self):
+        """Record the query as complete in the manifest once none of its partitions failed."""
+        if self.manifest is not None and not self.failures:
+            self.manifest.complete(self.params, self.listed)
+
+
+def getPartitions(endpoint,folder=None,params={},format="parquet",partitionOrder=None,client=None,incremental=False,rechunk=False,compact=False,memoryLimit=None,snapshots=None):
     """Fetch all partitions for a dataset in parallel.
 
+    When ``params`` carries ``ids``, partitions keyed by the id (``mod_20``) that cannot
+    hold any of them are not requested; see ``planPartitions``.
+
     Args:
         endpoint (str): Dataset endpoint name.
         folder (str | None, optional): Output folder name. When ``None``, data is kept in memory.
         params (dict, optional): Base query parameters shared across partitions.
         format (str, optional): Response format requested from the API.
         partitionOrder (list[str] | None, optional): Explicit key order used to build partition paths.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+            Its ``max_workers`` sets the number of parallel partition downloads.
+        incremental (bool, optional): Only used on disk. Keep a manifest next to the output
+            folder, skip partitions that did not change since the last download and delete
+            partitions of the same query that are no longer served.
+        rechunk (bool, optional): Only used in memory. Partition frames are appended to the
+            result as they complete, in completion order, and keep their own chunks; set to
+            ``True`` to copy the result into contiguous memory once all partitions arrived.
+        compact (bool, optional): Only used in memory. Cast each partition to the compact
+            schema of the endpoint in the worker, as it arrives. The dtypes are fixed once
+            for the whole load (see ``schemas.LoadSchema``), so partitions share one
+            schema and are appended without casting.
+        memoryLimit (int | str | None, optional): Only used in memory. Byte budget (for
+            example ``4G``) of the loaded partitions; defaults to the client's
+            ``memory_limit``. When the partitions received, or all partitions as projected
+            from them, exceed it, partitions are written to Arrow IPC files in a temporary
+            folder under ``<TRACK_API_STORAGE>/spill`` and a ``LazyFrame`` scanning them is
+            returned. The files are kept until ``spill.releaseSpill``, the end of the
+            enclosing ``spill.spillScope`` or the process exit.
+        snapshots (int | None, optional): Only used on disk. Download into a new snapshot
+            of the folder, keyed by the ``transactionId`` and seeded with hard links to
+            the current one, and publish it only once every partition is stored, by
+            atomically swapping the ``<folder>`` symlink; keep that many previous
+            snapshots. Folders already published as snapshots keep being downloaded
+            this way, keeping ``snapshots.DEFAULT_SNAPSHOTS`` when ``None``. When some
+            partitions fail, the new snapshot is deleted and the current one is left
+            untouched. See ``snapshots.Snapshot``.
 
     Returns:
-        polars.DataFrame | list: Concatenated DataFrame when ``folder`` is ``None``;
-            otherwise a list of per-partition results.
+        polars.DataFrame | polars.LazyFrame | list: Concatenated DataFrame (or LazyFrame
+            over the spilled partitions) when ``folder`` is ``None``; otherwise a list of per-partition results, ``{"status": "unchanged"}`` for
+            skipped partitions.
+
+    Raises:
+        PartitionsError: Once every partition was attempted, when some still failed after
+            their retries. It lists the failed partitions and carries what succeeded in
+            ``partial``; on disk, failed entries have ``{"status": "failed"}``.
     """
-    [host, key, data_dir, max_workers, verify_cert] = read_vars()
+    client = get_client(client)
 
-    [data, headers] = getJSON('partitions/'+endpoint, params)
-    transactionId = data["result"]["transactionId"]
-    partitions = data["result"]["partitions"]
-    results = [None] * len(partitions)
-    # print(data)
+    transactionId, _, partitions = _plan(endpoint, params, client)
 
+    if folder is not None:
+        base = client.data_dir / format
+        snapshot = None
+        if snapshots is not None or isSnapshotted(base, folder):
+            snapshot = Snapshot(base, folder, transactionId).stage()
+        target = folder if snapshot is None else snapshot.relative
+        manifest = None
+        if incremental:
+            manifest = Manifest(manifest_path(client.data_dir, format, folder), base / target)
+        load = _DiskLoad(endpoint, target, params, format, partitionOrder, transactionId, partitions, manifest,
+                         None if snapshot is None else snapshot.partial)
+        published = False
+        try:
+            failures = _runPartitions(endpoint, load.args, client, load.on_result, load.on_failure)
+            load.removeStale()
+            load.complete()
+            if snapshot is not None and not failures:
+                snapshot.validate(load.listed, format)
+                snapshot.publish(DEFAULT_SNAPSHOTS if snapshots is None else snapshots)
+                published = True
+        finally:
+            if snapshot is not None and not published:
+                snapshot.discard()
+            # A discarded snapshot leaves the previous one, which the manifest still describes.
+            if manifest is not None and (snapshot is None or published):
+                manifest.save()
+        if failures:
+            raise PartitionsError(endpoint, failures, load.results)
+        return load.results
+
+    # Every partition of the load is cast to the same compact schema.
+    schema = LoadSchema(endpoint) if compact else None
     args = []
     for partition in partitions:
-        partition_params = params | {"transactionId":transactionId} | partition
-        partition_params["transactionId"] = data["result"]["transactionId"]
-        partition_params["format"]=format
-        partitionPaths=[]
-        partition_items = list(partition.items())
-        
-        if partitionOrder is not None:
-            for p in partitionOrder:
-                value=partition[p]
-                partitionPaths.append(p+"="+str(value))    
-        else:
-            for key, value in partition.items():
-                partitionPaths.append(key+"="+str(value))
-
-        partitionPath="/".join(partitionPaths)
         args.append({
             "endpoint":endpoint,
-            "partition_params":partition_params,
-            "folder":None if folder is None else "/".join([format,folder]),
-            "partitionPath":partitionPath,
-            "format":format})
-        
-    progress = 0
-    total = len(args)
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        future_to_i = { pool.submit(
-            getPartition,
-            args["endpoint"],
-            args["partition_params"],
-            args["folder"],
-            args["partitionPath"],
-            args["format"]): i for i, args in enumerate(args)}
-        
-        # print('\n')
-        for fut in as_completed(future_to_i):
-            i = future_to_i[fut]
-            results[i] = fut.result()
-            progress = progress+1
-            inline_print(f'loading {endpoint}... {round(100 * progress / total,0)}% of {total} partitions', last=(progress==total))
-    
-    
-    if folder is None:
-        if len(results) > 0:
-            return pl.concat(results, how="vertical_relaxed")
-        else:
-            return None
-    else:
-        return results
+            "partition":partition,
+            "partition_params":_partitionParams(params,transactionId,partition,format),
+            "folder":None,
+            "partitionPath":_partitionPath(partition,partitionOrder),
+            "format":format,
+            "etag":None,
+            "compact":schema})
+
+    frames = _accumulator(client, memoryLimit, len(partitions), rechunk)
+    failures = _runPartitions(endpoint, args, client, lambda arg, result: frames.append(result))
+    if failures:
+        raise PartitionsError(endpoint, failures, frames.result())
+    return frames.result()
+
+
+def getPartitionsBatched(endpoint,paramsList,format="parquet",client=None,rechunk=False,compact=False,memoryLimit=None):
+    """Fetch the partitions of several queries on the same endpoint into one frame.
+
+    The partition listings of every query are requested concurrently, then all
+    partition fetches run together on the client pool, so splitting a query into
+    batches does not serialize its downloads.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        paramsList (list[dict]): Base query parameters of each query.
+        format (str, optional): Response format requested from the API.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        rechunk (bool, optional): Whether to copy the result into contiguous memory once
+            all partitions arrived. See ``getPartitions``.
+        compact (bool, optional): Cast each partition to the compact schema of the
+            endpoint as it arrives. See ``getPartitions``.
+        memoryLimit (int | str | None, optional): Byte budget of the loaded partitions,
+            past which they are spilled to disk. See ``getPartitions``.
+
+    Returns:
+        polars.DataFrame | polars.LazyFrame | None: Concatenated rows of every query, or
+            ``None`` when no query has any partition.
+
+    Raises:
+        PartitionsError: When some partitions still failed after their retries.
+    """
+    client = get_client(client)
+
+    plans = list(client.pool.map(lambda params: _plan(endpoint, params, client), paramsList))
+
+    schema = LoadSchema(endpoint) if compact else None
+    args = []
+    for params, (transactionId, _, partitions) in zip(paramsList, plans):
+        for partition in partitions:
+            args.append({
+                "endpoint":endpoint,
+                "partition":partition,
+                "partition_params":_partitionParams(params,transactionId,partition,format),
+                "folder":None,
+                "partitionPath":"",
+                "format":format,
+                "etag":None,
+                "compact":schema})
+
+    frames = _accumulator(client, memoryLimit, len(args), rechunk)
+    failures = _runPartitions(endpoint, args, client, lambda arg, result: frames.append(result))
+    if failures:
+        raise PartitionsError(endpoint, failures, frames.result())
+    return frames.result()
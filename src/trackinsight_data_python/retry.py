@@ -0,0 +1,163 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 60.0
+
+
+class PartitionsError(RuntimeError):
+    """Raised once every partition was attempted, when some of them still failed.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        failures (list[dict]): One entry per failed partition with ``partition_params``,
+            ``partitionPath``, ``attempts`` and ``error``.
+        partial (polars.DataFrame | list | None): What ``getPartitions`` would have returned
+            for the partitions that succeeded.
+    """
+
+    def __init__(self, endpoint, failures, partial=None):
+        self.endpoint = endpoint
+        self.failures = failures
+        self.partial = partial
+        lines = [f"{len(failures)} {endpoint} partition(s) failed:"]
+        for failure in failures:
+            name = failure["partitionPath"] or failure["partition_params"]
+            lines.append(f"  {name} after {failure['attempts']} attempt(s): {failure['error']}")
+        super().__init__("\n".join(lines))
+
+
+def retry_after(response):
+    """Return the delay in seconds requested by a ``Retry-After`` header, if any.
+
+    Args:
+        response (requests.Response | None): Failed response.
+
+    Returns:
+        float | None: Delay in seconds, or ``None`` when the header is missing or invalid.
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc):
+    """Whether a partition fetch that raised ``exc`` is worth trying again.
+
+    Connection errors, timeouts, truncated bodies and ``408``/``429``/``5xx`` responses
+    are transient; any other error fails the partition at once.
+    """
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    ))
+
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF, cap=MAX_BACKOFF, exc=None):
+    """Return how long to wait before retrying a failed partition.
+
+    Uses full-jitter exponential backoff, so that partitions failing together do not
+    retry together. A ``Retry-After`` header on the failed response is a lower bound.
+
+    Args:
+        attempt (int): Number of attempts already made, starting at 1.
+        base (float, optional): Backoff of the first retry, in seconds.
+        cap (float, optional): Upper bound of the exponential backoff, in seconds.
+        exc (Exception | None, optional): Error of the last attempt.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+    requested = retry_after(getattr(exc, "response", None))
+    if requested is not None:
+        delay = max(delay, requested)
+    return delay
+
+
+class AIMDController:
+    """Additive-increase, multiplicative-decrease limit on in-flight partition fetches.
+
+    The limit starts at ``maximum`` and is halved when a fetch fails with a transient
+    error or when latency climbs well above the best recent latency. It grows back by
+    one after every ``limit`` consecutive healthy fetches. Decreases happen at most once
+    per window of ``limit`` completions, so a burst of errors from one overloaded
+    moment only backs off once.
+
+    The best latency is the minimum smoothed latency of the last ``window`` fetches, not
+    of the whole load: after a lasting change, such as larger partitions, it catches up
+    with the new latency and the limit grows back.
+
+    Args:
+        maximum (int): Upper bound of the limit, usually the pool size.
+        minimum (int, optional): Lower bound of the limit.
+        latency_factor (float, optional): Ratio of the smoothed latency to the best
+            recent smoothed latency above which the server is considered congested.
+        window (int, optional): Number of latency samples the best latency is taken from.
+    """
+
+    def __init__(self, maximum, minimum=1, latency_factor=3.0, window=20):
+        self.maximum = max(1, int(maximum))
+        self.minimum = max(1, min(int(minimum), self.maximum))
+        self.latency_factor = latency_factor
+        self.limit = self.maximum
+        self._healthy = 0
+        self._since_decrease = self.maximum
+        self._latency = None
+        self._recent = deque(maxlen=max(1, int(window)))
+        self._lock = threading.Lock()
+
+    def success(self, latency=None):
+        """Record a successful fetch.
+
+        Args:
+            latency (float | None, optional): Time to first byte of the response, in
+                seconds. ``None`` for responses that say nothing about the load of the
+                server, such as ``304 Not Modified``: they only count as healthy.
+        """
+        with self._lock:
+            self._since_decrease += 1
+            if latency is not None:
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                self._recent.append(self._latency)
+                if self._latency > self.latency_factor * min(self._recent):
+                    self._decrease()
+                    return
+            self._healthy += 1
+            if self._healthy >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._healthy = 0
+
+    def failure(self):
+        """Record a fetch that failed with a transient error."""
+        with self._lock:
+            self._since_decrease += 1
+            self._decrease()
+
+    def _decrease(self):
+        self._healthy = 0
+        if self._since_decrease < self.limit:
+            return
+        self.limit = max(self.minimum, math.floor(self.limit / 2))
+        self._since_decrease = 0
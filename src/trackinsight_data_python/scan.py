@@ -0,0 +1,389 @@
+import json
+import threading
+from datetime import date, datetime
+
+import polars as pl
+from polars.io.plugins import register_io_source
+
+from ._params import (
+    build_holdings_params,
+    build_liquidity_params,
+    build_reports_params,
+    build_timeseries_params,
+    should_filter_ids_locally,
+)
+from .api import getMetadata
+from .cache import cache_key
+from .client import get_client
+from .partitions import _requestedIds, getJSON, getPartition, iterPartitions, prunePartitions
+
+# Functions to load data lazily as polars LazyFrames
+
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+# Share id requested to sample the schema of a dataset when the scan has no ids.
+SAMPLE_ID = 0
+
+
+def _fetchSchema(endpoint, params, client):
+    [data, headers] = getJSON('partitions/'+endpoint, params, client=client)
+    partitions = prunePartitions(data["result"]["partitions"], _requestedIds(params))
+    if len(partitions) == 0:
+        return None
+    partition_params = params | {"transactionId": data["result"]["transactionId"]} | partitions[0]
+    partition_params["format"] = "parquet"
+    return getPartition(endpoint, partition_params, client=client).schema
+
+
+def _sampleSchema(endpoint, params, client, sample=None):
+    """Return the schema of a dataset from one of its partitions (memoized).
+
+    The partition is first requested with the narrow ``sample`` params, a single id over
+    a single day, whose parquet body carries the schema for a few rows at most. When
+    that answer has no columns or untyped (``Null``) ones, the first partition of
+    ``params`` is loaded instead.
+    """
+    key = cache_key(endpoint, params)
+    with _schemas_lock:
+        schema = _schemas.get(key)
+    if schema is not None:
+        return schema
+
+    schema = None if sample is None else _fetchSchema(endpoint, sample, client)
+    if not schema or any(dtype == pl.Null for dtype in schema.values()):
+        schema = _fetchSchema(endpoint, params, client)
+    if schema is None:
+        return pl.Schema()
+
+    with _schemas_lock:
+        _schemas[key] = schema
+    return schema
+
+
+def _conjuncts(expr):
+    """Split a predicate into the list of expressions joined by ``&``."""
+    try:
+        node = json.loads(expr.meta.serialize(format="json"))
+    except Exception:
+        return [expr]
+    if "BinaryExpr" in node and node["BinaryExpr"]["op"] in ("And", "LogicalAnd"):
+        return [term for child in expr.meta.pop() for term in _conjuncts(child)]
+    return [expr]
+
+
+def _literalValues(expr):
+    values = pl.select(expr).to_series()
+    if values.dtype in (pl.List, pl.Array):
+        values = values.explode()
+    return values.to_list()
+
+
+def _isoDate(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value[:10]
+    return None
+
+
+def _pushdown(predicate, id_column, date_column):
+    """Extract the parts of a predicate the API can apply as request params.
+
+    Only conjunctive terms of the form ``col(id).is_in([...])``, ``col(id) == x``,
+    ``col(date) <op> x`` and ``col(date).is_between(a, b)`` with literal operands are
+    recognised. The result is always a superset of the predicate, which is still
+    evaluated locally on every partition.
+
+    Args:
+        predicate (polars.Expr | None): Predicate pushed into the scan by Polars.
+        id_column (str): Name of the id column of the dataset.
+        date_column (str | None): Name of the date column, when the endpoint accepts
+            ``from``/``to`` params.
+
+    Returns:
+        dict: ``ids`` (set | None), ``start`` (str | None) and ``end`` (str | None).
+    """
+    pushed = {"ids": None, "start": None, "end": None}
+    if predicate is None:
+        return pushed
+
+    def restrict_ids(values):
+        values = set(values)
+        pushed["ids"] = values if pushed["ids"] is None else pushed["ids"] & values
+
+    def restrict_dates(start=None, end=None):
+        if start is not None and (pushed["start"] is None or start > pushed["start"]):
+            pushed["start"] = start
+        if end is not None and (pushed["end"] is None or end < pushed["end"]):
+            pushed["end"] = end
+
+    for term in _conjuncts(predicate):
+        try:
+            _pushTerm(term, id_column, date_column, restrict_ids, restrict_dates)
+        except Exception:
+            continue
+    return pushed
+
+
+def _pushTerm(term, id_column, date_column, restrict_ids, restrict_dates):
+    """Apply one conjunctive term of a predicate to the pushed-down bounds."""
+    node = json.loads(term.meta.serialize(format="json"))
+    inputs = list(reversed(term.meta.pop()))
+
+    if "Function" in node:
+        function = node["Function"]
+        args = function["input"]
+        kind = function["function"].get("Boolean", {}) if isinstance(function["function"], dict) else {}
+        if len(args) < 2 or args[0].get("Column") is None or not all("Literal" in a for a in args[1:]):
+            return
+        column = args[0]["Column"]
+        if "IsIn" in kind and column == id_column:
+            restrict_ids(_literalValues(inputs[1]))
+        elif "IsBetween" in kind and column == date_column:
+            restrict_dates(_isoDate(_literalValues(inputs[1])[0]), _isoDate(_literalValues(inputs[2])[0]))
+
+    elif "BinaryExpr" in node:
+        binary = node["BinaryExpr"]
+        op = binary["op"]
+        if "Column" in binary["left"] and "Literal" in binary["right"]:
+            column, value = binary["left"]["Column"], _literalValues(inputs[1])[0]
+        elif "Literal" in binary["left"] and "Column" in binary["right"]:
+            column, value = binary["right"]["Column"], _literalValues(inputs[0])[0]
+            op = {"Gt": "Lt", "GtEq": "LtEq", "Lt": "Gt", "LtEq": "GtEq"}.get(op, op)
+        else:
+            return
+        if column == id_column and op == "Eq":
+            restrict_ids([value])
+        elif column == date_column:
+            value = _isoDate(value)
+            if op == "Eq":
+                restrict_dates(value, value)
+            elif op in ("Gt", "GtEq"):
+                restrict_dates(start=value)
+            elif op in ("Lt", "LtEq"):
+                restrict_dates(end=value)
+
+
+def _scanPartitions(endpoint, build_params, id_column, date_column=None, columns=False, ids=None, start=None, end=None, client=None, schema=None):
+    """Build a LazyFrame whose filters and projections are pushed to the API.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        build_params (Callable[..., dict]): Builds request params from ``ids``, ``start`` and ``end``.
+        id_column (str): Name of the id column of the dataset.
+        date_column (str | None, optional): Date column mapped to ``from``/``to`` params.
+        columns (bool, optional): Whether the endpoint accepts a ``columns`` param.
+        ids (list[int] | tuple[int] | None, optional): Share IDs requested by the caller.
+        start (str | None, optional): Lower date bound requested by the caller.
+        end (str | None, optional): Upper date bound requested by the caller.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        schema (polars.Schema | dict | None, optional): Schema of the dataset. When ``None``,
+            it is read on first use from a sample request for a single id and day.
+
+    Returns:
+        polars.LazyFrame: Lazy scan over the dataset partitions.
+    """
+    client = get_client(client)
+    base_params = None
+
+    def resolve_params():
+        nonlocal base_params
+        if base_params is None:
+            base_params = build_params(ids=ids, start=start, end=end)
+        return base_params
+
+    def resolve_schema():
+        if schema is not None:
+            return pl.Schema(schema)
+        params = dict(resolve_params())
+        params.pop("ids", None)
+        sample = build_params(
+            ids=[ids[0] if ids else SAMPLE_ID],
+            start=start,
+            end=start if date_column is not None and start is not None else end)
+        return _sampleSchema(endpoint, params, client, sample)
+
+    def source(with_columns, predicate, n_rows, batch_size):
+        target = resolve_schema()
+        pushed = _pushdown(predicate, id_column, date_column)
+
+        request_ids = ids
+        if pushed["ids"] is not None:
+            request_ids = sorted(pushed["ids"] if ids is None else pushed["ids"] & set(ids))
+            if len(request_ids) == 0:
+                return
+        request_start, request_end = start, end
+        if pushed["start"] is not None and (request_start is None or pushed["start"] > request_start):
+            request_start = pushed["start"]
+        if pushed["end"] is not None and (request_end is None or pushed["end"] < request_end):
+            request_end = pushed["end"]
+        if request_start is not None and request_end is not None and request_start > request_end:
+            return
+
+        params = build_params(ids=request_ids, start=request_start, end=request_end)
+        # Ids beyond IDS_LIMIT are not sent with the request: filter them on each partition.
+        local_ids = request_ids if should_filter_ids_locally(request_ids) else None
+        if columns and with_columns is not None:
+            needed = set(with_columns) | (set(predicate.meta.root_names()) if predicate is not None else set())
+            params["columns"] = ",".join(c for c in target if c in needed)
+
+        def transform(frame):
+            frame = frame.select([
+                pl.col(c).cast(dtype, strict=False) if c in frame.columns else pl.lit(None, dtype).alias(c)
+                for c, dtype in target.items()
+            ])
+            if local_ids is not None:
+                frame = frame.filter(pl.col(id_column).is_in(local_ids))
+            if predicate is not None:
+                frame = frame.filter(predicate)
+            if with_columns is not None:
+                frame = frame.select(with_columns)
+            return frame
+
+        remaining = n_rows
+        for frame in iterPartitions(endpoint, params=params, client=client, transform=transform):
+            if remaining is not None:
+                frame = frame.head(remaining)
+                remaining -= frame.height
+            yield frame
+            if remaining is not None and remaining <= 0:
+                return
+
+    return register_io_source(source, schema=resolve_schema, explain_name="trackinsight "+endpoint)
+
+
+def scanTimeseries(start='2019-01-01',end=None,ccy='eur',ids=None,client=None,schema=None):
+    """Lazily scan timeseries rows.
+
+    Filters on ``id`` and on ``date`` bounds applied to the returned LazyFrame are sent to
+    the API as ``ids``, ``from`` and ``to`` params when it is collected; the remaining
+    filters and projections are applied to each partition before concatenation.
+
+    Args:
+        start (str, optional): Start date (inclusive), in ``YYYY-MM-DD`` format.
+        end (str | None, optional): End date (inclusive), in ``YYYY-MM-DD`` format.
+        ccy (str, optional): Currency code.
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        schema (polars.Schema | dict | None, optional): Schema of the dataset. When ``None``,
+            it is read on first use from a sample request for a single id and day.
+
+    Returns:
+        polars.LazyFrame: Lazy scan over the timeseries partitions.
+    """
+    return _scanPartitions(
+        "timeseries",
+        lambda ids, start, end: build_timeseries_params(start=start, end=end, ccy=ccy, ids=ids),
+        id_column="id",
+        date_column="date",
+        ids=ids,
+        start=start,
+        end=end,
+        client=client,
+        schema=schema,
+    )
+
+
+def scanReports(stamp=None,ccy='eur',ids=None,periods=None,client=None,schema=None):
+    """Lazily scan report rows for a given valuation stamp.
+
+    Filters on ``share_id`` are sent to the API as the ``ids`` param and selected columns as
+    the ``columns`` param when the LazyFrame is collected. When ``stamp=None``, the latest
+    available stamp is resolved on first use.
+
+    Args:
+        stamp (str, optional): Report valuation date in ``YYYY-MM-DD`` format.
+        ccy (str, optional): Currency code.
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        periods (list[str] | tuple[str, ...] | None, optional): Report periods to request.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        schema (polars.Schema | dict | None, optional): Schema of the dataset. When ``None``,
+            it is read on first use from a sample request for a single id and day.
+
+    Returns:
+        polars.LazyFrame: Lazy scan over the report partitions.
+    """
+    resolved = {"stamp": stamp}
+
+    def build(ids, start, end):
+        params, resolved["stamp"] = build_reports_params(
+            stamp=resolved["stamp"],
+            ccy=ccy,
+            ids=ids,
+            periods=periods,
+            metadata_loader=lambda: getMetadata(client=client),
+        )
+        return params
+
+    return _scanPartitions(
+        "reports",
+        build,
+        id_column="share_id",
+        columns=True,
+        ids=ids,
+        client=client,
+        schema=schema,
+    )
+
+
+def scanHoldings(ids=None, proxy=True, level=0, extraLines=False, client=None, schema=None):
+    """Lazily scan holdings rows.
+
+    Filters on ``share_id`` are sent to the API as the ``ids`` param when the LazyFrame is
+    collected.
+
+    Args:
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        proxy (bool, optional): Whether to include proxy holdings.
+        level (int, optional): The depth at which ETFs containing other ETFs are expanded in portfolios.
+        extraLines (bool, optional): Whether to include special portfolio lines.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        schema (polars.Schema | dict | None, optional): Schema of the dataset. When ``None``,
+            it is read on first use from a sample request for a single id and day.
+
+    Returns:
+        polars.LazyFrame: Lazy scan over the holdings partitions.
+    """
+    return _scanPartitions(
+        "holdings",
+        lambda ids, start, end: build_holdings_params(ids=ids, proxy=proxy, level=level, extraLines=extraLines),
+        id_column="share_id",
+        ids=ids,
+        client=client,
+        schema=schema,
+    )
+
+
+def scanLiquidity(start,end,ccy='eur',ids=None,client=None,schema=None):
+    """Lazily scan liquidity rows.
+
+    Filters on ``share_id`` and on ``date`` bounds are sent to the API as ``ids``, ``from``
+    and ``to`` params when the LazyFrame is collected.
+
+    Args:
+        start (str): Start date (inclusive), in ``YYYY-MM-DD`` format.
+        end (str): End date (inclusive), in ``YYYY-MM-DD`` format.
+        ccy (str, optional): Currency code.
+        ids (list[int] | tuple[int] | None, optional): Optional share IDs to filter.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        schema (polars.Schema | dict | None, optional): Schema of the dataset. When ``None``,
+            it is read on first use from a sample request for a single id and day.
+
+    Returns:
+        polars.LazyFrame: Lazy scan over the liquidity partitions.
+    """
+    return _scanPartitions(
+        "liquidity",
+        lambda ids, start, end: build_liquidity_params(start=start, end=end, ccy=ccy, ids=ids),
+        id_column="share_id",
+        date_column="date",
+        ids=ids,
+        start=start,
+        end=end,
+        client=client,
+        schema=schema,
+    )
@@ -0,0 +1,154 @@
+import threading
+
+import polars as pl
+
+from ._files import DATE_COLUMNS, ID_COLUMNS
+
+ID_DTYPE = pl.Int32
+DATE_FORMAT = "%Y-%m-%d"
+
+# Target dtypes of the columns known for each endpoint, ids included: they are static,
+# whatever the values of a partition. Columns not listed here are compacted by
+# ``compactSchema`` from their name and decoded dtype, once per load (see ``LoadSchema``).
+SCHEMAS = {
+    "shares": {"share_id": ID_DTYPE},
+    "timeseries": {"id": ID_DTYPE, "date": pl.Date, "ccy": pl.Categorical},
+    "reports": {"share_id": ID_DTYPE, "stamp": pl.Date, "ccy": pl.Categorical},
+    "holdings": {"share_id": ID_DTYPE},
+    "liquidity": {"share_id": ID_DTYPE, "date": pl.Date, "ccy": pl.Categorical},
+    "liquidity_summary": {"share_id": ID_DTYPE, "date": pl.Date, "ccy": pl.Categorical},
+}
+
+_lock = threading.Lock()
+
+
+def registerSchema(endpoint,dtypes):
+    """Set the target dtypes of some columns of an endpoint, used by ``compact=True``.
+
+    For example, a column whose values are known in advance can be decoded to an
+    ``Enum``::
+
+        registerSchema("reports", {"period": pl.Enum(["one-day", "one-week"])})
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        dtypes (dict[str, polars.DataType]): Target dtype of each column.
+    """
+    with _lock:
+        SCHEMAS[endpoint] = SCHEMAS.get(endpoint, {}) | dict(dtypes)
+
+
+def _isDateColumn(name):
+    return name in DATE_COLUMNS or name.endswith("_date")
+
+
+def _compactDtype(name, dtype):
+    if name in ID_COLUMNS and dtype.is_integer():
+        return ID_DTYPE
+    if _isDateColumn(name) and (dtype == pl.String or dtype == pl.Datetime):
+        return pl.Date
+    if dtype == pl.String:
+        return pl.Categorical
+    if dtype == pl.List(pl.String):
+        return pl.List(pl.Categorical)
+    return dtype
+
+
+def compactSchema(endpoint,schema):
+    """Return the compact schema of a decoded partition.
+
+    Columns registered for the endpoint get their registered dtype. Other id columns
+    become ``Int32``, date columns stored as strings or datetimes become ``Date``, and
+    remaining strings (and lists of strings) become ``Categorical``.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        schema (polars.Schema | dict): Schema of the decoded partition.
+
+    Returns:
+        dict[str, polars.DataType]: Target dtype of every column, in the same order.
+    """
+    with _lock:
+        registered = SCHEMAS.get(endpoint, {})
+    return {
+        name: registered.get(name, _compactDtype(name, dtype))
+        for name, dtype in schema.items()
+    }
+
+
+def _castExpr(name, source, target):
+    column = pl.col(name)
+    if target == pl.Date and source == pl.String:
+        return column.str.to_date(DATE_FORMAT, exact=False)
+    return column.cast(target)
+
+
+def _overflows(series, target):
+    """Whether casting an integer column to a narrower integer dtype loses values."""
+    if not (series.dtype.is_integer() and target.is_integer()) or series.dtype == target:
+        return False
+    return series.cast(target, strict=False).null_count() > series.null_count()
+
+
+class LoadSchema:
+    """Compact schema shared by every partition of one load.
+
+    The target dtype of each column is fixed by the first partition that holds it with
+    a known dtype, from the registry or the rules of ``compactSchema``, and every later
+    partition is cast to it: partitions decoded with other dtypes, such as JSON
+    partitions inferred as ``Int32`` or ``Null``, are appended without supercasting.
+    An integer column whose values do not fit its target, such as ids past ``Int32``,
+    is widened to its decoded dtype for the partitions that follow.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+
+    Attributes:
+        dtypes (dict[str, polars.DataType]): Target dtypes fixed so far.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.dtypes = {}
+        self._lock = threading.Lock()
+
+    def cast(self, frame):
+        """Cast a decoded partition to the schema of the load.
+
+        Args:
+            frame (polars.DataFrame): Decoded partition.
+
+        Returns:
+            polars.DataFrame: The partition with the dtypes of the load.
+        """
+        with self._lock:
+            unknown = {name: dtype for name, dtype in frame.schema.items()
+                       if name not in self.dtypes and dtype != pl.Null}
+            self.dtypes.update(compactSchema(self.endpoint, unknown))
+            target = {name: self.dtypes.get(name, dtype) for name, dtype in frame.schema.items()}
+        widened = {name: frame.schema[name] for name, dtype in target.items() if _overflows(frame[name], dtype)}
+        if widened:
+            with self._lock:
+                self.dtypes.update(widened)
+            target.update(widened)
+        casts = [
+            _castExpr(name, dtype, target[name])
+            for name, dtype in frame.schema.items()
+            if target[name] != dtype
+        ]
+        return frame.with_columns(casts) if casts else frame
+
+
+def compactFrame(endpoint,frame):
+    """Cast a decoded partition to the compact schema of its endpoint.
+
+    To cast the partitions of one load to the same dtypes, use one ``LoadSchema``.
+
+    Args:
+        endpoint (str): Dataset endpoint name.
+        frame (polars.DataFrame): Decoded partition.
+
+    Returns:
+        polars.DataFrame: The partition with compact dtypes.
+    """
+    return LoadSchema(endpoint).cast(frame)
@@ -0,0 +1,214 @@
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import polars as pl
+
+from ._files import IPC_FORMAT, PARTIAL_SUFFIXES
+from .client import get_client
+
+SNAPSHOTS_SUFFIX = ".snapshots"
+STAGING_SUFFIX = ".staging"
+PARTIAL_SUFFIX = ".partial"
+# Number of previous snapshots kept when a snapshotted folder is refreshed without an
+# explicit ``snapshots`` count.
+DEFAULT_SNAPSHOTS = 2
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._=-]")
+_SCHEMA_READERS = {"parquet": pl.read_parquet_schema, IPC_FORMAT: pl.read_ipc_schema}
+
+
+def snapshots_path(base, folder):
+    """Return the folder holding the snapshots of a dataset folder.
+
+    Snapshots sit next to the dataset (``<format>/<folder>.snapshots/<name>``), which
+    becomes a symlink to the current one.
+    """
+    return Path(base) / (folder + SNAPSHOTS_SUFFIX)
+
+
+def isSnapshotted(base,folder):
+    """Tell whether a dataset folder is published as a snapshot symlink."""
+    return os.path.islink(Path(base) / folder)
+
+
+def currentSnapshot(base,folder):
+    """Return the snapshot a dataset folder points to, or ``None`` when it is not snapshotted."""
+    link = Path(base) / folder
+    if not os.path.islink(link):
+        return None
+    return Path(os.path.realpath(link))
+
+
+def listSnapshots(folder,format='parquet',client=None):
+    """List the published snapshots of a downloaded dataset, newest first.
+
+    Args:
+        folder (str): Dataset folder under ``<TRACK_API_STORAGE>/<format>``.
+        format (str, optional): File format of the dataset.
+        client (Client | None, optional): Client whose storage holds the dataset.
+
+    Returns:
+        list[dict]: ``name``, ``path``, ``published`` (timestamp) and ``current`` of
+            every snapshot.
+    """
+    base = get_client(client).data_dir / format
+    current = currentSnapshot(base, folder)
+    return [
+        {"name": path.name, "path": str(path), "published": path.stat().st_mtime, "current": path == current}
+        for path in _published(snapshots_path(base, folder))
+    ]
+
+
+def _published(root):
+    if not root.is_dir():
+        return []
+    paths = [path for path in root.iterdir() if path.is_dir() and not path.name.endswith(STAGING_SUFFIX)]
+    return sorted(paths, key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def _seed(source, target):
+    """Fill ``target`` with hard links to the files of ``source``, copying when linking fails."""
+    for current, _, names in os.walk(source):
+        destination = os.path.join(target, os.path.relpath(current, source))
+        os.makedirs(destination, exist_ok=True)
+        for name in names:
+            if name.endswith(PARTIAL_SUFFIXES):
+                continue
+            try:
+                os.link(os.path.join(current, name), os.path.join(destination, name))
+            except OSError:
+                shutil.copy2(os.path.join(current, name), os.path.join(destination, name))
+
+
+class Snapshot:
+    """New snapshot of a dataset folder, written in a staging folder then published.
+
+    The staging folder ``<format>/<folder>.snapshots/<name>.staging`` starts as hard
+    links to the files of the current snapshot, so partitions that did not change are
+    neither downloaded nor copied, and files are only ever replaced, never modified in
+    place. ``publish`` renames it to ``<name>`` and atomically swaps the ``<folder>``
+    symlink to it: readers see either the previous snapshot or the new one, and globs
+    already expanded on the previous snapshot stay valid while it is kept.
+
+    Args:
+        base (str | Path): Format folder, ``<TRACK_API_STORAGE>/<format>``.
+        folder (str): Dataset folder name.
+        name (str): Snapshot name, usually the ``transactionId`` of the download. A
+            suffix is added when a snapshot of that name already exists.
+    """
+
+    def __init__(self, base, folder, name):
+        self.base = Path(base)
+        self.folder = folder
+        self.root = snapshots_path(base, folder)
+        name = _UNSAFE.sub("_", str(name)) or "snapshot"
+        unique, n = name, 0
+        while (self.root / unique).exists():
+            n += 1
+            unique = f"{name}.{n}"
+        self.name = unique
+        self.staging = self.root / (unique + STAGING_SUFFIX)
+
+    @property
+    def relative(self):
+        """Staging folder relative to ``base``, to download into."""
+        return f"{self.folder}{SNAPSHOTS_SUFFIX}/{self.staging.name}"
+
+    @property
+    def partial(self):
+        """Folder relative to ``base`` keeping the partial downloads of the dataset.
+
+        It is shared by every snapshot of the folder, so a download interrupted while
+        staging one snapshot is resumed while staging the next.
+        """
+        return self.folder + PARTIAL_SUFFIX
+
+    def stage(self,seed=True):
+        """Create the staging folder, seeded with the files of the current dataset folder.
+
+        Returns:
+            Snapshot: The snapshot, for chaining.
+        """
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
+        self.staging.mkdir(parents=True)
+        current = self.base / self.folder
+        if seed and current.is_dir():
+            _seed(current, self.staging)
+        return self
+
+    def validate(self,partitionPaths,format):
+        """Check that every listed partition has a complete data file in the staging folder.
+
+        Args:
+            partitionPaths (Iterable[str]): Partition paths of the listings.
+            format (str): File format of the dataset. Parquet footers and IPC schemas are
+                read as well.
+
+        Raises:
+            ValueError: When a partition file is missing or unreadable.
+        """
+        for partitionPath in partitionPaths:
+            filepath = self.staging / partitionPath / ("data."+format)
+            if not filepath.is_file():
+                raise ValueError(f"snapshot {self.name} of {self.folder} is missing {partitionPath}")
+            reader = _SCHEMA_READERS.get(format)
+            if reader is not None:
+                try:
+                    reader(filepath)
+                except Exception as exc:
+                    raise ValueError(f"snapshot {self.name} of {self.folder} has an unreadable {partitionPath}: {exc}") from exc
+
+    def publish(self,keep=DEFAULT_SNAPSHOTS):
+        """Make the staged snapshot the current one, then delete old snapshots.
+
+        A dataset folder that is still a plain directory, from downloads made without
+        snapshots, is replaced by the symlink; that first switch is not atomic: the
+        folder is renamed aside just before the symlink takes its name.
+
+        Args:
+            keep (int | None, optional): Number of previous snapshots to keep. ``None``
+                keeps them all.
+
+        Returns:
+            Path: The published snapshot folder.
+        """
+        target = self.root / self.name
+        os.rename(self.staging, target)
+        now = time.time()
+        os.utime(target, (now, now))
+
+        link = self.base / self.folder
+        tmp = self.base / f".{self.folder}.link"
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        os.symlink(os.path.relpath(target, self.base), tmp)
+        aside = None
+        if link.is_dir() and not link.is_symlink():
+            aside = self.base / f".{self.folder}.old"
+            if aside.exists():
+                shutil.rmtree(aside)
+            os.rename(link, aside)
+        os.replace(tmp, link)
+        if aside is not None:
+            shutil.rmtree(aside)
+        # Every partition of the published snapshot is complete.
+        shutil.rmtree(self.base / self.partial, ignore_errors=True)
+
+        if keep is not None:
+            for old in _published(self.root):
+                if old == target:
+                    continue
+                if keep > 0:
+                    keep -= 1
+                    continue
+                shutil.rmtree(old)
+        return target
+
+    def discard(self):
+        """Delete the staging folder, leaving the current snapshot untouched."""
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
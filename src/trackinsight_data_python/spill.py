@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+
+import polars as pl
+
+SPILL_FOLDER = "spill"
+SPILL_COMPRESSION = "lz4"
+
+
+def parse_size(value):
+    """Parse a byte size such as ``1048576``, ``512M`` or ``4G``.
+
+    Args:
+        value (int | str | None): Size in bytes, optionally with a ``K``, ``M``, ``G`` or
+            ``T`` suffix (powers of 1024).
+
+    Returns:
+        int | None: Size in bytes, or ``None`` when ``value`` is ``None`` or empty.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper().removesuffix("B")
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+
+class _SpillDirectory:
+    """Temporary folder of a spilled load, deleted by ``releaseSpill`` or at exit."""
+
+    def __init__(self, root):
+        os.makedirs(root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix="spill-", dir=root)
+        # The registry keeps the folder alive; the finalizer only runs on release or at exit.
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+        with _lock:
+            _directories[self.path] = self
+            for scope in _scopes:
+                scope.append(self.path)
+
+    def release(self):
+        with _lock:
+            _directories.pop(self.path, None)
+        self._finalizer()
+
+
+# Spill folders of the process, by path. Frames derived from a spilled load (filters,
+# group-bys, ...) are new objects that read the same files, so a folder cannot be tied
+# to the lifetime of one frame: it lives until it is released or the process exits.
+_directories = {}
+_scopes = []
+_lock = threading.Lock()
+
+
+def spillFolders():
+    """Return the spill folders of the process still on disk.
+
+    Returns:
+        list[str]: Paths of the folders, oldest first.
+    """
+    with _lock:
+        return list(_directories)
+
+
+def releaseSpill(path=None):
+    """Delete spill folders, making the lazy frames reading them unusable.
+
+    Args:
+        path (str | None, optional): Folder to delete, as listed by ``spillFolders``.
+            When ``None``, every spill folder of the process is deleted.
+    """
+    with _lock:
+        directories = list(_directories.values()) if path is None else [_directories.get(str(path))]
+    for directory in directories:
+        if directory is not None:
+            directory.release()
+
+
+@contextmanager
+def spillScope():
+    """Delete the spill folders of the loads made inside the block when it exits.
+
+    Frames returned by those loads, and frames derived from them, must be collected
+    inside the block::
+
+        with spillScope():
+            lf = getTimeseries(start='2019-01-01')
+            last = lf.group_by('id').agg(pl.col('value').last()).collect(engine='streaming')
+
+    Yields:
+        list[str]: Paths of the spill folders created so far inside the block.
+    """
+    created = []
+    with _lock:
+        _scopes.append(created)
+    try:
+        yield created
+    finally:
+        with _lock:
+            _scopes.remove(created)
+        for path in created:
+            releaseSpill(path)
+
+
+def keepSpill(derived,source):
+    """Return ``derived`` unchanged.
+
+    Kept for compatibility: spill folders now live until ``releaseSpill``, the end of a
+    ``spillScope`` or the process exit, whatever frames refer to them.
+
+    Args:
+        derived (polars.LazyFrame): Frame built from ``source``.
+        source (polars.LazyFrame): Frame returned by a memory-limited load.
+
+    Returns:
+        polars.LazyFrame: ``derived``.
+    """
+    return derived
+
+
+class SpillAccumulator:
+    """Keep partition frames in memory up to a byte budget, then spill them to disk.
+
+    Frames are held in memory while their size, and the size projected for all
+    ``expected`` partitions from the frames seen so far, stay under ``limit``. Past it,
+    held frames and every later frame are written as Arrow IPC files to a temporary
+    folder under ``root``, and ``result`` returns a ``LazyFrame`` scanning them. The
+    folder is kept until ``releaseSpill``, the end of the enclosing ``spillScope`` or
+    the process exit.
+
+    Args:
+        limit (int): Byte budget of the frames held in memory.
+        root (str | Path): Folder receiving the temporary spill folders.
+        expected (int): Number of partitions of the load.
+        rechunk (bool): Whether an in-memory result is rechunked into contiguous memory.
+    """
+
+    def __init__(self, limit, root, expected, rechunk=False):
+        self.limit = limit
+        self.root = root
+        self.expected = max(1, expected)
+        self.rechunk = rechunk
+        self.frames = []
+        self.size = 0
+        self.count = 0
+        self.directory = None
+        self.files = []
+
+    @property
+    def spilled(self):
+        """Whether the frames were written to disk."""
+        return self.directory is not None
+
+    def append(self, frame):
+        self.count += 1
+        if self.directory is not None:
+            self._write(frame)
+            return
+        self.frames.append(frame)
+        self.size += frame.estimated_size()
+        projected = self.size / self.count * self.expected
+        if self.size > self.limit or projected > self.limit:
+            self.directory = _SpillDirectory(self.root)
+            for held in self.frames:
+                self._write(held)
+            self.frames = []
+
+    def _write(self, frame):
+        path = os.path.join(self.directory.path, f"part-{len(self.files):05d}.arrow")
+        frame.write_ipc(path, compression=SPILL_COMPRESSION)
+        self.files.append(path)
+
+    def result(self):
+        """Return the loaded rows: a ``DataFrame`` in memory, or a ``LazyFrame`` once spilled."""
+        if self.directory is None:
+            if not self.frames:
+                return None
+            frame = pl.concat(self.frames, how="vertical_relaxed", rechunk=self.rechunk)
+            self.frames = []
+            return frame
+        return pl.concat([pl.scan_ipc(path) for path in self.files], how="vertical_relaxed")
@@ -0,0 +1,272 @@
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta
+
+import polars as pl
+
+from ._files import data_files
+from ._params import build_liquidity_params, build_timeseries_params
+from .client import get_client
+from .index import index_path, updateIndex
+from .manifest import Manifest, manifest_path
+from .partitions import getPartitions
+from .snapshots import DEFAULT_SNAPSHOTS, Snapshot, currentSnapshot, isSnapshotted
+
+STAGING_SUFFIX = ".sync"
+COMPLETE_MARKER = "COMPLETE"
+
+
+def lastDate(root, date_column="date"):
+    """Return the latest date stored under a parquet Hive layout.
+
+    Args:
+        root (str | Path): Dataset folder, for example ``<storage>/parquet/eur_timeseries``.
+        date_column (str, optional): Name of the date column.
+
+    Returns:
+        datetime.date | None: Latest stored date, or ``None`` when nothing is stored.
+    """
+    files = sorted(str(path) for path in data_files(root))
+    if not files:
+        return None
+    value = pl.scan_parquet(files).select(pl.col(date_column).max()).collect().item()
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _mergePartition(staged, target, keys):
+    """Merge one staged partition file into the matching stored partition folder.
+
+    Stored rows whose ``keys`` appear in the staged rows are dropped, rewriting only the
+    files that hold such rows, then the staged rows are added as a new file. Stored files
+    are replaced, never modified in place, so they may be hard links into a snapshot.
+    Only stored rows from the first staged date on can clash: files are probed with a
+    scan filtered on that date, which skips earlier row groups from their statistics,
+    and only files with clashing rows are read in full.
+
+    Returns:
+        bool: Whether ``data.parquet`` of the partition was written, rewritten or removed.
+    """
+    new = pl.read_parquet(staged).unique(subset=keys, keep="last", maintain_order=True)
+    os.makedirs(target, exist_ok=True)
+    existing = data_files(target)
+    rewritten = False
+    if existing and new.height > 0:
+        replaced = new.select(keys)
+        date_column = keys[-1]
+        first = new[date_column].min()
+        recent = pl.col(date_column).is_null()
+        if first is not None:
+            recent = recent | (pl.col(date_column) >= first)
+        for path in existing:
+            clashes = (
+                pl.scan_parquet(path)
+                .filter(recent)
+                .select(keys)
+                .join(replaced.lazy(), on=keys, how="semi", nulls_equal=True)
+                .head(1)
+                .collect()
+            )
+            if clashes.height == 0:
+                continue
+            old = pl.read_parquet(path)
+            kept = old.join(replaced, on=keys, how="anti", nulls_equal=True)
+            if kept.height == old.height:
+                continue
+            if kept.height == 0:
+                os.remove(path)
+            else:
+                tmp = path + ".tmp"
+                kept.write_parquet(tmp)
+                os.replace(tmp, path)
+            rewritten = rewritten or os.path.basename(path) == "data.parquet"
+    remaining = data_files(target)
+    if new.height > 0 or not remaining:
+        name = f"delta-{uuid.uuid4().hex[:12]}.parquet" if remaining else "data.parquet"
+        tmp = os.path.join(target, name + ".tmp")
+        new.write_parquet(tmp)
+        os.replace(tmp, os.path.join(target, name))
+        rewritten = rewritten or name == "data.parquet"
+    return rewritten
+
+
+def _hasRows(path):
+    return pl.scan_parquet(path).select(pl.len()).collect().item() > 0
+
+
+def _mergeStaging(staging, root, keys, consume=True):
+    """Merge every staged partition into ``root``.
+
+    Staged partitions without rows are skipped. With ``consume``, each staged file is
+    deleted once merged, so an interrupted merge resumes where it stopped on the next
+    sync, and the staging folder is deleted at the end. Otherwise the staging folder is
+    left for the caller to delete.
+
+    Returns:
+        list[str]: Partition paths whose ``data.parquet`` changed.
+    """
+    rewritten = []
+    for staged in sorted(data_files(staging)):
+        relative = os.path.relpath(os.path.dirname(staged), staging)
+        if _hasRows(staged) and _mergePartition(staged, os.path.join(root, relative), keys):
+            rewritten.append(relative)
+        if consume:
+            os.remove(staged)
+    if consume:
+        shutil.rmtree(staging)
+    return rewritten
+
+
+def _publishMerge(base, folder, staging, keys, snapshots):
+    """Merge the staged partitions into a new snapshot of ``folder`` and publish it.
+
+    The new snapshot starts as hard links to the current one. The staged files are kept
+    until it is published, so an interrupted merge is redone from the current snapshot
+    by the next sync.
+
+    Returns:
+        list[str]: Partition paths whose ``data.parquet`` changed.
+    """
+    snapshot = Snapshot(base, folder, "sync-" + uuid.uuid4().hex[:12]).stage()
+    published = False
+    try:
+        rewritten = _mergeStaging(staging, snapshot.staging, keys, consume=False)
+        snapshot.publish(DEFAULT_SNAPSHOTS if snapshots is None else snapshots)
+        published = True
+    finally:
+        if not published:
+            snapshot.discard()
+    shutil.rmtree(staging)
+    return rewritten
+
+
+def _sync(endpoint,folder,build_params,id_column,start,end,overlap,snapshots,client):
+    """Fetch the dates missing from a stored dataset and merge them into its Hive layout.
+
+    New partitions are first downloaded completely to a staging folder next to the
+    dataset, then merged partition by partition. A failed download leaves the stored
+    data untouched; an interrupted merge is finished by the next sync before anything
+    else is fetched. Snapshotted folders get the merge as a new snapshot; a fetch without
+    new rows publishes nothing. Download manifest entries of rewritten partitions are
+    refreshed, so later incremental downloads keep skipping them.
+    """
+    client = get_client(client)
+    base = client.data_dir / "parquet"
+    root = base / folder
+    staging = base / (folder + STAGING_SUFFIX)
+    keys = [id_column, "date"]
+
+    def merge():
+        if not any(_hasRows(staged) for staged in data_files(staging)):
+            shutil.rmtree(staging)
+            return
+        if snapshots is not None or isSnapshotted(base, folder):
+            rewritten = _publishMerge(base, folder, staging, keys, snapshots)
+        else:
+            rewritten = _mergeStaging(staging, root, keys)
+        path = manifest_path(client.data_dir, "parquet", folder)
+        if rewritten and path.exists():
+            manifest = Manifest(path, currentSnapshot(base, folder) or root)
+            for partitionPath in rewritten:
+                manifest.refresh(partitionPath, manifest.root / partitionPath / "data.parquet")
+            manifest.save()
+
+    if (staging / COMPLETE_MARKER).exists():
+        merge()
+    elif staging.exists():
+        shutil.rmtree(staging)
+
+    last = lastDate(root)
+    fetchFrom = start
+    if last is not None:
+        fetchFrom = max(start, (last + timedelta(days=1 - overlap)).isoformat())
+    if end is None or fetchFrom <= end:
+        getPartitions(
+            endpoint=endpoint,
+            folder=folder + STAGING_SUFFIX,
+            params=build_params(fetchFrom, end),
+            format="parquet",
+            client=client)
+        staging.mkdir(parents=True, exist_ok=True)
+        (staging / COMPLETE_MARKER).touch()
+        merge()
+        if index_path(client.data_dir, "parquet", folder).exists():
+            updateIndex(folder, client=client)
+
+    return str((currentSnapshot(base, folder) or root) / "**/*.parquet")
+
+
+def syncTimeseries(start='2019-01-01',end=None,ccy='eur',overlap=0,client=None,snapshots=None):
+    """Bring the stored timeseries of a currency up to date, fetching only missing dates.
+
+    The latest date stored under ``TRACK_API_STORAGE`` is read first and only rows from
+    the next day on are requested. When nothing is stored yet, the whole range from
+    ``start`` is downloaded. New rows are merged into the parquet Hive layout written by
+    ``downloadTimeseries``, de-duplicated on ``(id, date)``: a stored row is replaced by
+    a new row with the same id and date.
+
+    Args:
+        start (str, optional): First date of the history, in ``YYYY-MM-DD`` format.
+        end (str | None, optional): Last date (inclusive), in ``YYYY-MM-DD`` format.
+        ccy (str, optional): Currency code.
+        overlap (int, optional): Number of already stored days to fetch again, to pick up
+            restatements of recent values.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        snapshots (int | None, optional): Merge the new rows into a new snapshot of the
+            folder, published atomically once merged, and keep that many previous
+            snapshots. Folders already published as snapshots are always synced this
+            way. The returned pattern then points into the new snapshot. See
+            ``partitions.getPartitions``.
+
+    Returns:
+        str: Glob pattern pointing to the stored files.
+    """
+    return _sync(
+        "timeseries",
+        ccy+"_timeseries",
+        lambda start, end: build_timeseries_params(start=start, end=end, ccy=ccy),
+        "id",
+        start,
+        end,
+        overlap,
+        snapshots,
+        client)
+
+
+def syncLiquidity(start='2019-01-01',end=None,ccy='eur',overlap=0,client=None,snapshots=None):
+    """Bring the stored liquidity of a currency up to date, fetching only missing dates.
+
+    Same behaviour as ``syncTimeseries``, on the layout written by ``downloadLiquidity``;
+    rows are de-duplicated on ``(share_id, date)``.
+
+    Args:
+        start (str, optional): First date of the history, in ``YYYY-MM-DD`` format.
+        end (str | None, optional): Last date (inclusive), in ``YYYY-MM-DD`` format.
+        ccy (str, optional): Currency code.
+        overlap (int, optional): Number of already stored days to fetch again.
+        client (Client | None, optional): Client to use. Defaults to the shared client.
+        snapshots (int | None, optional): Merge the new rows into a new snapshot of the
+            folder, published atomically once merged, and keep that many previous
+            snapshots. Folders already published as snapshots are always synced this
+            way. The returned pattern then points into the new snapshot. See
+            ``partitions.getPartitions``.
+
+    Returns:
+        str: Glob pattern pointing to the stored files.
+    """
+    return _sync(
+        "liquidity",
+        ccy+"_liquidity",
+        lambda start, end: build_liquidity_params(start=start, end=end, ccy=ccy),
+        "share_id",
+        start,
+        end,
+        overlap,
+        snapshots,
+        client)
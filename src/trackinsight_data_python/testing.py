@@ -0,0 +1,269 @@
+"""Local stand-in for the Trackinsight API, for offline tests and benchmarks."""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import polars as pl
+
+DATED_ENDPOINTS = {"timeseries", "liquidity", "liquidity_summary"}
+
+
+class MockServer:
+    """Serve synthetic ``partitions/<endpoint>`` and ``data/<endpoint>`` responses.
+
+    Every endpoint is split into ``partitions`` partitions keyed by ``mod_<partitions>``
+    (``mod_20`` by default, like the real API); share ``i`` lives in partition
+    ``i % partitions``. Reports partitions also carry a
+    ``stamp`` key and holdings partitions ``year``/``month`` keys, like the real API.
+    The ``ids``, ``from``, ``to`` and ``format`` params are honoured, and data responses
+    carry an ``ETag`` that answers ``If-None-Match`` with ``304``, and ``Range`` requests
+    guarded by a matching ``If-Range`` are answered with ``206``. Encoded bodies are
+    kept in memory, so repeated requests measure the client rather than the server.
+
+    Args:
+        partitions (int, optional): Number of partitions per endpoint.
+        shares (int, optional): Number of share IDs in the universe.
+        days (int, optional): Number of daily rows per share for dated endpoints.
+        stamps (list[str] | None, optional): Report stamps listed by ``partitions/reports``.
+        transactionId (str, optional): Transaction returned by partition listings.
+        columns (int, optional): Number of extra float columns, to grow the rows.
+        latency (float, optional): Seconds waited before answering each data request.
+        error_rate (float, optional): Share of data requests answered with ``error_status``.
+        error_status (int, optional): Status of the random errors.
+        seed (int | None, optional): Seed of the random errors.
+        ranges (bool, optional): Whether data requests accept ``Range`` requests.
+
+    Attributes:
+        requests (list[str]): Path and query of every request received.
+        resumed (list[tuple[str, int]]): Path and first byte of every ``206`` response.
+    """
+
+    def __init__(self, partitions=20, shares=100, days=10, stamps=None, transactionId="tx-1",
+                 columns=0, latency=0.0, error_rate=0.0, error_status=503, seed=None, ranges=True):
+        self.partitions = partitions
+        self.shares = shares
+        self.days = days
+        self.stamps = ["2024-01-31"] if stamps is None else stamps
+        self.transactionId = transactionId
+        self.columns = columns
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.ranges = ranges
+        self.requests = []
+        self.resumed = []
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._bodies = {}
+        self._failures = []
+        self._interruptions = []
+        self._server = None
+
+    @property
+    def key(self):
+        """Name of the partition key derived from the share id."""
+        return f"mod_{self.partitions}"
+
+    @property
+    def url(self):
+        """Base URL to use as ``TRACK_API_HOST`` or ``Client(host=...)``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self):
+        """Start serving on a free local port in a background thread."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail(self, status, times=1, match="/data/", headers=None):
+        """Answer the next ``times`` requests whose path contains ``match`` with ``status``.
+
+        Args:
+            status (int): HTTP status of the failed responses.
+            times (int, optional): Number of requests to fail.
+            match (str, optional): Substring of the request path to fail.
+            headers (dict | None, optional): Extra response headers, e.g. ``Retry-After``.
+
+        Returns:
+            MockServer: The server, for chaining.
+        """
+        with self._lock:
+            self._failures.append({"status": status, "times": times, "match": match, "headers": headers or {}})
+        return self
+
+    def interrupt(self, times=1, match="/data/", after=0.5):
+        """Close the connection midway through the body of the next ``times`` matching responses.
+
+        Args:
+            times (int, optional): Number of responses to interrupt.
+            match (str, optional): Substring of the request path to interrupt.
+            after (float, optional): Share of the body sent before closing.
+
+        Returns:
+            MockServer: The server, for chaining.
+        """
+        with self._lock:
+            self._interruptions.append({"times": times, "match": match, "after": after})
+        return self
+
+    def listing(self, endpoint, params):
+        """Return the partition list served by ``partitions/<endpoint>``."""
+        keys = [{self.key: i} for i in range(self.partitions)]
+        if endpoint == "reports":
+            stamps = [params["stamp"]] if params.get("stamp") else self.stamps
+            return [{"stamp": stamp} | key for stamp in stamps for key in keys]
+        if endpoint == "holdings":
+            return [{"year": 2024, "month": 1} | key for key in keys]
+        return keys
+
+    def frame(self, endpoint, params):
+        """Return the rows served by ``data/<endpoint>`` for one partition."""
+        mod = int(params.get(self.key, 0))
+        ids = [i for i in range(self.shares) if i % self.partitions == mod]
+        if params.get("ids"):
+            wanted = {int(i) for i in params["ids"].split(",")}
+            ids = [i for i in ids if i in wanted]
+
+        if endpoint in DATED_ENDPOINTS:
+            first = date(2024, 1, 1)
+            dates = [(first + timedelta(days=d)).isoformat() for d in range(self.days)]
+            if params.get("from"):
+                dates = [d for d in dates if d >= params["from"]]
+            if params.get("to"):
+                dates = [d for d in dates if d <= params["to"]]
+        else:
+            dates = [params.get("stamp", self.stamps[-1])]
+
+        rows = [(i, d) for i in ids for d in dates]
+        frame = pl.DataFrame(
+            {
+                "share_id": [i for i, d in rows],
+                "id": [i for i, d in rows],
+                "date": [d for i, d in rows],
+                "value": [float(i) + n / 100 for n, (i, d) in enumerate(rows)],
+                "ccy": [params.get("ccy", "eur")] * len(rows),
+            },
+            schema={"share_id": pl.Int64, "id": pl.Int64, "date": pl.String, "value": pl.Float64, "ccy": pl.String},
+        )
+        if self.columns:
+            frame = frame.with_columns(
+                (pl.col("value") * (c + 2)).alias(f"metric_{c}") for c in range(self.columns))
+        return frame
+
+    def body(self, endpoint, params):
+        """Encode the rows of one partition in the requested ``format``."""
+        key = (endpoint, tuple(sorted((k, v) for k, v in params.items() if k != "transactionId")))
+        with self._lock:
+            cached = self._bodies.get(key)
+        if cached is None:
+            cached = self._encode(endpoint, params)
+            with self._lock:
+                self._bodies[key] = cached
+        return cached
+
+    def _encode(self, endpoint, params):
+        frame = self.frame(endpoint, params)
+        format = params.get("format", "parquet")
+        if format == "json":
+            return json.dumps({"result": frame.to_dicts()}).encode(), "application/json"
+        if format == "csv":
+            return frame.write_csv().encode(), "text/csv"
+        buffer = BytesIO()
+        frame.write_parquet(buffer)
+        return buffer.getvalue(), "application/octet-stream"
+
+    def _handle(self, handler):
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/").split("/")[-1]
+        with self._lock:
+            self.requests.append(handler.path)
+            failure = next((f for f in self._failures if f["times"] > 0 and f["match"] in handler.path), None)
+            if failure is not None:
+                failure["times"] -= 1
+            elif "/data/" in url.path and self.error_rate and self._random.random() < self.error_rate:
+                failure = {"status": self.error_status, "headers": {"Retry-After": "0"}}
+        if "/data/" in url.path and self.latency:
+            time.sleep(self.latency)
+        if failure is not None:
+            self._send(handler, failure["status"], b"mock failure", "text/plain", failure["headers"])
+            return
+
+        if "/partitions/" in url.path:
+            payload = {"result": {"transactionId": self.transactionId, "partitions": self.listing(endpoint, params)}}
+            self._send(handler, 200, json.dumps(payload).encode(), "application/json")
+            return
+
+        body, content_type = self.body(endpoint, params)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if handler.headers.get("If-None-Match") == etag:
+            self._send(handler, 304, b"", content_type, {"ETag": etag})
+            return
+        headers = {"ETag": etag}
+        status = 200
+        requested = re.fullmatch(r"bytes=(\d+)-", handler.headers.get("Range", ""))
+        if self.ranges:
+            headers["Accept-Ranges"] = "bytes"
+            if requested and handler.headers.get("If-Range", etag) == etag:
+                start = int(requested.group(1))
+                if start >= len(body):
+                    self._send(handler, 416, b"", content_type, {"Content-Range": f"bytes */{len(body)}"})
+                    return
+                headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                status, body = 206, body[start:]
+                with self._lock:
+                    self.resumed.append((handler.path, start))
+        with self._lock:
+            interruption = next((i for i in self._interruptions if i["times"] > 0 and i["match"] in handler.path), None)
+            if interruption is not None:
+                interruption["times"] -= 1
+        self._send(handler, status, body, content_type, headers,
+                   sent=None if interruption is None else int(len(body) * interruption["after"]))
+
+    def _send(self, handler, status, body, content_type, headers=None, sent=None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        if sent is None:
+            handler.wfile.write(body)
+        else:
+            handler.wfile.write(body[:sent])
+            handler.wfile.flush()
+            handler.close_connection = True
@@ -0,0 +1,16 @@
+import pytest
+
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.testing import MockServer
+
+
+@pytest.fixture
+def mock_server():
+    with MockServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server, tmp_path):
+    with Client(key="test", host=mock_server.url, storage=tmp_path, max_workers=4, cache=False) as client:
+        yield client
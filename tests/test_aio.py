@@ -0,0 +1,103 @@
+import asyncio
+import glob
+import os
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from trackinsight_data_python import aio, api
+from trackinsight_data_python.download import downloadShares
+from trackinsight_data_python.manifest import Manifest, manifest_path
+from trackinsight_data_python._params import build_shares_params
+from trackinsight_data_python.snapshots import currentSnapshot
+
+
+def _run(coroutine_factory, mock_server, tmp_path):
+    async def main():
+        async with aio.AsyncClient(key="test", host=mock_server.url, storage=tmp_path, max_workers=4, cache=False) as client:
+            return await coroutine_factory(client)
+
+    return asyncio.run(main())
+
+
+def test_async_loader_matches_sync_loader(mock_server, mock_client, tmp_path):
+    expected = api.getReports(ids=[1, 2, 3], client=mock_client).sort("share_id")
+    result = _run(lambda client: aio.getReports(ids=[1, 2, 3], client=client), mock_server, tmp_path)
+
+    assert result.sort("share_id").equals(expected)
+
+
+def test_async_loaders_fan_out_on_one_loop(mock_server, tmp_path):
+    async def load(client):
+        return await asyncio.gather(
+            aio.getTimeseries(start="2024-01-03", end="2024-01-05", ids=[5], client=client),
+            aio.getHoldings(client=client),
+            aio.getMetadata(client=client),
+        )
+
+    timeseries, holdings, metadata = _run(load, mock_server, tmp_path)
+
+    assert timeseries["date"].to_list() == ["2024-01-03", "2024-01-04", "2024-01-05"]
+    assert holdings.height == mock_server.shares
+    assert metadata["reportsAsOf"]["eur"] == mock_server.stamps
+
+
+def test_async_download_is_incremental(mock_server, tmp_path):
+    pattern = _run(lambda client: aio.downloadShares(client=client), mock_server, tmp_path)
+    mock_server.requests.clear()
+    _run(lambda client: aio.downloadShares(client=client), mock_server, tmp_path)
+
+    assert len(list(tmp_path.glob("parquet/shares/**/*.parquet"))) == mock_server.partitions
+    assert pattern.endswith("shares/**/*.parquet")
+    assert [r for r in mock_server.requests if "/data/" in r] == []
+
+
+def test_async_download_publishes_snapshots(mock_server, mock_client, tmp_path):
+    base = tmp_path / "parquet"
+    first = downloadShares(client=mock_client, snapshots=1)
+    before = sorted(glob.glob(first, recursive=True))
+
+    mock_server.transactionId = "tx-2"
+    mock_server.fail(404, times=1, match="/data/shares")
+    with pytest.raises(aiohttp.ClientResponseError):
+        _run(lambda client: aio.downloadShares(client=client), mock_server, tmp_path)
+    # The failed download never touched the published snapshot.
+    assert currentSnapshot(base, "shares").name == "tx-1"
+    assert sorted(glob.glob(first, recursive=True)) == before
+    assert os.listdir(base / "shares.snapshots") == ["tx-1"]
+
+    pattern = _run(lambda client: aio.downloadShares(client=client), mock_server, tmp_path)
+    assert currentSnapshot(base, "shares").name == "tx-2"
+    assert "tx-2" in pattern
+    assert len(glob.glob(pattern, recursive=True)) == mock_server.partitions
+    assert sorted(glob.glob(first, recursive=True)) == before
+
+
+def test_async_server_error_carries_the_body(mock_server, tmp_path):
+    mock_server.fail(500, times=1, match="/data/shares")
+    with pytest.raises(aiohttp.ClientResponseError, match="mock failure") as error:
+        _run(lambda client: aio.getShares(client=client), mock_server, tmp_path)
+    assert error.value.status == 500
+
+
+def test_async_download_completes_the_manifest(mock_server, mock_client, tmp_path):
+    _run(lambda client: aio.downloadShares(client=client), mock_server, tmp_path)
+    mock_server.requests.clear()
+    pattern = downloadShares(client=mock_client)
+
+    manifest = Manifest(manifest_path(tmp_path, "parquet", "shares"), tmp_path / "parquet" / "shares")
+    assert len(manifest.completed(build_shares_params(), "parquet")) == mock_server.partitions
+    assert [r for r in mock_server.requests if "/data/" in r] == []
+    assert len(glob.glob(pattern, recursive=True)) == mock_server.partitions
+
+
+def test_async_client_closes_its_session_when_the_loop_changes(mock_server, tmp_path):
+    client = aio.AsyncClient(key="test", host=mock_server.url, storage=tmp_path, max_workers=4, cache=False)
+    first = asyncio.run(aio.getMetadata(client=client))
+    session = client._session
+    second = asyncio.run(aio.getMetadata(client=client))
+    asyncio.run(client.close())
+
+    assert first == second
+    assert session.closed
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python._params import DEFAULT_REPORT_PERIODS
+from trackinsight_data_python.analytics import PERIOD_STARTS, computeReports, periodStart
+from trackinsight_data_python.api import getTimeseries
+
+DAYS = [date(2023, 1, 2) + timedelta(days=i) for i in range(500)]
+
+
+def _series():
+    # Share 1 grows by one every day; share 2 falls by half then recovers.
+    dip = [100.0 - i / 2 for i in range(100)] + [50.0 + i for i in range(400)]
+    return pl.DataFrame({
+        "id": [1] * 500 + [2] * 500,
+        "date": [d.isoformat() for d in DAYS] * 2,
+        "value": [100.0 + i for i in range(500)] + dip,
+    })
+
+
+def test_period_starts():
+    assert periodStart("one-day", "2024-05-13") == date(2024, 5, 12)
+    assert periodStart("week-to-date", "2024-05-15") == date(2024, 5, 12)
+    assert periodStart("month-to-date", "2024-05-15") == date(2024, 4, 30)
+    assert periodStart("three-month-to-date", "2024-05-15") == date(2024, 2, 29)
+    assert periodStart("year-to-date", "2024-05-15") == date(2023, 12, 31)
+    assert periodStart("one-year", date(2024, 2, 29)) == date(2023, 2, 28)
+    assert set(DEFAULT_REPORT_PERIODS) <= set(PERIOD_STARTS)
+    with pytest.raises(ValueError):
+        periodStart("forever", "2024-05-15")
+
+
+def test_compute_reports_for_many_stamps():
+    reports = computeReports(_series(), stamps=["2024-05-15", "2024-03-15"], periods=["one-week", "year-to-date", "three-year"])
+    assert reports.columns == [
+        "share_id", "stamp", "return_one-week", "return_year-to-date", "return_three-year", "volatility", "max_drawdown",
+    ]
+    assert reports["stamp"].to_list() == [date(2024, 3, 15)] * 2 + [date(2024, 5, 15)] * 2
+
+    row = reports.filter(pl.col("share_id") == 1, pl.col("stamp") == date(2024, 5, 15)).row(0, named=True)
+    last = 100.0 + DAYS.index(date(2024, 5, 15))
+    assert row["return_one-week"] == pytest.approx(last / (last - 7) - 1)
+    assert row["return_year-to-date"] == pytest.approx(last / (100.0 + DAYS.index(date(2023, 12, 31))) - 1)
+    assert row["return_three-year"] is None
+    assert row["max_drawdown"] == 0.0
+    assert row["volatility"] > 0
+
+
+def test_max_drawdown_uses_the_risk_period():
+    reports = computeReports(_series(), stamps=["2023-06-01", "2024-12-31"], periods=["one-day"])
+    drawdowns = dict(reports.filter(pl.col("share_id") == 2).select("stamp", "max_drawdown").rows())
+    assert drawdowns[date(2023, 6, 1)] == pytest.approx(50.0 / 100.0 - 1, abs=0.01)
+    assert drawdowns[date(2024, 12, 31)] == 0.0
+
+
+def test_compute_reports_from_loaded_timeseries(mock_client):
+    timeseries = getTimeseries(ccy="usd", client=mock_client)
+    reports = computeReports(timeseries, periods=["one-day"], returnColumn="{period}")
+    assert reports.height == timeseries["id"].n_unique()
+    assert reports["stamp"].unique().to_list() == [date(2024, 1, 10)]
+    assert reports["one-day"].null_count() == 0
+
+
+def test_risk_windows_match_a_direct_computation():
+    series = _series()
+    stamps = [DAYS[0] + timedelta(days=i) for i in range(0, 520, 9)]
+    reports = computeReports(series, stamps=stamps, periods=["one-day"], riskPeriod="three-month-to-date")
+
+    values = series.with_columns(pl.col("date").str.to_date())
+    for share_id, stamp, volatility, drawdown in reports.select("share_id", "stamp", "volatility", "max_drawdown").rows():
+        rows = (
+            values.filter(pl.col("id") == share_id)
+            .with_columns((pl.col("value") / pl.col("value").shift(1) - 1).alias("daily"))
+            .filter(pl.col("date") > periodStart("three-month-to-date", stamp), pl.col("date") <= stamp)
+        )
+        if rows.height == 0:
+            assert volatility is None and drawdown is None
+            continue
+        assert drawdown == pytest.approx((rows["value"] / rows["value"].cum_max() - 1).min())
+        expected = rows["daily"].std()
+        assert volatility == (None if expected is None else pytest.approx(expected * 252 ** 0.5))
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from trackinsight_data_python import benchmark
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.partitions import getPartitions
+from trackinsight_data_python.retry import PartitionsError
+from trackinsight_data_python.testing import MockServer
+
+
+def test_benchmark_writes_comparable_results(tmp_path):
+    output = tmp_path / "bench.json"
+    scenarios = benchmark.scenarios(workers=[2], formats=["parquet", "csv"], modes=["memory", "disk"])
+    report = benchmark.run(
+        scenarios,
+        server={"partitions": 3, "shares": 30, "days": 5, "error_rate": 0.2, "seed": 1},
+        repeat=1,
+        isolate=False,
+        output=output,
+    )
+
+    assert [r["id"] for r in report["results"]] == [
+        "timeseries/parquet/memory/w2",
+        "timeseries/parquet/disk/w2",
+        "timeseries/csv/disk/w2",
+    ]
+    memory = report["results"][0]
+    assert memory["rows"] == 30 * 5
+    assert memory["mb_per_s"] > 0 and memory["cpu_s"] >= 0
+    assert json.loads(output.read_text()) == report
+
+    ratios = benchmark.compare(report, report)
+    assert {row["wall_ratio"] for row in ratios} == {1.0}
+
+
+def test_mock_server_latency_and_errors(tmp_path):
+    with MockServer(partitions=2, latency=0.05, error_rate=1.0, error_status=503) as server:
+        with Client(key="test", host=server.url, storage=tmp_path, cache=False, retries=1, backoff=0) as client:
+            with pytest.raises(PartitionsError) as excinfo:
+                getPartitions("shares", client=client)
+    assert len(excinfo.value.failures) == 2
+    assert all(failure["attempts"] == 2 for failure in excinfo.value.failures)
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from trackinsight_data_python.cache import Cache
+
+
+def _frame(n):
+    return pl.DataFrame({"share_id": list(range(n)), "value": [float(i) for i in range(n)]})
+
+
+def test_cache_reads_through_once(tmp_path):
+    cache = Cache(tmp_path)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return _frame(10)
+
+    params = {"stamp": "2024-01-31", "ccy": "eur", "ids": None}
+    first = cache.fetch("reports", params, loader, immutable=True)
+    second = Cache(tmp_path).fetch("reports", {"ccy": "eur", "stamp": "2024-01-31"}, loader, immutable=True)
+
+    assert len(calls) == 1
+    assert first.equals(second)
+
+
+def test_cache_expires_open_ended_entries(tmp_path):
+    cache = Cache(tmp_path, ttl=0)
+    cache.put("holdings", {"level": 0}, _frame(3))
+    cache.put("reports", {"stamp": "2024-01-31"}, _frame(3), immutable=True)
+
+    assert cache.get("holdings", {"level": 0}) is None
+    assert cache.get("reports", {"stamp": "2024-01-31"}) is not None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    _frame(1000).write_parquet(tmp_path / "probe.parquet")
+    entry_bytes = (tmp_path / "probe.parquet").stat().st_size
+    cache = Cache(tmp_path / "lru", max_bytes=int(entry_bytes * 2.5))
+
+    cache.put("a", {}, _frame(1000))
+    cache.put("b", {}, _frame(1000))
+    assert cache.get("a", {}) is not None
+    cache.put("c", {}, _frame(1000))
+
+    assert cache.get("b", {}) is None
+    assert cache.get("a", {}) is not None
+    assert cache.get("c", {}) is not None
+
+
+def test_caches_sharing_a_folder_share_the_byte_budget(tmp_path):
+    _frame(1000).write_parquet(tmp_path / "probe.parquet")
+    entry_bytes = (tmp_path / "probe.parquet").stat().st_size
+    first = Cache(tmp_path / "shared", max_bytes=int(entry_bytes * 2.5))
+    second = Cache(tmp_path / "shared", max_bytes=int(entry_bytes * 2.5))
+
+    first.put("a", {}, _frame(1000))
+    second.put("b", {}, _frame(1000))
+    assert first.get("b", {}) is not None
+    second.put("c", {}, _frame(1000))
+
+    # The entry stored by the other instance was counted and evicted first.
+    assert first.get("a", {}) is None
+    assert second.get("b", {}) is not None
+    assert len(list((tmp_path / "shared").iterdir())) == 2
+
+
+def test_cache_reads_do_not_rewrite_the_folder(tmp_path):
+    cache = Cache(tmp_path)
+    cache.put("reports", {"stamp": "2024-01-31"}, _frame(3), immutable=True)
+    before = sorted((path.name, path.stat().st_mtime_ns) for path in tmp_path.iterdir())
+
+    assert cache.get("reports", {"stamp": "2024-01-31"}).equals(_frame(3))
+    assert sorted((path.name, path.stat().st_mtime_ns) for path in tmp_path.iterdir()) == before
+
+
+def test_concurrent_writers_of_one_key_do_not_collide(tmp_path):
+    cache = Cache(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda n: cache.put("holdings", {"level": 0}, _frame(100)), range(32)))
+
+    assert cache.get("holdings", {"level": 0}).equals(_frame(100))
+    assert [path.suffix for path in tmp_path.iterdir()] == [".parquet"]
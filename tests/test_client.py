@@ -0,0 +1,31 @@
+from trackinsight_data_python.client import Client, get_client, set_client
+
+
+def test_client_resolves_config_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_API_KEY", "secret")
+    monkeypatch.setenv("TRACK_API_HOST", "http://localhost:1234/v2/")
+    monkeypatch.setenv("TRACK_API_DL_WORKERS", "4")
+    storage = tmp_path / "store"
+    monkeypatch.setenv("TRACK_API_STORAGE", str(storage))
+
+    client = Client()
+
+    assert storage.is_dir()
+    assert client.max_workers == 4
+    assert client.session.headers["X-API-KEY"] == "secret"
+    adapter = client.session.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == 4
+    assert client.url("partitions/reports", {"ccy": "usd", "ids": None}) == (
+        "http://localhost:1234/v2/partitions/reports?&ccy=usd"
+    )
+
+
+def test_get_client_prefers_explicit_client(tmp_path):
+    client = Client(key="k", storage=tmp_path, max_workers=2)
+    set_client(client)
+    try:
+        assert get_client() is client
+        other = Client(key="k2", storage=tmp_path)
+        assert get_client(other) is other
+    finally:
+        set_client(None)
@@ -0,0 +1,84 @@
+import os
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python import compact as compact_module
+from trackinsight_data_python.compact import compact, sortColumns
+from trackinsight_data_python.download import downloadTimeseries
+from trackinsight_data_python.snapshots import currentSnapshot
+from trackinsight_data_python.sync import syncTimeseries
+
+
+def test_sort_columns_prefer_share_id_and_date():
+    assert sortColumns({"value": pl.Float64, "date": pl.Date, "share_id": pl.Int64, "id": pl.Int64}) == ["share_id", "date"]
+    assert sortColumns({"id": pl.Int64, "stamp": pl.String}) == ["id", "stamp"]
+
+
+def test_compact_merges_sorts_and_keeps_partitions(mock_client, mock_server):
+    syncTimeseries(start="2024-01-01", end="2024-01-04", client=mock_client)
+    pattern = syncTimeseries(start="2024-01-01", client=mock_client)
+    before = pl.read_parquet(pattern)
+    root = mock_client.data_dir / "parquet" / "eur_timeseries"
+    assert len(list(root.glob("**/*.parquet"))) == 2 * mock_server.partitions
+
+    summary = compact("eur_timeseries", client=mock_client)
+
+    files = sorted(root.glob("**/*.parquet"))
+    assert [f.relative_to(root).as_posix() for f in files] == sorted(
+        f"{mock_server.key}={i}/data.parquet" for i in range(mock_server.partitions)
+    )
+    assert summary["files_before"] == 2 * mock_server.partitions
+    assert summary["files_after"] == mock_server.partitions
+    for f in files:
+        frame = pl.read_parquet(f)
+        assert frame.equals(frame.sort("share_id", "date"))
+    assert pl.read_parquet(pattern).sort("id", "date").equals(before.sort("id", "date"))
+    assert not (mock_client.data_dir / "parquet" / "eur_timeseries.compact").exists()
+
+
+def test_compact_splits_files_and_keeps_incremental_downloads(mock_client, mock_server):
+    downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client)
+    summary = compact("eur_timeseries", client=mock_client)
+    assert summary["files_after"] == mock_server.partitions
+
+    mock_server.requests.clear()
+    downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client)
+    assert [r for r in mock_server.requests if "/data/" in r] == []
+
+    summary = compact("eur_timeseries", targetSize=1000, rowGroupSize=10, client=mock_client)
+    root = mock_client.data_dir / "parquet" / "eur_timeseries"
+    assert summary["files_after"] > mock_server.partitions
+    assert pl.read_parquet(root / "**/*.parquet").height == mock_server.shares * mock_server.days
+
+
+def test_compact_publishes_plain_folder_as_snapshot_without_partial_files(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client)
+    leaf = base / "eur_timeseries" / f"{mock_server.key}=0"
+    (leaf / "data.parquet.part").write_bytes(b"partial")
+    (leaf / "data.parquet.part.resume").write_text("{}")
+    (leaf / "notes.txt").write_text("kept")
+
+    compact("eur_timeseries", client=mock_client)
+
+    assert os.path.islink(base / "eur_timeseries")
+    assert currentSnapshot(base, "eur_timeseries").name == "compact"
+    assert sorted(os.listdir(base / "eur_timeseries" / f"{mock_server.key}=0")) == ["data.parquet", "notes.txt"]
+    assert [p for p in os.listdir(base) if p.startswith(".")] == []
+
+
+def test_failed_compact_leaves_folder_untouched(mock_client, mock_server, monkeypatch):
+    base = mock_client.data_dir / "parquet"
+    pattern = downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client)
+    before = pl.read_parquet(pattern)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(compact_module, "_writeLeaf", fail)
+    with pytest.raises(OSError, match="disk full"):
+        compact("eur_timeseries", client=mock_client)
+    assert not os.path.islink(base / "eur_timeseries")
+    assert pl.read_parquet(pattern).equals(before)
+    assert os.listdir(base / "eur_timeseries.snapshots") == []
@@ -0,0 +1,36 @@
+import logging
+
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.events import Metrics, log_event
+from trackinsight_data_python.partitions import getPartitions
+
+
+def test_metrics_collects_partition_and_summary_events(mock_server, tmp_path):
+    metrics = Metrics()
+    with Client(key="test", host=mock_server.url, storage=tmp_path, max_workers=4, cache=False, events=metrics) as client:
+        mock_server.fail(503, times=1, headers={"Retry-After": "0"})
+        data = getPartitions("timeseries", params={"ccy": "usd"}, client=client)
+
+    assert len(metrics.partitions) == mock_server.partitions
+    assert sum(event["retries"] for event in metrics.partitions) == 1
+    assert sum(event["rows"] for event in metrics.partitions) == data.height
+    for event in metrics.partitions:
+        assert event["bytes"] > 0
+        assert min(event["queue_wait"], event["ttfb"], event["download"], event["decode"]) >= 0
+
+    [summary] = metrics.summaries
+    assert summary["rows"] == data.height
+    assert summary["bytes"] == sum(event["bytes"] for event in metrics.partitions)
+    assert summary["failed"] == 0
+    assert metrics.frame().height == mock_server.partitions
+
+
+def test_events_are_silent_by_default(mock_client, mock_server, capsys, caplog):
+    assert mock_client.events is log_event
+    with caplog.at_level(logging.INFO, logger="trackinsight_data_python"):
+        getPartitions("shares", client=mock_client)
+
+    assert capsys.readouterr().out == ""
+    [record] = caplog.records
+    assert record.event["event"] == "summary"
+    assert record.getMessage().startswith(f"loaded shares: {mock_server.partitions} partitions")
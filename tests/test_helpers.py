@@ -0,0 +1,65 @@
+import polars as pl
+import pytest
+
+from trackinsight_data_python.helpers import (
+    ListIndex,
+    contains_all,
+    contains_any,
+    contains_any_joined,
+    contains_exact,
+    single_among,
+)
+
+THEMES = pl.DataFrame({
+    "share_id": range(8),
+    "class_theme": [["ai", "robotics"], ["ai"], None, [], ["water", "ai", "robotics"], ["robotics", "ai"], ["ai", "ai"], ["water"]],
+})
+
+QUERIES = [
+    (contains_any, ["ai"]),
+    (contains_any, ["unknown"]),
+    (contains_all, ["ai", "robotics"]),
+    (contains_all, []),
+    (single_among, ["ai", "water"]),
+    (contains_exact, ["robotics", "ai"]),
+    (contains_exact, ["ai", "unknown"]),
+    (contains_exact, []),
+    (contains_any_joined, ["ai;robotics", "water"]),
+]
+
+
+@pytest.mark.parametrize("helper,values", QUERIES)
+def test_index_matches_expressions(helper, values):
+    index = ListIndex(THEMES, "class_theme")
+    expected = THEMES.select(helper("class_theme", values)).to_series()
+    indexed = THEMES.select(helper("class_theme", values, index=index)).to_series()
+    assert indexed.to_list() == expected.to_list()
+    assert THEMES.filter(helper("class_theme", values, index=index)).equals(THEMES.filter(helper("class_theme", values)))
+
+
+def test_index_rejects_other_columns():
+    index = ListIndex(THEMES, "class_theme")
+    with pytest.raises(ValueError, match="class_theme"):
+        contains_any("other_theme", ["ai"], index=index)
+
+
+def test_index_selects_rows_of_derived_frames():
+    index = ListIndex(THEMES, "class_theme")
+    derived = [
+        THEMES.sort("share_id", descending=True),
+        THEMES.filter(pl.col("share_id") > 3),
+        THEMES.sample(fraction=1.0, shuffle=True, seed=1),
+    ]
+    for frame in derived:
+        for helper, values in QUERIES:
+            expected = frame.filter(helper("class_theme", values))
+            assert frame.filter(helper("class_theme", values, index=index)).equals(expected)
+
+
+def test_index_needs_a_unique_key():
+    with pytest.raises(ValueError, match="pass key"):
+        ListIndex(THEMES.drop("share_id"), "class_theme")
+    with pytest.raises(ValueError, match="unique"):
+        ListIndex(pl.concat([THEMES, THEMES]), "class_theme")
+    index = ListIndex(THEMES.rename({"share_id": "isin"}), "class_theme", key="isin")
+    assert THEMES.rename({"share_id": "isin"}).filter(contains_any("class_theme", ["water"], index=index))["isin"].to_list() == [4, 7]
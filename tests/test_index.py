@@ -0,0 +1,44 @@
+import polars as pl
+import pytest
+
+from trackinsight_data_python.compact import compact
+from trackinsight_data_python.download import downloadReports, downloadTimeseries
+from trackinsight_data_python.index import index_path, loadIndexed, updateIndex
+from trackinsight_data_python.sync import syncTimeseries
+
+
+def test_download_builds_index_for_point_lookups(mock_client, mock_server):
+    pattern = downloadReports(stamp="2024-01-31", client=mock_client)
+    assert index_path(mock_client.data_dir, "parquet", "eur_reports").exists()
+
+    data = loadIndexed("eur_reports", [3, 42, 10_000], client=mock_client)
+    expected = pl.read_parquet(pattern, hive_partitioning=False).filter(pl.col("share_id").is_in([3, 42]))
+    assert data.sort("share_id").equals(expected.sort("share_id"))
+    assert loadIndexed("eur_reports", [10_000], client=mock_client) is None
+    assert loadIndexed("eur_reports", [3], columns=["share_id", "value"], client=mock_client).columns == ["share_id", "value"]
+
+
+def test_index_is_updated_incrementally(mock_client, mock_server, monkeypatch):
+    syncTimeseries(start="2024-01-01", end="2024-01-05", client=mock_client)
+    updateIndex("eur_timeseries", client=mock_client)
+    syncTimeseries(start="2024-01-01", client=mock_client)
+
+    data = loadIndexed("eur_timeseries", [5], client=mock_client)
+    assert data["date"].to_list() == [f"2024-01-{d:02d}" for d in range(1, 11)]
+
+    from trackinsight_data_python import index
+    read = []
+    original = index._indexFile
+    monkeypatch.setattr(index, "_indexFile", lambda *args: read.append(args[1]) or original(*args))
+    updateIndex("eur_timeseries", client=mock_client)
+    assert read == []
+
+    compact("eur_timeseries", client=mock_client)
+    assert len(read) == mock_server.partitions
+    assert loadIndexed("eur_timeseries", [5], client=mock_client).height == mock_server.days
+
+
+def test_load_indexed_requires_index(mock_client):
+    downloadTimeseries("2024-01-01", "2024-01-02", client=mock_client, index=False)
+    with pytest.raises(FileNotFoundError):
+        loadIndexed("eur_timeseries", [1], client=mock_client)
@@ -0,0 +1,73 @@
+import glob
+import json
+
+import pytest
+
+from trackinsight_data_python import benchmark, local
+from trackinsight_data_python.client import Client, resolve_config
+from trackinsight_data_python.download import downloadReports, downloadTimeseries
+from trackinsight_data_python.index import loadIndexed
+from trackinsight_data_python.local import loadLocal, readFile
+
+
+def test_ipc_download_matches_parquet(mock_client, mock_server):
+    pattern = downloadReports(stamp="2024-01-31", ccy="usd", format="ipc", client=mock_client)
+    files = glob.glob(pattern, recursive=True)
+    assert len(files) == mock_server.partitions
+    assert all(path.endswith("/data.ipc") for path in files)
+
+    downloadReports(stamp="2024-01-31", ccy="usd", client=mock_client)
+    ipc = loadLocal("usd_reports", format="ipc", memoryMap=False, client=mock_client)
+    parquet = loadLocal("usd_reports", client=mock_client)
+    assert ipc.sort("share_id").equals(parquet.sort("share_id"))
+    assert loadLocal("usd_reports", format="ipc", ids=[3], client=mock_client)["share_id"].to_list() == [3]
+    assert loadLocal("eur_reports", format="ipc", client=mock_client) is None
+
+    # Unchanged partitions are known from the manifest and not fetched again.
+    requests = len(mock_server.requests)
+    downloadReports(stamp="2024-01-31", ccy="usd", format="ipc", client=mock_client)
+    assert len(mock_server.requests) == requests + 1
+
+
+def test_ipc_is_indexed(mock_client, mock_server):
+    downloadTimeseries(start="2024-01-01", end="2024-01-05", format="ipc", client=mock_client)
+    data = loadIndexed("eur_timeseries", [5], format="ipc", memoryMap=False, client=mock_client)
+    assert data["date"].to_list() == [f"2024-01-{d:02d}" for d in range(1, 6)]
+
+
+def test_ipc_compression_is_configurable(mock_server, tmp_path):
+    with Client(key="test", host=mock_server.url, storage=tmp_path, cache=False, ipc_compression="lz4") as client:
+        pattern = downloadReports(stamp="2024-01-31", format="ipc", client=client)
+        frame = readFile(glob.glob(pattern, recursive=True)[0], "ipc", memoryMap=False)
+        assert frame.height > 0
+    with pytest.raises(ValueError, match="ipc_compression"):
+        resolve_config(key="test", ipc_compression="zstd")
+
+
+@pytest.mark.skipif(local.pyarrow is not None, reason="pyarrow is installed")
+def test_memory_map_requires_pyarrow(mock_client, mock_server):
+    downloadReports(stamp="2024-01-31", format="ipc", client=mock_client)
+    with pytest.raises(ImportError, match="pyarrow"):
+        loadLocal("eur_reports", format="ipc", memoryMap=True, client=mock_client)
+    # Without pyarrow, the default reads the files.
+    assert loadLocal("eur_reports", format="ipc", client=mock_client).height == mock_server.shares
+
+
+def test_memory_mapped_load(mock_client, mock_server):
+    pytest.importorskip("pyarrow")
+    downloadReports(stamp="2024-01-31", format="ipc", client=mock_client)
+    mapped = loadLocal("eur_reports", format="ipc", columns=["share_id", "value"], memoryMap=True, client=mock_client)
+    read = loadLocal("eur_reports", format="ipc", columns=["share_id", "value"], memoryMap=False, client=mock_client)
+    assert mapped.equals(read)
+
+
+def test_local_benchmark(tmp_path):
+    report = benchmark.run_local(
+        benchmark.local_scenarios(formats=["parquet", "ipc-lz4"], processes=[1]),
+        server={"partitions": 2, "shares": 20, "days": 5},
+        repeat=1,
+        output=tmp_path / "local.json",
+    )
+    assert [r["id"] for r in report["results"]] == ["timeseries/parquet/local/p1", "timeseries/ipc-lz4/local/p1"]
+    assert all(r["rows"] == 20 * 5 and r["bytes"] > 0 for r in report["results"])
+    assert json.loads((tmp_path / "local.json").read_text()) == report
@@ -0,0 +1,81 @@
+import logging
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python.lookthrough import lookThrough
+
+# Share 1 holds ETF 2 and a stock; ETF 2 holds ETF 3 and a stock; ETF 3 holds one stock.
+HOLDINGS = pl.DataFrame(
+    {
+        "share_id": [1, 1, 2, 2, 3],
+        "holding": ["ETF 2", "AAA", "ETF 3", "BBB", "CCC"],
+        "holding_share_id": [2, None, 3, None, None],
+        "weight": [0.5, 0.5, 0.4, 0.6, 1.0],
+    },
+    schema_overrides={"holding_share_id": pl.Int32},
+)
+
+
+def _weights(frame, share):
+    rows = frame.filter(pl.col("share_id") == share).select("holding", "weight").rows()
+    return {holding: pytest.approx(weight) for holding, weight in rows}
+
+
+def test_level_zero_returns_holdings():
+    assert lookThrough(HOLDINGS, level=0) is HOLDINGS
+
+
+def test_level_one_expands_held_etfs_once():
+    expanded = lookThrough(HOLDINGS, level=1)
+    assert expanded.columns == HOLDINGS.columns
+    assert _weights(expanded, 1) == {"AAA": 0.5, "ETF 3": 0.2, "BBB": 0.3}
+    assert _weights(expanded, 2) == {"CCC": 0.4, "BBB": 0.6}
+
+
+def test_recursive_expansion_keeps_total_weight():
+    expanded = lookThrough(HOLDINGS, level=2)
+    assert _weights(expanded, 1) == {"AAA": 0.5, "BBB": 0.3, "CCC": 0.2}
+    assert expanded.group_by("share_id").agg(pl.col("weight").sum()).sort("share_id")["weight"].to_list() == pytest.approx([1.0, 1.0, 1.0])
+    assert expanded["holding_share_id"].null_count() == expanded.height
+
+
+def test_group_by_sums_holdings_reached_through_several_paths():
+    holdings = pl.concat([HOLDINGS, pl.DataFrame({"share_id": [1], "holding": ["CCC"], "holding_share_id": [None], "weight": [0.1]},
+                                                 schema=HOLDINGS.schema)])
+    expanded = lookThrough(holdings, groupBy=["holding"])
+    assert _weights(expanded, 1)["CCC"] == pytest.approx(0.3)
+    assert expanded.filter(pl.col("share_id") == 1).height == 3
+
+
+def test_percent_weights():
+    holdings = HOLDINGS.with_columns(pl.col("weight") * 100)
+    expanded = lookThrough(holdings, weightScale=100)
+    assert _weights(expanded, 1) == {"AAA": 50.0, "BBB": 30.0, "CCC": 20.0}
+
+
+def test_cycles_raise_or_are_kept():
+    cyclic = pl.DataFrame({
+        "share_id": [1, 2, 2],
+        "holding": ["ETF 2", "ETF 1", "AAA"],
+        "holding_share_id": [2, 1, None],
+        "weight": [1.0, 0.5, 0.5],
+    })
+    with pytest.raises(ValueError, match="cycle"):
+        lookThrough(cyclic)
+    kept = lookThrough(cyclic, onCycle="keep")
+    assert _weights(kept, 1) == {"ETF 1": 0.5, "AAA": 0.5}
+
+
+def test_iterations_are_capped(caplog):
+    chain = pl.DataFrame({
+        "share_id": list(range(10)),
+        "holding": [f"ETF {i + 1}" for i in range(10)],
+        "holding_share_id": list(range(1, 10)) + [None],
+        "weight": [1.0] * 10,
+    })
+    with caplog.at_level(logging.WARNING, logger="trackinsight_data_python"):
+        expanded = lookThrough(chain, maxIterations=3)
+    assert expanded.filter(pl.col("share_id") == 0)["holding"].to_list() == ["ETF 4"]
+    assert "stopped after 3 iterations" in caplog.text
+    assert lookThrough(chain).filter(pl.col("share_id") == 0)["holding"].to_list() == ["ETF 10"]
@@ -0,0 +1,72 @@
+import hashlib
+
+from trackinsight_data_python.manifest import Manifest, manifest_path
+
+
+def _write_partition(root, path, payload=b"data"):
+    folder = root / path
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "data.parquet").write_bytes(payload)
+    return folder / "data.parquet"
+
+
+def test_manifest_tracks_current_partitions(tmp_path):
+    root = tmp_path / "parquet" / "eur_reports"
+    path = manifest_path(tmp_path, "parquet", "eur_reports")
+    params = {"stamp": "2024-01-31", "ccy": "eur"}
+    partition = {"stamp": "2024-01-31", "mod_20": 3}
+    filepath = _write_partition(root, "stamp=2024-01-31/mod_20=3")
+
+    manifest = Manifest(path, root)
+    manifest.record("stamp=2024-01-31/mod_20=3", params, partition, "tx1",
+                    {"status": "downloaded", "bytes": 4, "sha256": "abc", "etag": '"e1"'})
+    manifest.save()
+
+    reloaded = Manifest(path, root)
+    assert reloaded.is_current("stamp=2024-01-31/mod_20=3", params, partition, "tx1", filepath)
+    assert not reloaded.is_current("stamp=2024-01-31/mod_20=3", params, partition, "tx2", filepath)
+    assert reloaded.etag("stamp=2024-01-31/mod_20=3", params, partition, filepath) == '"e1"'
+
+    filepath.write_bytes(b"truncated!")
+    assert reloaded.etag("stamp=2024-01-31/mod_20=3", params, partition, filepath) is None
+
+
+def test_manifest_only_removes_stale_partitions_of_same_query(tmp_path):
+    root = tmp_path / "parquet" / "eur_reports"
+    manifest = Manifest(manifest_path(tmp_path, "parquet", "eur_reports"), root)
+    info = {"status": "downloaded", "bytes": 4, "sha256": "abc"}
+    for stamp in ["2024-01-31", "2024-02-29"]:
+        for mod in [0, 1]:
+            path = f"stamp={stamp}/mod_20={mod}"
+            _write_partition(root, path)
+            manifest.record(path, {"stamp": stamp}, {"stamp": stamp, "mod_20": mod}, "tx", info)
+
+    stale = manifest.stale({"stamp": "2024-02-29"}, ["stamp=2024-02-29/mod_20=0"])
+    assert stale == ["stamp=2024-02-29/mod_20=1"]
+
+    manifest.remove(stale[0])
+    assert not (root / "stamp=2024-02-29" / "mod_20=1").exists()
+    assert (root / "stamp=2024-01-31" / "mod_20=1").exists()
+
+
+def test_manifest_refreshes_partitions_rewritten_locally(tmp_path):
+    root = tmp_path / "parquet" / "eur_timeseries"
+    params = {"from": "2024-01-01", "ccy": "eur"}
+    partition = {"mod_20": 3}
+    filepath = _write_partition(root, "mod_20=3")
+    _write_partition(root, "mod_20=4")
+
+    manifest = Manifest(manifest_path(tmp_path, "parquet", "eur_timeseries"), root)
+    for partitionPath in ["mod_20=3", "mod_20=4"]:
+        manifest.record(partitionPath, params, partition, "tx1",
+                        {"status": "downloaded", "bytes": 4, "sha256": "abc", "etag": '"e1"'})
+
+    filepath.write_bytes(b"merged rows")
+    manifest.refresh("mod_20=3", filepath)
+    assert manifest.is_current("mod_20=3", params, partition, "tx1", filepath)
+    assert manifest.etag("mod_20=3", params, partition, filepath) == '"e1"'
+    assert manifest.sha256("mod_20=3") == hashlib.sha256(b"merged rows").hexdigest()
+
+    (root / "mod_20=4" / "data.parquet").unlink()
+    manifest.refresh("mod_20=4", root / "mod_20=4" / "data.parquet")
+    assert "mod_20=4" not in manifest.partitions
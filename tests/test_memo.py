@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from trackinsight_data_python import api
+from trackinsight_data_python.memo import Memo
+
+
+def test_memo_shares_in_flight_load():
+    memo = Memo()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.get("k", loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert memo.get("k", lambda: "fresh") == "fresh"
+
+
+def test_memo_keeps_values_for_ttl_and_shares_errors():
+    memo = Memo()
+    assert memo.get("k", lambda: 1, ttl=60) == 1
+    assert memo.get("k", lambda: 2, ttl=60) == 1
+    memo.invalidate("k")
+    assert memo.get("k", lambda: 3, ttl=60) == 3
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        memo.get("e", fail, ttl=60)
+    assert memo.get("e", lambda: "ok", ttl=60) == "ok"
+
+
+def test_metadata_is_memoized(mock_client, mock_server):
+    first = api.getMetadata(client=mock_client)
+    second = api.getMetadata(client=mock_client)
+
+    assert first == second
+    assert first["reportsAsOf"]["usd"] == mock_server.stamps
+    assert len([r for r in mock_server.requests if "/partitions/" in r]) == 3
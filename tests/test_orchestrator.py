@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from trackinsight_data_python import main
+from trackinsight_data_python.orchestrator import syncDatasets, validateSpec
+
+SPEC = {
+    "datasets": [
+        {"dataset": "timeseries", "ccy": "usd", "start": "2024-01-01", "end": "2024-01-05"},
+        {"dataset": "reports", "ccy": ["eur", "usd"], "stamps": ["2024-01-31"]},
+        "shares",
+    ]
+}
+
+
+def _dataRequests(server):
+    return [path for path in server.requests if "/data/" in path]
+
+
+def test_validate_spec_fills_defaults_and_rejects_typos():
+    spec = validateSpec(SPEC)
+    assert spec["format"] == "parquet" and spec["incremental"] and spec["index"]
+    assert [entry["priority"] for entry in spec["datasets"]] == [5, 2, 0]
+    with pytest.raises(ValueError, match="unknown dataset"):
+        validateSpec({"datasets": ["prices"]})
+    with pytest.raises(ValueError, match="unknown keys"):
+        validateSpec({"datasets": [{"dataset": "reports", "stamp": "2024-01-31"}]})
+
+
+def test_sync_datasets_runs_every_query_on_one_pool_by_priority(mock_client, mock_server):
+    summary = syncDatasets(SPEC, client=mock_client)
+    assert summary["ok"]
+    assert [query["folder"] for query in summary["queries"]] == [
+        "shares", "eur_reports", "usd_reports", "usd_timeseries"]
+    assert summary["partitions"] == 4 * mock_server.partitions
+    assert all(query["statuses"] == {"downloaded": mock_server.partitions} for query in summary["queries"])
+    json.dumps(summary)
+
+    # At most max_workers fetches are in flight, so the shares partitions, submitted
+    # first, are the first ones the server sees.
+    fetched = _dataRequests(mock_server)
+    assert len(fetched) == 4 * mock_server.partitions
+    assert all("/data/shares" in path for path in fetched[:mock_server.partitions - mock_client.max_workers])
+
+    root = mock_client.data_dir / "parquet"
+    assert len(list((root / "eur_reports").glob("stamp=2024-01-31/*/data.parquet"))) == mock_server.partitions
+    assert (root / "usd_timeseries.index.parquet").exists()
+
+    again = syncDatasets(SPEC, client=mock_client)
+    assert all(query["statuses"] == {"unchanged": mock_server.partitions} for query in again["queries"])
+    assert len(_dataRequests(mock_server)) == 4 * mock_server.partitions
+
+
+def test_sync_datasets_reports_failures_without_stopping(mock_client, mock_server):
+    mock_server.fail(404, times=1, match="/data/shares")
+    mock_server.fail(500, times=10, match="/partitions/timeseries")
+    summary = syncDatasets(SPEC, client=mock_client)
+    assert not summary["ok"]
+    assert summary["failed"] == 1
+    shares, eur, usd, timeseries = summary["queries"]
+    assert shares["statuses"] == {"downloaded": mock_server.partitions - 1, "failed": 1}
+    assert shares["failures"][0]["attempts"] == 1
+    assert eur["statuses"] == usd["statuses"] == {"downloaded": mock_server.partitions}
+    assert "error" in timeseries
+
+
+def test_cli_prints_summary_and_exit_code(mock_server, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("TRACK_API_KEY", "test")
+    monkeypatch.setenv("TRACK_API_HOST", mock_server.url)
+    monkeypatch.setenv("TRACK_API_RETRIES", "0")
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps({"datasets": ["shares"]}))
+    storage = str(tmp_path / "data")
+
+    assert main(["sync", str(spec), "--storage", storage, "--workers", "2"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["ok"] and summary["partitions"] == mock_server.partitions
+
+    mock_server.fail(500, times=1, match="/data/shares")
+    assert main(["sync", str(spec), "--storage", storage, "--full"]) == 1
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["failed"] == 1
+
+    spec.write_text(json.dumps({"datasets": ["prices"]}))
+    assert main(["sync", str(spec), "--storage", storage]) == 2
+    assert "unknown dataset" in json.loads(capsys.readouterr().out)["error"]
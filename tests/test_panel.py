@@ -0,0 +1,87 @@
+import glob
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python.api import getReports, getReportsPanel
+from trackinsight_data_python.cache import Cache
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.download import downloadReports, downloadReportsPanel
+from trackinsight_data_python.retry import PartitionsError
+from trackinsight_data_python.testing import MockServer
+
+STAMPS = ["2024-01-31", "2024-02-29", "2024-03-28"]
+
+
+@pytest.fixture
+def panel_server():
+    with MockServer(shares=40, stamps=STAMPS) as server:
+        yield server
+
+
+@pytest.fixture
+def panel_client(panel_server, tmp_path):
+    with Client(key="test", host=panel_server.url, storage=tmp_path, max_workers=4, cache=False) as client:
+        yield client
+
+
+def _listings(server):
+    return [path for path in server.requests if "/partitions/reports" in path and "stamp=" in path]
+
+
+def test_panel_fetches_every_stamp_on_one_pool(panel_client, panel_server):
+    panel = getReportsPanel(start="2024-02-01", client=panel_client)
+    assert sorted(panel["stamp"].unique().to_list()) == STAMPS[1:]
+    expected = getReports(stamp="2024-02-29", client=panel_client).sort("share_id")
+    assert panel.filter(pl.col("stamp") == "2024-02-29").drop("stamp").sort("share_id").equals(expected)
+
+    panel = getReportsPanel(stamps=STAMPS, ids=[3], client=panel_client)
+    assert panel.sort("stamp")["stamp"].to_list() == STAMPS
+    assert set(panel["share_id"]) == {3}
+
+
+def test_panel_skips_stamps_available_locally(panel_client, panel_server):
+    downloadReports(stamp="2024-01-31", client=panel_client)
+    requests = len(panel_server.requests)
+    panel = getReportsPanel(stamps=STAMPS[:2], client=panel_client)
+    assert panel.height == 2 * panel_server.shares
+    # Only the stamp missing on disk is listed and fetched.
+    fetched = panel_server.requests[requests:]
+    assert all("2024-02-29" in path for path in fetched)
+    assert len(fetched) == 1 + panel_server.partitions
+
+
+def test_panel_reads_and_fills_the_cache(panel_server, tmp_path):
+    with Client(key="test", host=panel_server.url, storage=tmp_path, cache=Cache(tmp_path / "cache")) as client:
+        first = getReportsPanel(stamps=STAMPS, client=client)
+        requests = len(panel_server.requests)
+        again = getReportsPanel(stamps=STAMPS, client=client)
+        assert len(panel_server.requests) == requests
+        assert again.sort("stamp", "share_id").equals(first.sort("stamp", "share_id"))
+        getReports(stamp="2024-03-28", client=client)
+        assert len(panel_server.requests) == requests
+
+
+def test_download_panel_writes_hive_tree_and_skips_complete_stamps(panel_client, panel_server):
+    patterns = downloadReportsPanel(stamps=STAMPS[:2], client=panel_client)
+    assert [len(glob.glob(pattern, recursive=True)) for pattern in patterns] == [panel_server.partitions] * 2
+    assert len(_listings(panel_server)) == 2
+
+    patterns = downloadReportsPanel(stamps=STAMPS, client=panel_client)
+    assert len(patterns) == 3
+    # The two stamps already complete are not listed again.
+    assert len(_listings(panel_server)) == 3
+    frame = pl.read_parquet(panel_client.data_dir / "parquet" / "eur_reports" / "**/*.parquet", hive_partitioning=True)
+    assert frame["stamp"].n_unique() == 3
+
+
+def test_download_panel_failure_leaves_stamp_incomplete(panel_client, panel_server):
+    panel_server.fail(404, times=1, match="/data/reports")
+    with pytest.raises(PartitionsError):
+        downloadReportsPanel(stamps=STAMPS[:2], client=panel_client, snapshots=1)
+    assert not (panel_client.data_dir / "parquet" / "eur_reports").exists()
+
+    downloadReportsPanel(stamps=STAMPS[:2], client=panel_client)
+    requests = len(panel_server.requests)
+    assert getReportsPanel(stamps=STAMPS[:2], client=panel_client).height == 2 * panel_server.shares
+    assert len(panel_server.requests) == requests
@@ -0,0 +1,27 @@
+from trackinsight_data_python._params import (
+    IDS_LIMIT,
+    build_timeseries_params,
+    should_batch_ids,
+    split_ids,
+)
+
+
+def test_long_id_lists_are_not_sent():
+    assert "ids" not in build_timeseries_params(ids=list(range(IDS_LIMIT + 1)))
+    assert build_timeseries_params(ids=[1, 2])["ids"] == "1,2"
+
+
+def test_split_ids_deduplicates_and_respects_limit():
+    ids = list(range(2500)) + [0, 1]
+    chunks = split_ids(ids)
+
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert sum(chunks, []) == list(range(2500))
+
+
+def test_should_batch_ids_depends_on_universe_size():
+    ids = list(range(3000))
+
+    assert should_batch_ids(ids, 60000)
+    assert not should_batch_ids(ids, 4000)
+    assert not should_batch_ids(ids[:10], 60000)
@@ -0,0 +1,71 @@
+from io import BytesIO
+
+import polars as pl
+import pytest
+import requests
+
+from trackinsight_data_python.partitions import getPartitions, peak_rss, readBody
+from trackinsight_data_python.retry import PartitionsError
+
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.raw = BytesIO(body)
+        self.headers = headers
+        self._body = body
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+
+def test_read_body_fills_presized_buffer():
+    body = bytes(range(256)) * 10_000
+    buffer = readBody(FakeResponse(body, {"Content-Length": str(len(body))}))
+    assert buffer.getvalue() == body
+    assert buffer.tell() == 0
+
+
+def test_read_body_rejects_truncated_body():
+    with pytest.raises(requests.exceptions.ConnectionError):
+        readBody(FakeResponse(b"abc", {"Content-Length": "10"}))
+
+
+def test_read_body_streams_encoded_body():
+    body = b"x" * 5000
+    buffer = readBody(FakeResponse(body, {"Content-Length": "12", "Content-Encoding": "gzip"}))
+    assert buffer.getvalue() == body
+
+
+def test_get_partitions_appends_frames(mock_client, mock_server):
+    data = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client)
+    assert data.height == mock_server.shares * mock_server.days
+    assert data.n_chunks() == mock_server.partitions
+    assert sorted(data["id"].unique()) == list(range(mock_server.shares))
+
+    data = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client, rechunk=True)
+    assert data.n_chunks() == 1
+
+
+def test_peak_rss_is_positive():
+    rss = peak_rss()
+    assert rss is None or rss > 0
+
+
+def test_get_partitions_retries_transient_errors(mock_client, mock_server):
+    mock_server.fail(503, times=3, headers={"Retry-After": "0"})
+    data = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client)
+    assert data.height == mock_server.shares * mock_server.days
+    data_requests = [path for path in mock_server.requests if "/data/" in path]
+    assert len(data_requests) == mock_server.partitions + 3
+
+
+def test_get_partitions_reports_failed_partitions(mock_client, mock_server):
+    mock_server.fail(404, times=1)
+    with pytest.raises(PartitionsError) as excinfo:
+        getPartitions("timeseries", folder="timeseries", params={"ccy": "usd"}, client=mock_client)
+    error = excinfo.value
+    assert len(error.failures) == 1
+    assert error.failures[0]["attempts"] == 1
+    statuses = sorted(result["status"] for result in error.partial)
+    assert statuses == ["downloaded"] * (mock_server.partitions - 1) + ["failed"]
@@ -0,0 +1,45 @@
+from trackinsight_data_python.api import getReports, getTimeseries
+from trackinsight_data_python.partitions import getPartitions, planPartitions, prunePartitions
+
+
+def _dataRequests(server):
+    return [path for path in server.requests if "/data/" in path]
+
+
+def test_prune_partitions_keeps_partitions_of_requested_ids():
+    partitions = [{"stamp": "2024-01-31", "mod_20": i} for i in range(20)]
+    kept = prunePartitions(partitions, [3, 23, 41])
+    assert kept == [{"stamp": "2024-01-31", "mod_20": 1}, {"stamp": "2024-01-31", "mod_20": 3}]
+    assert prunePartitions(partitions, None) == partitions
+    assert prunePartitions([{"year": 2024}], [1]) == [{"year": 2024}]
+
+
+def test_plan_partitions_is_a_dry_run(mock_client, mock_server):
+    plan = planPartitions("timeseries", {"ccy": "usd"}, ids=[1, 5, 21], client=mock_client)
+    assert plan["transactionId"] == "tx-1"
+    assert plan["partitions"] == [{"mod_20": 1}, {"mod_20": 5}]
+    assert plan["paths"] == ["mod_20=1", "mod_20=5"]
+    assert plan["listed"] == mock_server.partitions
+    assert plan["pruned"] == mock_server.partitions - 2
+    assert _dataRequests(mock_server) == []
+
+    plan = planPartitions("timeseries", {"ccy": "usd"}, client=mock_client)
+    assert plan["pruned"] == 0
+
+
+def test_loaders_only_fetch_partitions_of_requested_ids(mock_client, mock_server):
+    frame = getTimeseries(ccy="usd", ids=[2, 22, 7], client=mock_client)
+    assert sorted(frame["id"].unique().to_list()) == [2, 7, 22]
+    fetched = _dataRequests(mock_server)
+    assert len(fetched) == 2
+    assert all("mod_20=2&" in path or "mod_20=7&" in path for path in fetched)
+
+    frame = getReports(stamp="2024-01-31", ccy="usd", ids=[9], client=mock_client)
+    assert frame["share_id"].to_list() == [9]
+    assert len(_dataRequests(mock_server)) == 3
+
+
+def test_get_partitions_fetches_one_request_per_matching_partition(mock_client, mock_server):
+    frame = getPartitions("timeseries", params={"ids": "4,24"}, client=mock_client)
+    assert frame["id"].unique().sort().to_list() == [4, 24]
+    assert len(_dataRequests(mock_server)) == 1
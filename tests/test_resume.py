@@ -0,0 +1,102 @@
+import glob
+import hashlib
+import json
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.download import downloadHoldings
+from trackinsight_data_python.partitions import RESUME_SUFFIX, getPartitions
+from trackinsight_data_python.retry import PartitionsError
+from trackinsight_data_python.testing import MockServer
+
+
+@pytest.fixture
+def server():
+    with MockServer(partitions=2, shares=2000, columns=4) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    with Client(key="test", host=server.url, storage=tmp_path, max_workers=2, cache=False, retries=2, backoff=0) as client:
+        yield client
+
+
+def _read(pattern):
+    return pl.read_parquet(sorted(glob.glob(pattern, recursive=True)), hive_partitioning=False)
+
+
+def _leftovers(client):
+    return [path for path in glob.glob(str(client.data_dir / "**" / "*"), recursive=True) if ".part" in path]
+
+
+def test_interrupted_download_resumes_with_range(client, server):
+    expected = pl.concat([server.frame("holdings", {server.key: i}) for i in range(server.partitions)])
+    server.interrupt(times=1, match="/data/holdings", after=0.5)
+    pattern = downloadHoldings(client=client, index=False)
+    assert _read(pattern).sort("share_id").equals(expected.sort("share_id"))
+    # The interrupted partition was resumed from the bytes already received.
+    [(path, start)] = server.resumed
+    assert start > 0
+    assert len([p for p in server.requests if p == path]) == 2
+    assert _leftovers(client) == []
+
+
+def test_interrupted_download_restarts_without_range_support(tmp_path):
+    with MockServer(partitions=2, shares=2000, ranges=False) as server:
+        with Client(key="test", host=server.url, storage=tmp_path, cache=False, retries=2, backoff=0) as client:
+            server.interrupt(times=1, match="/data/holdings")
+            pattern = downloadHoldings(client=client, index=False)
+            assert _read(pattern).height == server.shares
+            assert server.resumed == []
+            assert _leftovers(client) == []
+
+
+def test_unusable_partial_download_is_restarted(client, server):
+    getPartitions("holdings", folder="holdings", client=client)
+    [folder] = (client.data_dir / "parquet" / "holdings").glob(f"**/{server.key}=0")
+    expected = (folder / "data.parquet").read_bytes()
+    partition = {"year": 2024, "month": 1, server.key: 0}
+    url = client.url("data/holdings", {"transactionId": "tx-1"} | partition | {"format": "parquet"})
+    body, _ = server.body("holdings", {k: str(v) for k, v in partition.items()} | {"format": "parquet"})
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def leave_partial(size, validator):
+        (folder / "data.parquet.part").write_bytes(b"x" * size)
+        (folder / ("data.parquet.part" + RESUME_SUFFIX)).write_text(json.dumps({"url": url, "validator": validator}))
+
+    # A partial body of another version of the partition fails If-Range: the server
+    # sends the whole body.
+    leave_partial(100, '"other"')
+    getPartitions("holdings", folder="holdings", client=client)
+    assert (folder / "data.parquet").read_bytes() == expected
+    assert server.resumed == []
+
+    # A partial body longer than the partition gets a 416 and is downloaded again.
+    leave_partial(len(body) + 10, etag)
+    requests = len(server.requests)
+    getPartitions("holdings", folder="holdings", client=client)
+    assert len([path for path in server.requests[requests:] if f"{server.key}=0" in path]) == 2
+    assert (folder / "data.parquet").read_bytes() == expected
+    assert _leftovers(client) == []
+
+
+def test_interrupted_snapshot_download_resumes_in_the_next_snapshot(server, tmp_path):
+    expected = pl.concat([server.frame("holdings", {server.key: i}) for i in range(server.partitions)])
+    with Client(key="test", host=server.url, storage=tmp_path, max_workers=2, cache=False, retries=0, backoff=0) as client:
+        server.interrupt(times=1, match="/data/holdings", after=0.5)
+        with pytest.raises(PartitionsError):
+            downloadHoldings(client=client, index=False, snapshots=1)
+        assert _leftovers(client)
+
+        # The next run stages another snapshot under another transaction.
+        server.transactionId = "tx-2"
+        pattern = downloadHoldings(client=client, index=False, snapshots=1)
+        assert "tx-2" in pattern
+        assert _read(pattern).sort("share_id").equals(expected.sort("share_id"))
+        [(_, start)] = server.resumed
+        assert start > 0
+        assert _leftovers(client) == []
+        assert not (client.data_dir / "parquet" / "holdings.partial").exists()
@@ -0,0 +1,64 @@
+import requests
+
+from trackinsight_data_python.retry import AIMDController, backoff_delay, is_retryable, retry_after
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_transient_errors_are_retryable():
+    assert is_retryable(http_error(429))
+    assert is_retryable(http_error(503))
+    assert is_retryable(requests.exceptions.ConnectionError())
+    assert not is_retryable(http_error(404))
+    assert not is_retryable(ValueError())
+
+
+def test_backoff_honours_retry_after():
+    assert retry_after(http_error(429, {"Retry-After": "7"}).response) == 7
+    assert retry_after(http_error(429, {"Retry-After": "soon"}).response) is None
+    assert backoff_delay(1, base=0.1, exc=http_error(429, {"Retry-After": "7"})) >= 7
+    assert 0 <= backoff_delay(10, base=0.1, cap=2) <= 2
+
+
+def test_aimd_halves_on_errors_and_grows_back():
+    controller = AIMDController(8)
+    controller.failure()
+    assert controller.limit == 4
+    controller.failure()
+    assert controller.limit == 4
+    for _ in range(4):
+        controller.success(0.1)
+    assert controller.limit == 5
+    for _ in range(100):
+        controller.success(0.1)
+    assert controller.limit == 8
+
+
+def test_aimd_recovers_after_latency_settles_higher():
+    controller = AIMDController(8)
+    for _ in range(10):
+        controller.success(0.01)
+    limits = []
+    for _ in range(200):
+        controller.success(0.2)
+        limits.append(controller.limit)
+    assert min(limits) < 8
+    # Once the window only holds the new latency, additive increase takes over again.
+    assert limits[-1] == 8
+
+
+def test_aimd_ignores_latency_of_not_modified_responses():
+    controller = AIMDController(8)
+    limits = []
+    for _ in range(20):
+        controller.success(None)
+        limits.append(controller.limit)
+    for _ in range(50):
+        controller.success(0.2)
+        limits.append(controller.limit)
+    assert set(limits) == {8}
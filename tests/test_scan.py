@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlparse
+
+import polars as pl
+
+from trackinsight_data_python._params import IDS_LIMIT
+from trackinsight_data_python.api import getTimeseries
+from trackinsight_data_python.scan import SAMPLE_ID, _pushdown, _schemas, scanTimeseries
+
+
+def test_pushdown_extracts_ids_and_date_bounds():
+    predicate = (
+        pl.col("id").is_in([1, 2, 3])
+        & (pl.col("date") >= date(2024, 1, 1))
+        & (pl.lit("2024-03-31") >= pl.col("date"))
+        & (pl.col("value") > 0)
+    )
+
+    assert _pushdown(predicate, "id", "date") == {"ids": {1, 2, 3}, "start": "2024-01-01", "end": "2024-03-31"}
+
+
+def test_pushdown_intersects_terms():
+    predicate = (
+        pl.col("share_id").is_in([1, 2, 3])
+        & (pl.col("share_id") == 2)
+        & pl.col("date").is_between(date(2024, 1, 1), datetime(2024, 6, 30))
+        & (pl.col("date") > date(2024, 2, 1))
+    )
+
+    assert _pushdown(predicate, "share_id", "date") == {"ids": {2}, "start": "2024-02-01", "end": "2024-06-30"}
+
+
+def test_pushdown_ignores_disjunctions():
+    predicate = (pl.col("id") == 1) | (pl.col("id") == 2)
+
+    assert _pushdown(predicate, "id", "date") == {"ids": None, "start": None, "end": None}
+
+
+def test_scan_filters_ids_beyond_the_request_limit_locally(mock_client, mock_server):
+    ids = list(range(0, 2 * (IDS_LIMIT + 200), 2))
+    frame = scanTimeseries(start="2024-01-01", ids=ids, client=mock_client).collect()
+    assert set(frame["id"]) == set(range(0, mock_server.shares, 2))
+    expected = getTimeseries(start="2024-01-01", ids=ids, client=mock_client)
+    assert frame.sort("id", "date").equals(expected.select(frame.columns).sort("id", "date"))
+
+    # Ids pushed down from a filter are applied the same way.
+    frame = scanTimeseries(start="2024-01-01", client=mock_client).filter(pl.col("id").is_in(ids)).collect()
+    assert set(frame["id"]) == set(range(0, mock_server.shares, 2))
+
+
+def test_schema_is_sampled_with_a_single_id_and_day(mock_client, mock_server):
+    _schemas.clear()
+    frame = scanTimeseries(start="2024-01-01", client=mock_client).filter(pl.col("id").is_in([1, 2, 3])).collect()
+    assert set(frame["id"]) == {1, 2, 3}
+    data = [parse_qs(urlparse(r).query) for r in mock_server.requests if "/data/" in r]
+    # Every data request carries ids: the schema sample does not fetch a whole partition.
+    assert all("ids" in query for query in data)
+    [sample] = [query for query in data if query["ids"] == [str(SAMPLE_ID)]]
+    assert sample["from"] == sample["to"] == ["2024-01-01"]
@@ -0,0 +1,102 @@
+from datetime import date
+
+import polars as pl
+
+from trackinsight_data_python import schemas
+from trackinsight_data_python.api import getReports, getTimeseries
+from trackinsight_data_python.cache import Cache
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.partitions import getPartitions
+from trackinsight_data_python.schemas import compactFrame, compactSchema, registerSchema
+
+
+def test_compact_schema_uses_registry_then_rules():
+    schema = compactSchema("holdings", {
+        "share_id": pl.Int64,
+        "holding_id": pl.Int64,
+        "valuation_date": pl.String,
+        "theme": pl.String,
+        "tags": pl.List(pl.String),
+        "weight": pl.Float64,
+    })
+    assert schema == {
+        "share_id": pl.Int32,
+        "holding_id": pl.Int64,
+        "valuation_date": pl.Date,
+        "theme": pl.Categorical,
+        "tags": pl.List(pl.Categorical),
+        "weight": pl.Float64,
+    }
+
+
+def test_compact_frame_parses_dates_and_keeps_values():
+    frame = pl.DataFrame({"id": [1, 2], "date": ["2024-01-01", "2024-01-02T00:00:00"], "ccy": ["eur", "eur"]})
+    compacted = compactFrame("timeseries", frame)
+    assert dict(compacted.schema) == {"id": pl.Int32, "date": pl.Date, "ccy": pl.Categorical}
+    assert compacted["date"].to_list() == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert compacted["ccy"].cast(pl.String).to_list() == ["eur", "eur"]
+
+
+def test_loaders_cast_partitions_to_compact_schema(mock_client):
+    regular = getTimeseries(ccy="usd", client=mock_client)
+    compacted = getTimeseries(ccy="usd", client=mock_client, compact=True)
+    assert dict(compacted.schema) == {
+        "share_id": pl.Int32,
+        "id": pl.Int32,
+        "date": pl.Date,
+        "value": pl.Float64,
+        "ccy": pl.Categorical,
+    }
+    assert compacted.height == regular.height
+    assert compacted.estimated_size() < regular.estimated_size()
+
+    ids = getReports(stamp="2024-01-31", ccy="usd", ids=[3, 7], client=mock_client, compact=True)
+    assert ids["share_id"].sort().to_list() == [3, 7]
+    assert ids["date"].dtype == pl.Date
+
+
+def test_json_partitions_are_compacted(mock_client):
+    data = getPartitions("liquidity", params={"ccy": "eur"}, format="json", client=mock_client, compact=True)
+    assert data.schema["share_id"] == pl.Int32
+    assert data.schema["date"] == pl.Date
+
+
+def test_registered_enum_is_applied(mock_client, monkeypatch):
+    monkeypatch.setitem(schemas.SCHEMAS, "shares", dict(schemas.SCHEMAS["shares"]))
+    registerSchema("shares", {"ccy": pl.Enum(["eur", "usd"])})
+    data = getPartitions("shares", client=mock_client, compact=True)
+    assert data.schema["ccy"] == pl.Enum(["eur", "usd"])
+
+
+def test_compact_frames_are_cached_separately(mock_server, tmp_path):
+    with Client(key="test", host=mock_server.url, storage=tmp_path, cache=Cache(tmp_path / "cache")) as client:
+        regular = getTimeseries(ccy="usd", end="2024-01-05", client=client)
+        compacted = getTimeseries(ccy="usd", end="2024-01-05", client=client, compact=True)
+        cached = getTimeseries(ccy="usd", end="2024-01-05", client=client, compact=True)
+    assert regular.schema["date"] == pl.String
+    assert compacted.schema["date"] == pl.Date
+    assert cached.schema == compacted.schema
+
+
+def test_load_schema_casts_every_partition_to_the_first_dtypes():
+    schema = schemas.LoadSchema("timeseries")
+    first = schema.cast(pl.DataFrame({"id": [1], "date": ["2024-01-01"], "value": [1.5], "note": [None]}))
+    second = schema.cast(pl.DataFrame(
+        {"id": [2], "date": ["2024-01-02"], "value": [2], "note": ["x"]},
+        schema={"id": pl.Int16, "date": pl.String, "value": pl.Int64, "note": pl.String}))
+    assert first.schema["value"] == second.schema["value"] == pl.Float64
+    assert second.schema["id"] == pl.Int32
+    # A column first seen untyped takes the dtype of the first partition holding values.
+    assert first.schema["note"] == pl.Null
+    assert second.schema["note"] == pl.Categorical
+    assert pl.concat([first, second], how="vertical_relaxed")["value"].to_list() == [1.5, 2.0]
+
+
+def test_load_schema_keeps_ids_that_do_not_fit_int32():
+    schema = schemas.LoadSchema("shares")
+    small = schema.cast(pl.DataFrame({"share_id": [1, 2]}))
+    large = schema.cast(pl.DataFrame({"share_id": [2**40]}))
+    later = schema.cast(pl.DataFrame({"share_id": [3]}))
+    assert small.schema["share_id"] == pl.Int32
+    assert large["share_id"].to_list() == [2**40]
+    assert large.schema["share_id"] == later.schema["share_id"] == pl.Int64
@@ -0,0 +1,106 @@
+import glob
+import os
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python.compact import compact
+from trackinsight_data_python.download import downloadReports, downloadShares
+from trackinsight_data_python.orchestrator import syncDatasets
+from trackinsight_data_python.retry import PartitionsError
+from trackinsight_data_python.snapshots import currentSnapshot, listSnapshots
+
+
+def _read(pattern):
+    return pl.read_parquet(sorted(glob.glob(pattern, recursive=True)))
+
+
+def test_download_publishes_snapshot_keyed_by_transaction(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    pattern = downloadReports(stamp="2024-01-31", ccy="usd", client=mock_client, snapshots=1)
+    assert os.path.islink(base / "usd_reports")
+    assert currentSnapshot(base, "usd_reports").name == "tx-1"
+    assert pattern.startswith(str(base / "usd_reports.snapshots" / "tx-1"))
+    assert _read(pattern).height == mock_server.shares
+
+    mock_server.transactionId = "tx-2"
+    second = downloadReports(stamp="2024-01-31", ccy="usd", client=mock_client, snapshots=1)
+    assert "tx-2" in second
+    # The glob handed out before the refresh stays readable while its snapshot is kept.
+    assert _read(pattern).height == mock_server.shares
+    # Unchanged partitions answered 304 and are hard links to the previous snapshot.
+    first = glob.glob(pattern, recursive=True)[0]
+    assert os.path.samefile(first, first.replace("tx-1", "tx-2"))
+    assert [s["name"] for s in listSnapshots("usd_reports", client=mock_client)] == ["tx-2", "tx-1"]
+
+    mock_server.transactionId = "tx-3"
+    downloadReports(stamp="2024-01-31", ccy="usd", client=mock_client, snapshots=1)
+    snapshots = listSnapshots("usd_reports", client=mock_client)
+    assert [(s["name"], s["current"]) for s in snapshots] == [("tx-3", True), ("tx-2", False)]
+    assert not glob.glob(str(base / "usd_reports.snapshots" / "*.staging"))
+
+
+def test_failed_download_leaves_current_snapshot(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    downloadShares(client=mock_client, snapshots=2)
+    before = sorted(glob.glob(str(base / "shares" / "**/*.parquet"), recursive=True))
+
+    mock_server.transactionId = "tx-2"
+    mock_server.fail(404, times=1)
+    with pytest.raises(PartitionsError):
+        downloadShares(client=mock_client)
+    assert currentSnapshot(base, "shares").name == "tx-1"
+    assert sorted(glob.glob(str(base / "shares" / "**/*.parquet"), recursive=True)) == before
+    assert os.listdir(base / "shares.snapshots") == ["tx-1"]
+
+    # A folder published as snapshots keeps being refreshed as snapshots.
+    downloadShares(client=mock_client)
+    assert currentSnapshot(base, "shares").name == "tx-2"
+
+
+def test_plain_folder_is_switched_to_snapshots(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    downloadShares(client=mock_client)
+    assert not os.path.islink(base / "shares")
+    requests = len(mock_server.requests)
+
+    pattern = downloadShares(client=mock_client, snapshots=1)
+    assert os.path.islink(base / "shares")
+    assert _read(pattern).height == mock_server.shares
+    # Same transaction: every partition is known current and skipped.
+    assert len(mock_server.requests) == requests + 1
+
+
+def test_compact_publishes_a_new_snapshot(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    pattern = downloadReports(stamp="2024-01-31", ccy="usd", client=mock_client, snapshots=1)
+    compact("usd_reports", client=mock_client)
+    assert currentSnapshot(base, "usd_reports").name == "tx-1.1"
+    assert _read(pattern).height == _read(str(base / "usd_reports" / "**/*.parquet")).height
+
+
+def test_sync_spec_publishes_one_snapshot_per_folder(mock_client, mock_server):
+    spec = {"snapshots": 1, "datasets": [{"dataset": "reports", "ccy": "eur", "stamps": ["2024-01-31", "2024-02-29"]}]}
+    summary = syncDatasets(spec, client=mock_client)
+    assert summary["ok"]
+    base = mock_client.data_dir / "parquet"
+    assert {query["snapshot"] for query in summary["queries"]} == {str(base / "eur_reports.snapshots" / "tx-1")}
+    assert sorted(os.listdir(base / "eur_reports")) == ["stamp=2024-01-31", "stamp=2024-02-29"]
+
+    mock_server.transactionId = "tx-2"
+    mock_server.fail(404, times=1, match="stamp=2024-02-29")
+    summary = syncDatasets(spec, client=mock_client)
+    assert not summary["ok"]
+    assert "snapshot" not in summary["queries"][0]
+    assert currentSnapshot(base, "eur_reports").name == "tx-1"
+
+
+def test_repeated_compactions_keep_a_bounded_number_of_snapshots(mock_client, mock_server):
+    downloadShares(client=mock_client, snapshots=1)
+    for _ in range(4):
+        compact("shares", client=mock_client)
+    snapshots = listSnapshots("shares", client=mock_client)
+    assert len(snapshots) == 3
+    assert snapshots[0]["current"]
+    compact("shares", client=mock_client, snapshots=0)
+    assert len(listSnapshots("shares", client=mock_client)) == 1
@@ -0,0 +1,80 @@
+import gc
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from trackinsight_data_python.api import getTimeseries
+from trackinsight_data_python.cache import Cache
+from trackinsight_data_python.client import Client
+from trackinsight_data_python.partitions import getPartitions
+from trackinsight_data_python.spill import parse_size, releaseSpill, spillFolders, spillScope
+
+
+def _spillFiles(client):
+    return list((client.data_dir / "spill").glob("*/*.arrow"))
+
+
+def test_parse_size():
+    assert parse_size(None) is None
+    assert parse_size(2048) == 2048
+    assert parse_size("512") == 512
+    assert parse_size("1.5K") == 1536
+    assert parse_size("4GB") == 4 * 1024**3
+
+
+def test_load_under_limit_stays_in_memory(mock_client):
+    data = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client, memoryLimit="1G")
+    assert isinstance(data, pl.DataFrame)
+    assert _spillFiles(mock_client) == []
+
+
+def test_load_over_limit_spills_and_returns_lazy_frame(mock_client, mock_server):
+    expected = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client)
+    # One partition fits, but the projection over all partitions does not.
+    lazy = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client,
+                         memoryLimit=expected.estimated_size() // 2)
+    assert isinstance(lazy, pl.LazyFrame)
+    assert len(_spillFiles(mock_client)) == mock_server.partitions
+
+    totals = lazy.group_by("id").agg(pl.col("value").sum()).sort("id").collect(engine="streaming")
+    assert_frame_equal(totals, expected.group_by("id").agg(pl.col("value").sum()).sort("id"))
+
+    folders = [folder for folder in spillFolders() if folder.startswith(str(mock_client.data_dir))]
+    assert len(folders) == 1
+    releaseSpill(folders[0])
+    assert _spillFiles(mock_client) == []
+
+
+def test_client_memory_limit_applies_to_loaders(mock_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_API_MEMORY_LIMIT", "1")
+    with Client(key="test", host=mock_server.url, storage=tmp_path, cache=Cache(tmp_path / "cache")) as client:
+        assert client.memory_limit == 1
+        ids = list(range(1500))
+        lazy = getTimeseries(ccy="usd", ids=ids, client=client, batchIds=False)
+        assert isinstance(lazy, pl.LazyFrame)
+        assert lazy.select(pl.len()).collect().item() == mock_server.shares * mock_server.days
+        assert list((tmp_path / "cache").glob("*.parquet")) == []
+
+
+def test_derived_frames_outlive_the_returned_frame(mock_client, mock_server):
+    lazy = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client, memoryLimit=1)
+    recent = lazy.filter(pl.col("date") >= "2024-01-05")
+    del lazy
+    gc.collect()
+    totals = recent.group_by("id").agg(pl.col("value").sum()).collect(engine="streaming")
+    assert totals.height == mock_server.shares
+
+    chained = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client, memoryLimit=1) \
+        .group_by("id").agg(pl.col("value").max())
+    gc.collect()
+    assert chained.collect(engine="streaming").height == mock_server.shares
+    releaseSpill()
+    assert _spillFiles(mock_client) == []
+
+
+def test_spill_scope_releases_its_folders(mock_client, mock_server):
+    with spillScope() as created:
+        lazy = getPartitions("timeseries", params={"ccy": "usd"}, client=mock_client, memoryLimit=1)
+        assert len(created) == 1
+        assert lazy.filter(pl.col("id") == 1).collect().height == mock_server.days
+    assert _spillFiles(mock_client) == []
@@ -0,0 +1,134 @@
+from urllib.parse import parse_qs, urlparse
+
+import polars as pl
+import pytest
+
+from trackinsight_data_python import snapshots
+from trackinsight_data_python.download import downloadTimeseries
+from trackinsight_data_python.snapshots import currentSnapshot, listSnapshots
+from trackinsight_data_python.sync import lastDate, syncLiquidity, syncTimeseries
+
+
+def _dataRequests(server):
+    return [parse_qs(urlparse(r).query) for r in server.requests if "/data/" in r]
+
+
+def test_sync_fetches_only_missing_dates(mock_client, mock_server):
+    pattern = downloadTimeseries("2024-01-01", "2024-01-05", ccy="usd", client=mock_client)
+    root = mock_client.data_dir / "parquet" / "usd_timeseries"
+    assert lastDate(root).isoformat() == "2024-01-05"
+
+    mock_server.requests.clear()
+    assert syncTimeseries(ccy="usd", client=mock_client) == pattern
+
+    assert {q["from"][0] for q in _dataRequests(mock_server)} == {"2024-01-06"}
+    data = pl.read_parquet(pattern)
+    assert data.height == mock_server.shares * mock_server.days
+    assert data.select("id", "date").is_unique().all()
+    assert lastDate(root).isoformat() == "2024-01-10"
+    assert not (mock_client.data_dir / "parquet" / "usd_timeseries.sync").exists()
+
+
+def test_sync_overlap_replaces_restated_rows(mock_client, mock_server):
+    syncLiquidity(start="2024-01-01", end="2024-01-08", client=mock_client)
+    mock_server.requests.clear()
+    pattern = syncLiquidity(start="2024-01-01", overlap=3, client=mock_client)
+
+    assert {q["from"][0] for q in _dataRequests(mock_server)} == {"2024-01-06"}
+    data = pl.read_parquet(pattern)
+    assert data.height == mock_server.shares * mock_server.days
+    assert data.select("share_id", "date").is_unique().all()
+
+    mock_server.requests.clear()
+    syncLiquidity(start="2024-01-01", end="2024-01-10", client=mock_client)
+    assert _dataRequests(mock_server) == []
+
+
+def test_download_replaces_synced_rows(mock_client, mock_server):
+    syncTimeseries(start="2024-01-01", end="2024-01-05", client=mock_client)
+    pattern = syncTimeseries(start="2024-01-01", client=mock_client)
+    downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client)
+
+    assert pl.read_parquet(pattern).height == mock_server.shares * mock_server.days
+
+
+def test_sync_publishes_a_new_snapshot(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    pattern = downloadTimeseries("2024-01-01", "2024-01-05", client=mock_client, snapshots=1)
+    before = pl.read_parquet(pattern)
+
+    synced = syncTimeseries(start="2024-01-01", overlap=2, client=mock_client)
+    assert currentSnapshot(base, "eur_timeseries").name.startswith("sync-")
+    assert synced.startswith(str(base / "eur_timeseries.snapshots"))
+    data = pl.read_parquet(synced)
+    assert data.height == mock_server.shares * mock_server.days
+    assert data.select("id", "date").is_unique().all()
+    # Readers of the previous snapshot still see it unchanged.
+    assert pl.read_parquet(pattern).equals(before)
+    assert len(listSnapshots("eur_timeseries", client=mock_client)) == 2
+    assert not (base / "eur_timeseries.sync").exists()
+
+
+def test_interrupted_snapshot_sync_is_merged_again(mock_client, mock_server, monkeypatch):
+    base = mock_client.data_dir / "parquet"
+    downloadTimeseries("2024-01-01", "2024-01-05", client=mock_client, snapshots=1)
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(snapshots.Snapshot, "publish", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        syncTimeseries(start="2024-01-01", client=mock_client)
+    monkeypatch.undo()
+    assert currentSnapshot(base, "eur_timeseries").name == "tx-1"
+
+    mock_server.requests.clear()
+    pattern = syncTimeseries(start="2024-01-01", end="2024-01-10", client=mock_client)
+    # The staged rows are merged into a new snapshot without being fetched again.
+    assert _dataRequests(mock_server) == []
+    assert pl.read_parquet(pattern).height == mock_server.shares * mock_server.days
+
+
+def test_sync_without_overlap_never_reads_stored_files(mock_client, mock_server, monkeypatch):
+    downloadTimeseries("2024-01-01", "2024-01-05", client=mock_client)
+    read = []
+    read_parquet = pl.read_parquet
+
+    def counting(source, *args, **kwargs):
+        read.append(str(source))
+        return read_parquet(source, *args, **kwargs)
+
+    monkeypatch.setattr(pl, "read_parquet", counting)
+    syncTimeseries(start="2024-01-01", end="2024-01-08", client=mock_client)
+    # Only the staged partitions are read: no stored row can clash with the new dates.
+    assert read and not [path for path in read if "/eur_timeseries/" in path]
+
+    read.clear()
+    pattern = syncTimeseries(start="2024-01-01", overlap=2, client=mock_client)
+    # Restated days only rewrite the files holding them.
+    assert [path for path in read if "/eur_timeseries/" in path]
+    data = read_parquet(pattern)
+    assert data.height == mock_server.shares * mock_server.days
+    assert data.select("id", "date").is_unique().all()
+
+
+def test_sync_keeps_downloads_incremental(mock_client, mock_server):
+    downloadTimeseries("2024-01-01", "2024-01-05", client=mock_client)
+    pattern = syncTimeseries(start="2024-01-01", overlap=2, client=mock_client)
+
+    mock_server.requests.clear()
+    assert downloadTimeseries("2024-01-01", "2024-01-05", client=mock_client) == pattern
+    # Rewritten partitions are still recorded in the manifest: nothing is fetched again.
+    assert _dataRequests(mock_server) == []
+    assert pl.read_parquet(pattern).height == mock_server.shares * mock_server.days
+
+
+def test_sync_without_new_rows_publishes_nothing(mock_client, mock_server):
+    base = mock_client.data_dir / "parquet"
+    pattern = downloadTimeseries("2024-01-01", "2024-01-10", client=mock_client, snapshots=1)
+
+    assert syncTimeseries(start="2024-01-01", client=mock_client) == pattern
+    assert _dataRequests(mock_server)
+    assert len(listSnapshots("eur_timeseries", client=mock_client)) == 1
+    assert currentSnapshot(base, "eur_timeseries").name == "tx-1"
+    assert not (base / "eur_timeseries.sync").exists()